@@ -9,8 +9,11 @@ Uses subprocess architecture for memory isolation:
 - Main process coordinates workflow and writes files
 """
 
+import io
 from datetime import datetime
 from pathlib import Path
+import signal
+import time
 from utils.email_notifications import (
     send_success_email,
     send_failure_email,
@@ -28,15 +31,27 @@ from utils.utilities import (
     finalize_and_zip_bag,
 )
 from subprocesses.subprocess_handler import (
+    run_whisper_batch,
     run_whisper_subprocess,
     run_llm_subprocess,
+    run_vad_prepass,
+    shutdown_whisper_worker,
 )
-from output.writers import write_output_files
-from utils.stats import ProcessInfo
-from subprocesses.whisper_subprocess import get_audio, get_audio_length
+from output.writers import write_json, write_output_files
+from utils.stats import ProcessInfo, format_realtime_factor
+from utils.stage_metrics import MetricsLog, collect_stage_metrics, stage_timer
+from utils.pipeline import Stage, StagedPipeline
+from utils.stage_cache import StageCache, build_stage_keys
+from utils.watcher import FolderWatcher, ProcessedLedger
+from utils.clip_batcher import ClipBatcher
+from utils.transcript import pack_result, unpack_result
+from utils.cpu_pool import get_cpu_pool
+from utils.scheduling import estimate_makespan, order_longest_first, probe_durations
+from utils.audio_probe import probe_duration_seconds
+from utils.utilities import append_affix, format_timestamp
 from output.post_processing import process_whisperx_segments
 
-from config.logger import logger, memoryHandler
+from config.logger import capture_job_log, logger
 from utils.language_utils import (
     LanguageMeta,
     LLM_LANGUAGES,
@@ -44,16 +59,59 @@ from utils.language_utils import (
     derive_model_name,
 )
 
-from dataclasses import dataclass
-from typing import Optional, Dict, Any, Tuple, List
+from dataclasses import dataclass, field
+import threading
+from typing import Optional, Dict, Any, Tuple, List, Callable, Iterable
 
 
 config = get_config()
 stats = []
 warning_count = 0
 warning_audio_inputs = []
+# Guards the shared stats/warning state when files are processed in parallel.
+results_lock = threading.Lock()
+pipeline_config = config["system"]
+stage_cache = StageCache(config["system"].get("cache_path") or None)
+# Set in watch mode; records every finished or failed input.
+ledger: Optional[ProcessedLedger] = None
+# Per-run JSON-lines file with the stage breakdown of every file.
+metrics_log: Optional[MetricsLog] = None
 use_summarization = config["llm_meta"].get("use_summarization", False)
 use_toc = config["llm_meta"].get("use_toc", False)
+use_vad_prepass = config["system"].get("vad_prepass", False)
+columnar_results = config["system"].get("columnar_results", False)
+min_speech_seconds = config["system"].get("min_speech_seconds", 1.0)
+# VAD prepass measurements of scheduled files, taken by the jobs created for them.
+speech_activity: Dict[Path, Dict[str, float]] = {}
+clip_batch_seconds = config["whisper"].get("clip_batch_seconds", 0) or 0
+clip_batcher = ClipBatcher(
+    run_whisper_batch, config["whisper"].get("clip_batch_files", 8) or 8
+)
+
+
+@dataclass
+class FileJob:
+    """State of one input file as it moves through the processing stages."""
+
+    filepath: Path
+    output_directory: Path
+    process_info: ProcessInfo
+    result: Optional[Dict[str, Any]] = None
+    processed: Optional[Dict[str, Any]] = None
+    translation_processed: Optional[Dict[str, Any]] = None
+    llm_output: Optional[Dict[str, Any]] = None
+    cache_keys: Optional[Dict[str, str]] = None
+    speech: Optional[Dict[str, float]] = None
+    # Log records of the stages that worked on this file (hallucination check).
+    log: io.StringIO = field(default_factory=io.StringIO)
+
+    @property
+    def has_no_speech(self) -> bool:
+        """True if the VAD prepass found (almost) no speech in the file."""
+        return (
+            self.speech is not None
+            and self.speech["speech_seconds"] < min_speech_seconds
+        )
 
 
 @dataclass(frozen=True)
@@ -73,17 +131,64 @@ def init_process_info(filepath: Path) -> ProcessInfo:
     return pi
 
 
-def compute_audio_length_seconds(filepath: Path) -> float:
-    # Lightweight operation (your existing helpers)
-    audio = get_audio(path=filepath)
-    return float(get_audio_length(audio))
+def new_file_job(filepath: Path, output_directory: Path) -> FileJob:
+    job = FileJob(
+        filepath=filepath,
+        output_directory=output_directory,
+        process_info=init_process_info(filepath),
+        speech=speech_activity.pop(filepath, None),
+    )
+    if job.speech is not None:
+        job.process_info.speech_seconds = job.speech["speech_seconds"]
+    return job
+
+
+def compute_audio_length_seconds(filepath: Path) -> Optional[float]:
+    """
+    Estimate the audio length from container metadata (no decoding).
+    The decoded length reported by the Whisper worker replaces this value
+    once transcription is done.
+    """
+    return probe_duration_seconds(filepath)
+
+
+def resolve_audio_length(
+    probed_length: Optional[float], result: Dict[str, Any]
+) -> float:
+    """Prefer the decoded length from the worker over the metadata probe."""
+    decoded_length = result.get("audio_length")
+    if decoded_length is not None:
+        return float(decoded_length)
+    if probed_length is not None:
+        return probed_length
+    # Neither available (e.g. cached result from an older run, unprobeable
+    # container): the end of the last segment is the best lower bound.
+    logger.warning("Audio length unknown; using end of last segment instead.")
+    segments = result.get("segments") or []
+    return float(max((seg.get("end") or 0.0 for seg in segments), default=0.0))
 
 
 def run_whisper_pipeline(filepath: Path) -> Dict[str, Any]:
     # Subprocess boundary (memory isolation)
+    # Short files planned for shared batches are transcribed with their group.
+    result = clip_batcher.result(filepath)
+    if result is not None:
+        return result
     return run_whisper_subprocess(filepath)
 
 
+def no_speech_result(speech: Dict[str, float]) -> Dict[str, Any]:
+    """Stand-in Whisper result for a file without speech."""
+    return {
+        "segments": [],
+        "word_segments": [],
+        "language": config["whisper"].get("language"),
+        "audio_length": speech["audio_seconds"],
+        "translation_enabled": False,
+        "no_speech": True,
+    }
+
+
 def postprocess_pipeline(
     result: Dict[str, Any],
 ) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
@@ -102,6 +207,45 @@ def postprocess_pipeline(
     return processed, translation_processed
 
 
+def cached_stage(
+    job: "FileJob",
+    stage: str,
+    compute: Callable[[], Any],
+    should_store: Callable[[Any], bool] = lambda _value: True,
+) -> Any:
+    """Return the cached result of a stage, or compute and store it."""
+    key = job.cache_keys.get(stage) if job.cache_keys else None
+    if key:
+        cached = stage_cache.get(stage, key)
+        if cached is not None:
+            logger.info(
+                "Reusing cached %s result for %s (%s)",
+                stage,
+                job.filepath.name,
+                key[:12],
+            )
+            return cached
+
+    value = compute()
+    if key and should_store(value):
+        stage_cache.put(stage, key, value)
+    return value
+
+
+def llm_output_is_complete(llm_output: Dict[str, Any]) -> bool:
+    """True if every requested LLM result is present for every language."""
+    parts = []
+    if use_summarization:
+        parts.append("summaries")
+    if use_toc:
+        parts.append("toc")
+    return all(
+        llm_output.get(part)
+        and all(llm_output[part].get(lang) for lang in LLM_LANGUAGES)
+        for part in parts
+    )
+
+
 def run_llm_if_enabled(segments: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Run LLM subprocess if enabled, return unified llm_output dict."""
     empty_result = {}
@@ -203,112 +347,476 @@ def write_translation_outputs_if_any(
     )
 
 
-def handle_hallucination_warnings_for_file(filename: str) -> None:
+def handle_hallucination_warnings_for_file(filename: str, output: str) -> None:
+    """Check the log of one file job (see FileJob.log) for hallucinations."""
     global warning_count, warning_audio_inputs
 
-    output = memoryHandler.stream.getvalue()
     warnings = check_for_hallucination_warnings(output)
-
-    if warnings:
-        warnings_str = ", ".join(warnings)
-        logger.warning(f"Possible hallucation(s) detected: {warnings_str}")
+    if not warnings:
+        return
+    warnings_str = ", ".join(warnings)
+    logger.warning(f"Possible hallucation(s) detected: {warnings_str}")
+    with results_lock:
         warning_count += len(warnings)
         warning_audio_inputs.append(filename)
-        send_warning_email(audio_input=filename, warnings=warnings)
+    send_warning_email(audio_input=filename, warnings=warnings)
 
-    # Clear buffer after checking for warnings.
-    memoryHandler.stream.truncate(0)
-    memoryHandler.stream.seek(0)
 
+def open_metrics_log(output_directory: Path) -> MetricsLog:
+    """Start a new metrics file for this run (one per batch or daemon run)."""
+    global metrics_log
+    metrics_dir = config["system"].get("metrics_dir") or (
+        output_directory / "_asr_metrics"
+    )
+    run_name = datetime.now().strftime("%Y%m%d-%H%M%S")
+    metrics_log = MetricsLog(Path(metrics_dir) / f"metrics_{run_name}.jsonl")
+    return metrics_log
 
-def process_file(filepath: Path, output_directory: Path):
-    """Process a single audio file through the ASR workflow."""
-    global stats
-    filename = filepath.name
 
+def record_file_metrics(process_info: ProcessInfo, status: str) -> None:
+    """Append the stage breakdown of a finished or failed file to the run's log."""
+    if metrics_log is None:
+        return
     try:
-        process_info = init_process_info(filepath)
+        metrics_log.write(process_info.metrics_record(status))
+    except OSError as e:
+        logger.warning(
+            "Could not write metrics for %s: %s", process_info.filename, e
+        )
 
-        audio_length = compute_audio_length_seconds(filepath)
-        process_info.audio_length = audio_length
 
-        logger.info(
-            "Starting transcription of %s, %s...",
-            process_info.filename,
-            process_info.formatted_audio_length(),
-        )
+def record_file_outcome(filepath: Path, status: str) -> None:
+    """Remember a processed input in the watch-mode ledger (if any)."""
+    if ledger is None:
+        return
+    try:
+        ledger.record(filepath, status)
+    except OSError as e:
+        logger.warning("Could not update ledger for %s: %s", filepath.name, e)
+
 
-        result = run_whisper_pipeline(filepath)
-        translation_payload = result.get("translation_result")
+def handle_file_failure(
+    filepath: Path,
+    exception: Exception,
+    process_info: Optional[ProcessInfo] = None,
+) -> None:
+    logger.error(exception, exc_info=True)
+    clip_batcher.discard(filepath)
+    send_failure_email(stats=stats, audio_input=filepath.name, exception=exception)
+    record_file_outcome(filepath, "failed")
+    if process_info is not None:
+        process_info.end = datetime.now()
+        record_file_metrics(process_info, "failed")
 
+
+def transcribe_stage(job: FileJob) -> FileJob:
+    """Stage 1: audio length, Whisper subprocess and segment post-processing."""
+    process_info = job.process_info
+
+    if job.has_no_speech:
         logger.info(
-            "Whisper pipeline completed for %s, starting post-processing...",
+            "No speech found in %s (%.1fs of %.1fs); skipping transcription.",
             process_info.filename,
+            job.speech["speech_seconds"],
+            job.speech["audio_seconds"],
         )
+        job.result = no_speech_result(job.speech)
+        job.processed = {"segments": [], "word_segments": []}
+        process_info.audio_length = job.speech["audio_seconds"]
+        return job
+
+    with stage_timer("probe"):
+        probed_length = compute_audio_length_seconds(job.filepath)
+    process_info.audio_length = probed_length
+
+    logger.info(
+        "Starting transcription of %s, %s...",
+        process_info.filename,
+        process_info.formatted_audio_length(),
+    )
 
-        processed_whisperx_output, translation_processed_output = postprocess_pipeline(
-            result
+    if stage_cache.enabled:
+        with stage_timer("audio_hash"):
+            job.cache_keys = build_stage_keys(job.filepath)
+
+    def run_whisper():
+        with stage_timer("whisper"):
+            result = run_whisper_pipeline(job.filepath)
+        # Subprocess timings belong to this run, not to the cached result.
+        process_info.add_stage_metrics(result.pop("stage_metrics", []))
+        process_info.whisper_attempts = result.pop("whisper_attempts", [])
+        if len(process_info.whisper_attempts) > 1:
+            logger.warning(
+                "Whisper needed %d attempts for %s: %s",
+                len(process_info.whisper_attempts),
+                process_info.filename,
+                process_info.whisper_attempts,
+            )
+        return result
+
+    def ran_with_configured_settings(_result=None) -> bool:
+        return all(
+            attempt["rung"] == "configured"
+            for attempt in process_info.whisper_attempts
+            if attempt["status"] == "ok"
         )
 
-        language_meta = build_language_meta(result)
-        model_name = derive_model_name(result)
-
-        # LLM subprocess
-        llm_output = run_llm_if_enabled(processed_whisperx_output["segments"])
-        logger.info("Post-processing completed for %s.", process_info.filename)
+    # Results of a lighter OOM retry rung are not cached under the key of the
+    # configured settings, and neither is anything derived from them.
+    job.result = cached_stage(
+        job, "whisper", run_whisper, should_store=ran_with_configured_settings
+    )
+    if not ran_with_configured_settings():
+        job.cache_keys = None
+    # A grouped short file whose result came from the cache leaves its group.
+    clip_batcher.discard(job.filepath)
+    process_info.audio_length = resolve_audio_length(probed_length, job.result)
+
+    logger.info(
+        "Whisper pipeline completed for %s, starting post-processing...",
+        process_info.filename,
+    )
 
-        # Output layout + docs + writing
-        layout = build_output_layout(
-            output_directory=output_directory,
-            filename=filename,
-            model_name=model_name,
-            language_meta=language_meta,
+    with stage_timer("postprocess"):
+        job.processed, job.translation_processed = cached_stage(
+            job, "postprocess", lambda: postprocess_pipeline(job.result)
         )
+    if columnar_results:
+        # Only the writers need the raw result again; keep it compact until then.
+        with stage_timer("pack_result"):
+            job.result = pack_result(job.result)
+    return job
+
+
+def llm_stage(job: FileJob) -> FileJob:
+    """Stage 2: LLM subprocess (summaries / table of contents)."""
+
+    def run_llm():
+        llm_output = run_llm_if_enabled(job.processed["segments"])
+        # Subprocess timings belong to this run, not to the cached result.
+        job.process_info.add_stage_metrics(llm_output.pop("stage_metrics", []))
+        job.process_info.llm_completions = llm_output.pop("llm_completions", [])
+        return llm_output
+
+    if job.has_no_speech:
+        job.llm_output = {}
+    elif use_summarization or use_toc:
+        # Failed or partial LLM runs are not cached, so they are retried.
+        with stage_timer("llm"):
+            job.llm_output = cached_stage(
+                job, "llm", run_llm, should_store=llm_output_is_complete
+            )
+    else:
+        job.llm_output = run_llm_if_enabled(job.processed["segments"])
+    logger.info("Post-processing completed for %s.", job.process_info.filename)
+    return job
+
+
+def write_stage(job: FileJob) -> FileJob:
+    """Stage 3: output files, bag metadata and ZIP archive."""
+    process_info = job.process_info
+    filename = job.filepath.name
+    result = unpack_result(job.result)
+
+    language_meta = build_language_meta(result)
+    model_name = derive_model_name(result)
+
+    # Output layout + docs + writing
+    layout = build_output_layout(
+        output_directory=job.output_directory,
+        filename=filename,
+        model_name=model_name,
+        language_meta=language_meta,
+    )
 
+    with stage_timer("write_outputs"):
         copy_documentation_files(layout.dir_path)
 
-        write_primary_outputs(
-            layout=layout,
-            result=result,
-            processed=processed_whisperx_output,
-            llm_output=llm_output,
+        if job.has_no_speech:
+            # Minimal bag: documentation plus the VAD measurement.
+            write_json(append_affix(layout.output_base_path, "_no_speech"), job.speech)
+        else:
+            write_primary_outputs(
+                layout=layout,
+                result=result,
+                processed=job.processed,
+                llm_output=job.llm_output,
+            )
+
+            write_translation_outputs_if_any(
+                layout=layout,
+                translation_payload=result.get("translation_result"),
+                translation_processed=job.translation_processed,
+            )
+
+            duplicate_speaker_csvs_to_ohd_import(layout)
+
+    # Bag metadata + finalize
+    bag_info = build_bag_info(
+        filename=filename,
+        model_name=model_name,
+        language_meta=language_meta,
+        audio_length=process_info.audio_length,
+        translation_enabled=bool(result.get("translation_enabled")),
+    )
+    finalize_and_zip_bag(layout.dir_path, layout.data_dir, bag_info)
+
+    # Stats + logging
+    process_info.end = datetime.now()
+    with results_lock:
+        stats.append(process_info)
+
+    logger.info(
+        "Completed transcription process of %s after %s (rtf %s)",
+        process_info.filename,
+        process_info.formatted_process_duration(),
+        format_realtime_factor(process_info.realtime_factor()),
+    )
+
+    logger.info(
+        "Stage breakdown of %s: %s",
+        filename,
+        process_info.formatted_stage_breakdown(),
+    )
+    record_file_metrics(process_info, "done")
+
+    # Warning scan (log of this file's stages)
+    handle_hallucination_warnings_for_file(filename, job.log.getvalue())
+    record_file_outcome(job.filepath, "done")
+    return job
+
+
+FILE_STAGES = (
+    ("whisper", transcribe_stage),
+    ("llm", llm_stage),
+    ("writer", write_stage),
+)
+
+
+def guarded_stage(stage_func):
+    """Wrap a stage so a failing file is reported and dropped from the pipeline."""
+
+    def run(job: FileJob) -> Optional[FileJob]:
+        try:
+            with (
+                capture_job_log(job.log),
+                collect_stage_metrics(job.process_info.stage_metrics),
+            ):
+                return stage_func(job)
+        except Exception as e:
+            handle_file_failure(job.filepath, e, job.process_info)
+            return None
+
+    return run
+
+
+def start_file_job(filepath: Path, output_directory: Path) -> Optional[FileJob]:
+    """New job for a file, or None (reported as failed) if it cannot be set up."""
+    try:
+        return new_file_job(filepath, output_directory)
+    except Exception as e:
+        handle_file_failure(filepath, e)
+        return None
+
+
+def process_file(filepath: Path, output_directory: Path):
+    """Process a single audio file through the ASR workflow."""
+    job = start_file_job(filepath, output_directory)
+    if job is None:
+        return
+    try:
+        with (
+            capture_job_log(job.log),
+            collect_stage_metrics(job.process_info.stage_metrics),
+        ):
+            for _name, stage_func in FILE_STAGES:
+                job = stage_func(job)
+
+    except Exception as e:
+        handle_file_failure(filepath, e, job.process_info)
+
+
+def process_files_pipelined(filepaths: Iterable[Path], output_directory: Path):
+    """
+    Process files through a staged pipeline so that, e.g., file N+1 is in
+    Whisper while file N is in the LLM subprocess and file N-1 is written.
+    """
+    cpu_pool = get_cpu_pool()
+    if cpu_pool is not None:
+        logger.info(
+            "CPU pool: %d Whisper workers with %s cores each",
+            cpu_pool.size,
+            "/".join(str(len(cores)) for cores in cpu_pool.partitions),
         )
+    workers = {
+        "whisper": whisper_stage_workers(),
+        "llm": pipeline_config.get("pipeline_llm_workers", 1),
+        "writer": pipeline_config.get("pipeline_writer_workers", 1),
+    }
+    pipeline = StagedPipeline(
+        [
+            Stage(name, guarded_stage(stage_func), workers[name])
+            for name, stage_func in FILE_STAGES
+        ],
+        queue_size=pipeline_config.get("pipeline_queue_size", 2),
+    )
+    logger.info(
+        "Running pipelined processing (whisper=%d, llm=%d, writer=%d workers)",
+        workers["whisper"],
+        workers["llm"],
+        workers["writer"],
+    )
+
+    def jobs():
+        # Jobs are created lazily so start times reflect when a file enters
+        # the pipeline rather than when the batch was scheduled. A file that
+        # cannot be set up is skipped.
+        for filepath in filepaths:
+            job = start_file_job(filepath, output_directory)
+            if job is not None:
+                yield job
+
+    pipeline.run(jobs())
+
+
+def whisper_stage_workers() -> int:
+    """Number of files that are transcribed at the same time."""
+    if not use_pipeline():
+        return 1
+    workers = pipeline_config.get("pipeline_whisper_workers", 1)
+    cpu_pool = get_cpu_pool()
+    if cpu_pool is not None:
+        # One Whisper job per core partition of the CPU pool.
+        workers = max(workers, cpu_pool.size)
+    return workers
 
-        write_translation_outputs_if_any(
-            layout=layout,
-            translation_payload=translation_payload,
-            translation_processed=translation_processed_output,
+
+def measure_speech(filepaths: List[Path]) -> Dict[Path, Dict[str, float]]:
+    """
+    Run the VAD prepass over the files and remember the measurements for
+    the jobs created for them later.
+    """
+    measured = run_vad_prepass([str(path) for path in filepaths])
+    speech = {path: measured[str(path)] for path in filepaths if str(path) in measured}
+    speech_activity.update(speech)
+    silent = [
+        path.name
+        for path, entry in speech.items()
+        if entry["speech_seconds"] < min_speech_seconds
+    ]
+    if silent:
+        logger.info(
+            "No speech found in %d file(s), writing minimal bags: %s",
+            len(silent),
+            ", ".join(silent),
         )
+    return speech
 
-        duplicate_speaker_csvs_to_ohd_import(layout)
 
-        # Bag metadata + finalize
-        bag_info = build_bag_info(
-            filename=filename,
-            model_name=model_name,
-            language_meta=language_meta,
-            audio_length=audio_length,
-            translation_enabled=bool(result.get("translation_enabled")),
+def schedule_files(filepaths: List[Path]) -> List[Path]:
+    """
+    Order files longest-first using cheap duration probes and log the
+    estimated makespan of the Whisper stage. With the VAD prepass enabled
+    the measured speech duration is used as cost instead, since silence is
+    skipped by the transcription. With job_order = "name" the name order is
+    kept. With clip_batch_seconds, runs of short files are then grouped for
+    shared transcription batches.
+    """
+    speech = measure_speech(filepaths) if use_vad_prepass else {}
+    job_order = pipeline_config.get("job_order", "longest_first")
+    longest_first = job_order == "longest_first"
+    if not longest_first and not clip_batch_seconds:
+        return filepaths
+
+    durations = probe_durations(filepaths)
+    ordered = (
+        order_by_cost(filepaths, durations, speech) if longest_first else filepaths
+    )
+    if clip_batch_seconds:
+        plan_clip_batches(ordered, durations, speech)
+    return ordered
+
+
+def order_by_cost(
+    filepaths: List[Path],
+    durations: Dict[Path, Optional[float]],
+    speech: Dict[Path, Dict[str, float]],
+) -> List[Path]:
+    """Longest-first order by speech (if measured) or probed duration."""
+    costs = {
+        path: speech[path]["speech_seconds"] if path in speech else durations[path]
+        for path in filepaths
+    }
+    ordered = order_longest_first(filepaths, costs)
+
+    known = [costs[path] for path in ordered if costs[path] is not None]
+    unknown_count = len(ordered) - len(known)
+    if known:
+        workers = whisper_stage_workers()
+        rtf = pipeline_config.get("estimated_rtf", 0.25)
+        makespan = estimate_makespan([seconds * rtf for seconds in known], workers)
+        logger.info(
+            "Scheduled %d file(s) longest-first: %s of %s, estimated makespan "
+            "%s on %d Whisper worker(s) at rtf %.2f%s",
+            len(ordered),
+            format_timestamp(sum(known))[0],
+            "speech" if speech else "audio",
+            format_timestamp(makespan)[0],
+            workers,
+            rtf,
+            f" ({unknown_count} file(s) without known duration last)"
+            if unknown_count
+            else "",
         )
-        finalize_and_zip_bag(layout.dir_path, layout.data_dir, bag_info)
+    return ordered
 
-        # Stats + logging
-        process_info.end = datetime.now()
-        stats.append(process_info)
 
+def plan_clip_batches(
+    ordered: List[Path],
+    durations: Dict[Path, Optional[float]],
+    speech: Dict[Path, Dict[str, float]],
+) -> None:
+    """
+    Group consecutive short files (with speech) for shared batches. Files
+    whose Whisper result is cached are left out; they are not transcribed.
+    """
+
+    def is_short(path: Path) -> bool:
+        if path in speech:
+            if speech[path]["speech_seconds"] < min_speech_seconds:
+                return False
+            return speech[path]["audio_seconds"] <= clip_batch_seconds
+        return durations.get(path) is not None and durations[path] <= clip_batch_seconds
+
+    # Cached files do not reach Whisper, so they do not split a run of clips.
+    uncached = [
+        path
+        for path in ordered
+        if not (is_short(path) and has_cached_whisper_result(path))
+    ]
+    grouped = clip_batcher.plan(uncached, is_short)
+    if grouped:
         logger.info(
-            "Completed transcription process of %s after %s (rtf %.2f)",
-            process_info.filename,
-            process_info.formatted_process_duration(),
-            process_info.realtime_factor(),
+            "%d short file(s) will be transcribed in groups of up to %d.",
+            grouped,
+            clip_batcher.max_files,
         )
 
-        # Warning scan (log buffer)
-        handle_hallucination_warnings_for_file(filename)
 
-    except Exception as e:
-        logger.error(e, exc_info=True)
-        send_failure_email(stats=stats, audio_input=filename, exception=e)
+def has_cached_whisper_result(path: Path) -> bool:
+    """True if the stage cache holds a Whisper result for the file."""
+    if not stage_cache.enabled:
+        return False
+    try:
+        key = build_stage_keys(path)["whisper"]
+    except OSError:
+        return False
+    return stage_cache.path_for("whisper", key).exists()
+
+
+def use_pipeline() -> bool:
+    """Pipelined processing is enabled explicitly or implied by CPU pool mode."""
+    return bool(pipeline_config.get("pipeline_enabled", False) or get_cpu_pool())
 
 
 def process_directory(input_directory: Path, output_directory: Path):
@@ -328,8 +836,17 @@ def process_directory(input_directory: Path, output_directory: Path):
     else:
         logger.info(f"Processing {len(filtered_paths)} files...")
 
-    for filepath in filtered_paths:
-        process_file(filepath, output_directory)
+    filtered_paths = schedule_files(filtered_paths)
+    open_metrics_log(output_directory)
+
+    try:
+        if use_pipeline():
+            process_files_pipelined(filtered_paths, output_directory)
+        else:
+            for filepath in filtered_paths:
+                process_file(filepath, output_directory)
+    finally:
+        shutdown_whisper_worker()
 
     send_success_email(
         stats=stats,
@@ -338,6 +855,95 @@ def process_directory(input_directory: Path, output_directory: Path):
     )
 
 
+def send_digest_email() -> None:
+    """Send a success email for everything finished since the last digest."""
+    global warning_count
+    with results_lock:
+        if not stats:
+            return
+        digest_stats = list(stats)
+        digest_warning_count = warning_count
+        digest_warning_inputs = list(warning_audio_inputs)
+        stats.clear()
+        warning_count = 0
+        warning_audio_inputs.clear()
+
+    send_success_email(
+        stats=digest_stats,
+        warning_count=digest_warning_count,
+        warning_audio_inputs=digest_warning_inputs,
+    )
+
+
+def run_watch_mode(input_directory: Path, output_directory: Path):
+    """
+    Daemon mode: poll the input directory and process files as soon as they
+    are stable. A ledger of processed inputs survives restarts, and success
+    emails are sent as periodic digests. SIGTERM/SIGINT stop polling; files
+    already queued are finished before the daemon exits.
+    """
+    global ledger
+    system_config = config["system"]
+    ledger_path = system_config.get("ledger_path") or (
+        output_directory / "_asr_ledger.jsonl"
+    )
+    ledger = ProcessedLedger(Path(ledger_path))
+    open_metrics_log(output_directory)
+    watcher = FolderWatcher(
+        input_directory,
+        ledger,
+        should_be_processed,
+        stable_seconds=system_config.get("watch_stable_seconds", 60),
+    )
+    poll_interval = system_config.get("watch_interval_seconds", 30)
+    digest_interval = system_config.get("digest_interval_minutes", 1440) * 60
+
+    stop_event = threading.Event()
+
+    def request_stop(signum, _frame):
+        logger.info("Received signal %d, finishing queued files...", signum)
+        stop_event.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    def ready_files():
+        next_digest = time.monotonic() + digest_interval
+        while not stop_event.is_set():
+            try:
+                ready = schedule_files(watcher.poll())
+            except Exception as e:
+                # E.g. the input share is briefly unavailable; poll again later.
+                logger.error("Polling %s failed: %s", input_directory, e, exc_info=True)
+                ready = []
+            for filepath in ready:
+                logger.info("New input ready: %s", filepath.name)
+                yield filepath
+                if stop_event.is_set():
+                    return
+            if time.monotonic() >= next_digest:
+                send_digest_email()
+                next_digest = time.monotonic() + digest_interval
+            stop_event.wait(poll_interval)
+
+    logger.info(
+        "Watching %s for new files (poll every %ss, ledger %s)...",
+        input_directory,
+        poll_interval,
+        ledger_path,
+    )
+    try:
+        if use_pipeline():
+            process_files_pipelined(ready_files(), output_directory)
+        else:
+            for filepath in ready_files():
+                process_file(filepath, output_directory)
+    finally:
+        shutdown_whisper_worker()
+        send_digest_email()
+        logger.info("Watch mode stopped.")
+
+
 if __name__ == "__main__":
     input_directory = Path(config["system"]["input_path"])
     output_directory = Path(config["system"]["output_path"])
@@ -349,4 +955,7 @@ if __name__ == "__main__":
         raise FileNotFoundError(f"Output directory does not exist: {output_directory}")
 
     log_config()
-    process_directory(input_directory, output_directory)
+    if config["system"].get("watch_mode", False):
+        run_watch_mode(input_directory, output_directory)
+    else:
+        process_directory(input_directory, output_directory)
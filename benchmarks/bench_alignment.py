@@ -0,0 +1,86 @@
+"""
+Benchmark serial against sharded parallel forced alignment.
+Aligns the same transcript once serially and once per worker count, checks
+that every parallel result equals the serial one and reports the timings.
+
+Usage:
+    python benchmarks/bench_alignment.py AUDIO [--transcript JSON] [--workers 2 4]
+
+`--transcript` takes a whisperx JSON with "segments" and "language" (e.g. the
+`*_unprocessed.json` output of an earlier run); without it the audio is
+transcribed with the configured Whisper model first.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from subprocesses import whisper_subprocess  # noqa: E402
+
+# whisper_subprocess sends stdout to stderr; the report goes to the real stdout.
+_stdout = sys.__stdout__
+
+
+def report(message: str) -> None:
+    print(message, file=_stdout, flush=True)
+
+
+def load_transcription(args, audio) -> dict:
+    if args.transcript:
+        with open(args.transcript, encoding="utf-8") as transcript_file:
+            data = json.load(transcript_file)
+        segments = [
+            {"start": s["start"], "end": s["end"], "text": s["text"]}
+            for s in data["segments"]
+        ]
+        return {"segments": segments, "language": data["language"]}
+    model = whisper_subprocess.load_transcription_model()
+    return whisper_subprocess.transcribe_audio(
+        model, audio, language=whisper_subprocess.language_audio
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("audio")
+    parser.add_argument("--transcript")
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4])
+    args = parser.parse_args()
+
+    with whisper_subprocess.decode_audio(args.audio) as audio_buffer:
+        audio = audio_buffer.array
+        transcription = load_transcription(args, audio)
+        report(
+            f"{audio_buffer.seconds:.0f}s of audio, "
+            f"{len(transcription['segments'])} segments"
+        )
+
+        start = time.perf_counter()
+        serial = whisper_subprocess.align_transcription(transcription, audio)
+        serial_seconds = time.perf_counter() - start
+        report(f"serial          {serial_seconds:8.1f}s")
+
+        for workers in args.workers:
+            whisper_subprocess.align_workers = workers
+            shards = whisper_subprocess.alignment_shards(transcription["segments"])
+            start = time.perf_counter()
+            parallel = whisper_subprocess.align_transcription(
+                transcription, audio, buffer_path=str(audio_buffer.path)
+            )
+            seconds = time.perf_counter() - start
+            identical = parallel == serial
+            report(
+                f"{workers} workers ({len(shards)} shards) {seconds:8.1f}s  "
+                f"speedup {serial_seconds / seconds:4.2f}x  "
+                f"{'identical' if identical else 'DIFFERENT'}"
+            )
+            if not identical:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Benchmark handing a Whisper result from a subprocess to the coordinator.
+A child process builds a synthetic transcript of the given length (segments
+with word timings, word segments and a translation) and returns it over
+stdout ("pipe") or in a memory-mapped result file ("mmap"). Reports the
+best wall time per mode over a few runs, with the time the child needs just
+to build the transcript subtracted, and checks that both arrive intact.
+
+Usage:
+    python benchmarks/bench_result_transfer.py [--hours 1 4] [--runs 3] [--legacy]
+
+`--legacy` also measures the former stdout reader (1 KiB reads appended to a
+bytes object), which is quadratic in the result size.
+"""
+
+import argparse
+import os
+import pickle
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from subprocesses.ipc import RESULT_PATH_ENV, result_file, write_result  # noqa: E402
+from subprocesses.subprocess_handler import (  # noqa: E402
+    load_result,
+    stream_subprocess_output,
+)
+
+WORDS_PER_MINUTE = 150
+WORDS_PER_SEGMENT = 15
+
+
+def synthetic_result(hours: float) -> dict:
+    """A whisperx-like result of `hours` of speech, with translation."""
+
+    def transcript(text: str) -> dict:
+        segments = []
+        word_segments = []
+        seconds_per_word = 60 / WORDS_PER_MINUTE
+        count = int(hours * 60 * WORDS_PER_MINUTE)
+        for first in range(0, count, WORDS_PER_SEGMENT):
+            words = [
+                {
+                    "word": f"{text}{index % 97}",
+                    "start": round(index * seconds_per_word, 3),
+                    "end": round((index + 0.8) * seconds_per_word, 3),
+                    "score": 0.9,
+                    "speaker": f"SPEAKER_{index // 600 % 3:02d}",
+                }
+                for index in range(first, min(first + WORDS_PER_SEGMENT, count))
+            ]
+            word_segments.extend(words)
+            segments.append(
+                {
+                    "start": words[0]["start"],
+                    "end": words[-1]["end"],
+                    "text": " ".join(word["word"] for word in words),
+                    "speaker": words[0]["speaker"],
+                    "words": words,
+                }
+            )
+        return {"segments": segments, "word_segments": word_segments}
+
+    return {
+        **transcript("wort"),
+        "language": "de",
+        "translation": transcript("word"),
+    }
+
+
+def emit(hours: float, discard: bool) -> None:
+    result = synthetic_result(hours)
+    if not discard:
+        write_result(result, sys.__stdout__.buffer)
+
+
+def read_legacy(process) -> bytes:
+    data = b""
+    while True:
+        chunk = process.stdout.read(1024)
+        if not chunk:
+            break
+        data += chunk
+    process.wait()
+    return data
+
+
+def run_child(hours: float, mode: str):
+    """Run one child; returns (seconds, result or None)."""
+    command = [sys.executable, __file__, "--emit", str(hours)]
+    if mode == "build":
+        command.append("--discard")
+    start = time.perf_counter()
+    with result_file() as path:
+        env = {**os.environ, RESULT_PATH_ENV: path} if mode == "mmap" else None
+        process = subprocess.Popen(
+            command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env
+        )
+        if mode == "legacy":
+            process.stderr.close()
+            result = pickle.loads(read_legacy(process))
+        else:
+            stdout_data, _ = stream_subprocess_output(process, "Benchmark")
+            result = (
+                None
+                if mode == "build"
+                else load_result(stdout_data, path if mode == "mmap" else None)
+            )
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--hours", type=float, nargs="+", default=[1, 4])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--legacy", action="store_true")
+    parser.add_argument("--emit", type=float, help=argparse.SUPPRESS)
+    parser.add_argument("--discard", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.emit is not None:
+        emit(args.emit, args.discard)
+        return
+
+    modes = ["pipe", "mmap"] + (["legacy"] if args.legacy else [])
+    for hours in args.hours:
+        expected = synthetic_result(hours)
+        size_mb = len(pickle.dumps(expected, protocol=pickle.HIGHEST_PROTOCOL)) / 2**20
+        build = min(run_child(hours, "build")[0] for _ in range(max(1, args.runs)))
+        print(f"{hours:g} h, {size_mb:.0f} MB pickled, build {build:.2f}s")
+        for mode in modes:
+            best = None
+            for _ in range(max(1, args.runs)):
+                seconds, result = run_child(hours, mode)
+                if result != expected:
+                    print(f"  {mode:<7} DIFFERENT result")
+                    sys.exit(1)
+                best = seconds if best is None else min(best, seconds)
+            print(f"  {mode:<7} {best - build:8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
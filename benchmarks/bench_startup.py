@@ -0,0 +1,57 @@
+"""
+Startup-time benchmark for the coordinator and its tools.
+Imports each module in a fresh interpreter, reports the best wall time over a
+few runs and lists any heavy dependencies the import pulled in (those should
+only be loaded by the code paths that need them).
+
+Usage: python benchmarks/bench_startup.py [--runs N]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+MODULES = ["asr_workflow", "llm_workflows.llm_debug"]
+HEAVY_MODULES = ["torch", "whisperx", "pyannote", "lxml", "weasyprint", "pyexcel_ods3"]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"seconds": elapsed, "heavy": heavy}}))
+"""
+
+
+def measure_import(module: str) -> dict:
+    """Import `module` in a fresh interpreter and return its timing report."""
+    code = _PROBE.format(module=module, heavy=HEAVY_MODULES)
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    for module in MODULES:
+        reports = [measure_import(module) for _ in range(max(1, args.runs))]
+        best = min(report["seconds"] for report in reports)
+        heavy = sorted({name for report in reports for name in report["heavy"]})
+        print(f"{module:<28} {best * 1000:8.1f} ms   heavy: {', '.join(heavy) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ import toml
 
 from config.logger import logger
 from config.default_config import CONST_DEFAULT_CONFIG
+from config.host_profile import apply_host_profile
 
 combined_config = {}
 
@@ -28,6 +29,9 @@ def initialize_config():
         "toc": CONST_DEFAULT_CONFIG["toc"] | data.get("toc", {}),
         "translation": CONST_DEFAULT_CONFIG["translation"] | data.get("translation", {}),
     }
+    tuned = apply_host_profile(combined_config["whisper"])
+    if tuned:
+        logger.debug(f"Using tuned Whisper settings of this host: {tuned}")
 
 
 def get_config() -> dict:
@@ -10,6 +10,25 @@ CONST_DEFAULT_CONFIG = {
         "output_path": "",
         "email_notifications": False,
         "zip_bags": True,
+        "cache_path": "",
+        "watch_mode": False,
+        "watch_interval_seconds": 30,
+        "watch_stable_seconds": 60,
+        "ledger_path": "",
+        "metrics_dir": "",
+        "digest_interval_minutes": 1440,
+        "job_order": "longest_first",
+        "estimated_rtf": 0.25,
+        "vad_prepass": False,
+        "min_speech_seconds": 1.0,
+        "pipeline_enabled": False,
+        "pipeline_queue_size": 2,
+        "pipeline_whisper_workers": 1,
+        "pipeline_llm_workers": 1,
+        "pipeline_writer_workers": 1,
+        "result_transfer": "pipe",
+        "result_transfer_dir": "",
+        "columnar_results": False,
     },
     "whisper": {
         "model": "large-v3",
@@ -18,10 +37,13 @@ CONST_DEFAULT_CONFIG = {
         "batch_size": 28,
         "beam_size": 5,
         "compute_type": "float32",
+        "use_host_profile": True,
+        "host_profile_path": "",
         "language": None,
         "translation_enabled": False,
         "translation_target_language": "en",
         "translation_model": "large-v3",
+        "shared_translation_pass": False,
         "use_initial_prompt": False,
         "initial_prompt": "",
         "max_sentence_length": 120,
@@ -33,6 +55,21 @@ CONST_DEFAULT_CONFIG = {
         "no_repeat_ngram_size": 10,
         "repetition_penalty": 1.0,
         "api_key": None,
+        "cpu_pool_size": 1,
+        "cpu_affinity": False,
+        "persistent_worker": False,
+        "worker_max_jobs": 20,
+        "worker_max_rss_mb": 0,
+        "oom_retry": True,
+        "oom_window_seconds": 600,
+        "memory_limit_mb": 0,
+        "audio_buffer_dir": "",
+        "streaming_window_seconds": 0,
+        "chunk_workers": 1,
+        "align_workers": 1,
+        "concurrent_diarization": False,
+        "clip_batch_seconds": 0,
+        "clip_batch_files": 8,
     },
     "llm_meta": {
         "use_summarization": False,
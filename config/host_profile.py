@@ -0,0 +1,78 @@
+"""
+Per-host Whisper settings found by the auto-tuner.
+
+`python -m subprocesses.whisper_autotune CLIP` measures several batch sizes
+and compute types on this machine and stores the best combination here, per
+host name, model and device. When `whisper.use_host_profile` is enabled the
+stored values replace the static `batch_size` / `compute_type` from the config.
+"""
+
+import json
+import os
+import socket
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DEFAULT_PROFILE_PATH = Path("~/.config/asr-transcribe/host_profiles.json")
+TUNED_KEYS = ("batch_size", "compute_type")
+
+
+def profile_path(path: Optional[str] = None) -> Path:
+    return Path(path or DEFAULT_PROFILE_PATH).expanduser()
+
+
+def profile_key(model: str, device: str) -> str:
+    return f"{model}|{device}"
+
+
+def read_profiles(path: Optional[str] = None) -> Dict[str, Any]:
+    """All stored profiles as {host: {"model|device": settings}}; {} if none."""
+    try:
+        with profile_path(path).open(encoding="utf-8") as profile_file:
+            return json.load(profile_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def host_settings(
+    model: str, device: str, path: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """Tuned settings of this host for a model and device, if any."""
+    host = read_profiles(path).get(socket.gethostname(), {})
+    return host.get(profile_key(model, device))
+
+
+def save_host_settings(
+    model: str, device: str, settings: Dict[str, Any], path: Optional[str] = None
+) -> Path:
+    """Store tuned settings of this host; other hosts' entries are kept."""
+    target = profile_path(path)
+    profiles = read_profiles(path)
+    host = profiles.setdefault(socket.gethostname(), {})
+    host[profile_key(model, device)] = settings
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+        json.dump(profiles, tmp_file, indent=2, sort_keys=True)
+    os.replace(tmp_name, target)
+    return target
+
+
+def apply_host_profile(whisper_config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Replace the tuned keys of the Whisper config section with this host's
+    stored values. Returns the applied settings, or None if there are none.
+    """
+    if not whisper_config.get("use_host_profile", True):
+        return None
+    settings = host_settings(
+        whisper_config["model"],
+        whisper_config["device"],
+        whisper_config.get("host_profile_path") or None,
+    )
+    if not settings:
+        return None
+    applied = {key: settings[key] for key in TUNED_KEYS if key in settings}
+    whisper_config.update(applied)
+    return applied
@@ -1,6 +1,8 @@
 import sys
 import io
 import logging
+import threading
+from contextlib import contextmanager
 import colorlog
 
 DATE_FORMAT = datefmt = "%Y-%m-%dT%H:%M:%S%z"
@@ -21,16 +23,47 @@ stdoutHandler = colorlog.StreamHandler(stream=sys.stderr)
 stdoutHandler.setLevel(logging.DEBUG)
 stdoutHandler.setFormatter(fmt_col)
 
-memory_stream = io.StringIO()
-memoryHandler = logging.StreamHandler(stream=memory_stream)
-memoryHandler.setLevel(logging.INFO)
-memoryHandler.setFormatter(fmt)
+# Log of the file job the current thread works on (see capture_job_log), so
+# files processed at the same time do not share one buffer.
+_job_log = threading.local()
+
+
+class JobLogHandler(logging.Handler):
+    """Writes records to the job log of the emitting thread, if any."""
+
+    def emit(self, record):
+        stream = getattr(_job_log, "stream", None)
+        if stream is not None:
+            stream.write(self.format(record) + "\n")
+
+
+@contextmanager
+def capture_job_log(stream: io.StringIO):
+    """Send the log records of this thread (and `append_job_log`) to `stream`."""
+    previous = getattr(_job_log, "stream", None)
+    _job_log.stream = stream
+    try:
+        yield stream
+    finally:
+        _job_log.stream = previous
+
+
+def append_job_log(text: str) -> None:
+    """Add output that is not logged (e.g. of a subprocess) to the job log."""
+    stream = getattr(_job_log, "stream", None)
+    if stream is not None and text:
+        stream.write(text if text.endswith("\n") else text + "\n")
+
+
+jobLogHandler = JobLogHandler()
+jobLogHandler.setLevel(logging.INFO)
+jobLogHandler.setFormatter(fmt)
 
 filehandler = logging.FileHandler("asr-transcribe.log")
 filehandler.setLevel(logging.INFO)
 filehandler.setFormatter(fmt)
 
 logger.addHandler(stdoutHandler)
-logger.addHandler(memoryHandler)
+logger.addHandler(jobLogHandler)
 logger.addHandler(filehandler)
 logger.setLevel(logging.DEBUG)
@@ -10,11 +10,10 @@ from pathlib import Path
 from unicodedata import normalize
 
 from jinja2 import Environment, PackageLoader, select_autoescape
-from pyexcel_ods3 import save_data
-from output.tei_builder import WhisperToTEIConverter
 
 from config.app_config import get_config
 from utils.utilities import format_timestamp, append_suffix, append_affix
+from utils.stage_metrics import stage_timer
 
 env = Environment(
     loader=PackageLoader("output.writers"), autoescape=select_autoescape()
@@ -635,6 +634,9 @@ def write_ods(path_without_ext: Path, segments: list):
     data.update({"Sheet 1": rows})
 
     full_path = append_suffix(path_without_ext, ".ods")
+    # Imported lazily, like weasyprint and lxml, to keep startup fast.
+    from pyexcel_ods3 import save_data
+
     save_data(str(full_path), data)
 
 
@@ -765,6 +767,9 @@ def write_tei_xml(
     Write TEI XML file
     """
     full_path = append_suffix(path_without_ext, ".tei.xml")
+    # lxml is only needed here; import lazily to keep startup fast.
+    from output.tei_builder import WhisperToTEIConverter
+
     converter = WhisperToTEIConverter()
     tei_xml_content = converter.convert(segments, full_path.name, summaries=summaries)
     with open(full_path, "w", encoding="utf-8") as xml_file:
@@ -850,8 +855,9 @@ def write_output_files(
     write_rtf_speaker(base_path, segments)
     write_rtf_timestamps(base_path, segments)
     write_odt(base_path, segments)  # Added new ODT function
-    write_pdf(base_path, segments)
-    write_pdf_timestamps(base_path, segments)
+    with stage_timer("pdf"):
+        write_pdf(base_path, segments)
+        write_pdf_timestamps(base_path, segments)
     write_csv(
         base_path,
         segments,
@@ -1,5 +1,9 @@
 """Subprocess handlers for memory-isolated processing."""
 
-from subprocesses.subprocess_handler import run_whisper_subprocess, run_llm_subprocess
+from subprocesses.subprocess_handler import (
+    run_whisper_subprocess,
+    run_llm_subprocess,
+    shutdown_whisper_worker,
+)
 
-__all__ = ["run_whisper_subprocess", "run_llm_subprocess"]
+__all__ = ["run_whisper_subprocess", "run_llm_subprocess", "shutdown_whisper_worker"]
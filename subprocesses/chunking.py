@@ -0,0 +1,174 @@
+"""
+Helpers for processing a recording in windows instead of all at once.
+Windows are cut in a pause near each nominal boundary (the longest gap
+between VAD speech regions, or the quietest stretch), so a cut rarely falls
+inside a word; results of the windows are shifted by their offsets and
+merged back into one whisperx-style result.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+# Energy is measured in 100 ms frames and smoothed over 500 ms, so the cut
+# lands in a pause rather than between two syllables.
+_FRAME_SECONDS = 0.1
+_SMOOTH_FRAMES = 5
+
+
+def quietest_point(samples: np.ndarray) -> int:
+    """Index of the centre of the quietest (smoothed) stretch of `samples`."""
+    frame = int(SAMPLE_RATE * _FRAME_SECONDS)
+    frame_count = len(samples) // frame
+    if frame_count == 0:
+        return len(samples) // 2
+    frames = np.asarray(samples[: frame_count * frame], dtype=np.float32)
+    energy = np.square(frames.reshape(frame_count, frame)).mean(axis=1)
+    width = min(_SMOOTH_FRAMES, frame_count)
+    smoothed = np.convolve(energy, np.ones(width) / width, mode="valid")
+    best = int(np.argmin(smoothed))
+    return (best * frame) + (width * frame) // 2
+
+
+def speech_gap_point(
+    total_samples: int, speech: Sequence[Tuple[int, int]]
+) -> Optional[int]:
+    """
+    Centre of the longest stretch of [0, total_samples) outside the speech
+    regions (sorted (start, stop) sample ranges), or None if there is none.
+    """
+    best = None
+    previous_stop = 0
+    for start, stop in [*speech, (total_samples, total_samples)]:
+        start = min(max(start, 0), total_samples)
+        if start > previous_stop and (
+            best is None or start - previous_stop > best[1] - best[0]
+        ):
+            best = (previous_stop, start)
+        previous_stop = max(previous_stop, min(stop, total_samples))
+    return None if best is None else (best[0] + best[1]) // 2
+
+
+def plan_windows(
+    total_samples: int,
+    window_samples: int,
+    read: Callable[[int, int], np.ndarray],
+    search_samples: Optional[int] = None,
+    find_cut: Callable[[np.ndarray], int] = quietest_point,
+) -> List[Tuple[int, int]]:
+    """
+    Split [0, total_samples) into consecutive (start, stop) windows of about
+    `window_samples`. Each cut is placed at `find_cut(samples)` (by default
+    the quietest point) within the last `search_samples` before the nominal
+    boundary; only those search regions are read, via `read(start, stop)`.
+    """
+    if window_samples <= 0 or total_samples <= window_samples:
+        return [(0, total_samples)]
+    if search_samples is None:
+        search_samples = window_samples // 4
+    search_samples = max(1, min(search_samples, window_samples // 2))
+
+    windows = []
+    start = 0
+    while total_samples - start > window_samples:
+        search_stop = start + window_samples
+        search_start = search_stop - search_samples
+        cut = search_start + find_cut(read(search_start, search_stop))
+        windows.append((start, cut))
+        start = cut
+    windows.append((start, total_samples))
+    return windows
+
+
+def plan_chunks(
+    total_samples: int,
+    parts: int,
+    read: Callable[[int, int], np.ndarray],
+    search_samples: Optional[int] = None,
+) -> List[Tuple[int, int]]:
+    """
+    Split [0, total_samples) into `parts` chunks of about equal length for
+    parallel processing. Each cut is placed at the quietest point within
+    `search_samples` around the even split point.
+    """
+    if parts <= 1 or total_samples <= parts:
+        return [(0, total_samples)]
+    if search_samples is None:
+        search_samples = min(total_samples // parts // 4, 60 * SAMPLE_RATE)
+    half = max(1, search_samples // 2)
+
+    cuts = [0]
+    for index in range(1, parts):
+        target = index * total_samples // parts
+        low = max(cuts[-1] + 1, target - half)
+        high = min(total_samples - 1, target + half)
+        cuts.append(low + quietest_point(read(low, high)) if high > low else target)
+    cuts.append(total_samples)
+    return list(zip(cuts, cuts[1:]))
+
+
+def split_contiguous(weights: Sequence[float], parts: int) -> List[Tuple[int, int]]:
+    """
+    Split items into at most `parts` contiguous, non-empty (start, stop) index
+    ranges with about equal total weight.
+    """
+    count = len(weights)
+    parts = max(1, min(parts, count))
+    total = float(sum(weights))
+    ranges = []
+    start = 0
+    running = 0.0
+    for index, weight in enumerate(weights):
+        running += weight
+        remaining_parts = parts - len(ranges) - 1
+        remaining_items = count - index - 1
+        if remaining_parts == 0:
+            break
+        # Close the range once it reaches its share, or when exactly enough
+        # items remain to give every later range one item.
+        if running >= total * (len(ranges) + 1) / parts or (
+            remaining_items == remaining_parts
+        ):
+            ranges.append((start, index + 1))
+            start = index + 1
+    ranges.append((start, count))
+    return ranges
+
+
+def shift_result(result: Dict[str, Any], offset_seconds: float) -> Dict[str, Any]:
+    """
+    Move all segment and word timestamps of an aligned result by an offset.
+    whisperx lists the same word dicts in "segments" and "word_segments",
+    so every dict is shifted only once.
+    """
+    if not offset_seconds:
+        return result
+    shifted = set()
+
+    def shift(item):
+        if id(item) in shifted:
+            return
+        shifted.add(id(item))
+        for key in ("start", "end"):
+            if item.get(key) is not None:
+                item[key] = item[key] + offset_seconds
+
+    for segment in result.get("segments", []):
+        shift(segment)
+        for word in segment.get("words", []):
+            shift(word)
+        for char in segment.get("chars", []) or []:
+            shift(char)
+    for word in result.get("word_segments", []):
+        shift(word)
+    return result
+
+
+def merge_results(results: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """Concatenate already shifted results (in time order) into one."""
+    merged = {"segments": [], "word_segments": []}
+    for result in results:
+        merged["segments"].extend(result.get("segments", []))
+        merged["word_segments"].extend(result.get("word_segments", []))
+    return merged
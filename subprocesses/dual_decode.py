@@ -0,0 +1,221 @@
+"""
+Batched Whisper decoding beyond a single `FasterWhisperPipeline.transcribe`.
+
+- Transcription and translation of one recording in a single pass: VAD and
+  features are computed once, each batch of VAD segments is encoded once,
+  and the encoder output is decoded twice (transcribe and translate
+  prompts), instead of running the whole pipeline once per task.
+- Transcription of several short recordings with shared inference batches:
+  the VAD segments of all recordings fill the batches together, each row
+  with the prompt (language) of its own recording.
+
+The decode replicates whisperx's batched decode (prompt, decoding options,
+avg_logprob), so results match those of separate `transcribe` calls.
+"""
+
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from faster_whisper.tokenizer import Tokenizer
+from whisperx.asr import find_numeral_symbol_tokens
+from whisperx.audio import N_SAMPLES, SAMPLE_RATE, log_mel_spectrogram
+from whisperx.vads import Pyannote, Vad
+
+TASKS = ("transcribe", "translate")
+
+
+def vad_segments(pipeline, audio: np.ndarray, chunk_size: int = 30) -> List[dict]:
+    """Speech segments of `audio`, merged exactly as in `pipeline.transcribe`."""
+    if issubclass(type(pipeline.vad_model), Vad):
+        waveform = pipeline.vad_model.preprocess_audio(audio)
+        merge_chunks = pipeline.vad_model.merge_chunks
+    else:
+        waveform = Pyannote.preprocess_audio(audio)
+        merge_chunks = Pyannote.merge_chunks
+    segments = pipeline.vad_model({"waveform": waveform, "sample_rate": SAMPLE_RATE})
+    return merge_chunks(
+        segments,
+        chunk_size,
+        onset=pipeline._vad_params["vad_onset"],
+        offset=pipeline._vad_params["vad_offset"],
+    )
+
+
+def segment_features(pipeline, audio: np.ndarray, segment: dict) -> np.ndarray:
+    """Log-mel features of one VAD segment, padded to 30 s like whisperx."""
+    start = int(segment["start"] * SAMPLE_RATE)
+    stop = int(segment["end"] * SAMPLE_RATE)
+    samples = audio[start:stop]
+    n_mels = pipeline.model.feat_kwargs.get("feature_size")
+    return log_mel_spectrogram(
+        samples,
+        n_mels=n_mels if n_mels is not None else 80,
+        padding=N_SAMPLES - samples.shape[0],
+    )
+
+
+def decode_options(pipeline, tokenizer: Tokenizer):
+    """Transcription options for `tokenizer`, with numerals suppressed if enabled."""
+    options = pipeline.options
+    if pipeline.suppress_numerals:
+        suppressed = find_numeral_symbol_tokens(tokenizer) + options.suppress_tokens
+        options = replace(options, suppress_tokens=list(set(suppressed)))
+    return options
+
+
+def decode_prompt(whisper_model, tokenizer: Tokenizer, options) -> List[int]:
+    """Prompt tokens as built by `WhisperModel.generate_segment_batched`."""
+    previous_tokens = []
+    if options.initial_prompt is not None:
+        previous_tokens = tokenizer.encode(" " + options.initial_prompt.strip())
+    return whisper_model.get_prompt(
+        tokenizer,
+        previous_tokens,
+        without_timestamps=options.without_timestamps,
+        prefix=options.prefix,
+        hotwords=options.hotwords,
+    )
+
+
+def decode(
+    whisper_model,
+    encoder_output,
+    prompts: List[List[int]],
+    tokenizer: Tokenizer,
+    options,
+):
+    """
+    Decode an already encoded batch with one prompt per row; same decoding
+    parameters and avg_logprob as `WhisperModel.generate_segment_batched`.
+    """
+    results = whisper_model.model.generate(
+        encoder_output,
+        prompts,
+        beam_size=options.beam_size,
+        patience=options.patience,
+        length_penalty=options.length_penalty,
+        max_length=whisper_model.max_length,
+        suppress_blank=options.suppress_blank,
+        suppress_tokens=options.suppress_tokens,
+        no_repeat_ngram_size=options.no_repeat_ngram_size,
+        repetition_penalty=options.repetition_penalty,
+        return_scores=True,
+    )
+    tokens_batch = []
+    avg_logprobs = []
+    for result in results:
+        tokens = result.sequences_ids[0]
+        tokens_batch.append([token for token in tokens if token < tokenizer.eot])
+        cum_logprob = result.scores[0] * (len(tokens) ** options.length_penalty)
+        avg_logprobs.append(cum_logprob / (len(tokens) + 1))
+    return tokenizer.tokenizer.decode_batch(tokens_batch), avg_logprobs
+
+
+def transcript_segment(segment: dict, text: str, avg_logprob: float) -> dict:
+    """Output segment for a VAD segment, as in `pipeline.transcribe`."""
+    return {
+        "text": text,
+        "start": round(segment["start"], 3),
+        "end": round(segment["end"], 3),
+        "avg_logprob": avg_logprob,
+    }
+
+
+def transcribe_and_translate(
+    pipeline, audio: np.ndarray, batch_size: int, language: Optional[str] = None
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Transcribe and translate `audio` with a whisperx pipeline, sharing VAD,
+    features and encoder output. Returns (transcription, translation) in
+    the format of `pipeline.transcribe`.
+    """
+    segments = vad_segments(pipeline, audio)
+    language = language or pipeline.preset_language or pipeline.detect_language(audio)
+    whisper_model = pipeline.model
+    decoders = []
+    for task in TASKS:
+        tokenizer = Tokenizer(
+            whisper_model.hf_tokenizer,
+            whisper_model.model.is_multilingual,
+            task=task,
+            language=language,
+        )
+        options = decode_options(pipeline, tokenizer)
+        decoders.append(
+            (tokenizer, options, decode_prompt(whisper_model, tokenizer, options))
+        )
+
+    outputs = ([], [])
+    batch_size = batch_size or 1
+    for first in range(0, len(segments), batch_size):
+        batch = segments[first : first + batch_size]
+        features = np.stack(
+            [segment_features(pipeline, audio, segment) for segment in batch]
+        )
+        encoder_output = whisper_model.encode(features)
+        for output, (tokenizer, options, prompt) in zip(outputs, decoders):
+            texts, avg_logprobs = decode(
+                whisper_model, encoder_output, [prompt] * len(batch), tokenizer, options
+            )
+            for segment, text, avg_logprob in zip(batch, texts, avg_logprobs):
+                output.append(transcript_segment(segment, text, avg_logprob))
+    transcription, translation = (
+        {"segments": output, "language": language} for output in outputs
+    )
+    return transcription, translation
+
+
+def transcribe_files(
+    pipeline, audios: List[np.ndarray], batch_size: int, language: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Transcribe several recordings with shared inference batches. Each
+    recording gets its own VAD segments, language (detected per recording
+    unless given) and prompt; results are returned per recording in the
+    format of `pipeline.transcribe`.
+    """
+    whisper_model = pipeline.model
+    languages = []
+    prompts = []
+    rows = []  # (recording index, VAD segment)
+    options = None
+    for index, audio in enumerate(audios):
+        rows.extend((index, segment) for segment in vad_segments(pipeline, audio))
+        recording_language = (
+            language or pipeline.preset_language or pipeline.detect_language(audio)
+        )
+        tokenizer = Tokenizer(
+            whisper_model.hf_tokenizer,
+            whisper_model.model.is_multilingual,
+            task="transcribe",
+            language=recording_language,
+        )
+        # Numeral suppression depends on the vocabulary only, not the language.
+        options = options or decode_options(pipeline, tokenizer)
+        languages.append(recording_language)
+        prompts.append(decode_prompt(whisper_model, tokenizer, options))
+
+    outputs = [[] for _ in audios]
+    batch_size = batch_size or 1
+    for first in range(0, len(rows), batch_size):
+        batch = rows[first : first + batch_size]
+        features = np.stack(
+            [
+                segment_features(pipeline, audios[index], segment)
+                for index, segment in batch
+            ]
+        )
+        texts, avg_logprobs = decode(
+            whisper_model,
+            whisper_model.encode(features),
+            [prompts[index] for index, _ in batch],
+            tokenizer,
+            options,
+        )
+        for (index, segment), text, avg_logprob in zip(batch, texts, avg_logprobs):
+            outputs[index].append(transcript_segment(segment, text, avg_logprob))
+    return [
+        {"segments": output, "language": recording_language}
+        for output, recording_language in zip(outputs, languages)
+    ]
@@ -0,0 +1,188 @@
+"""
+Structured event channel between the worker subprocesses and the parent.
+The parent passes the write end of a pipe in EVENT_FD_ENV; the subprocess
+writes one JSON object per line, separate from its stdout (result) and
+stderr (human-readable output). Every event has "event", "process" and
+"time" (Unix time); the kinds are:
+
+- stage_start: {"stage"}
+- stage_end: {"stage", "wall_seconds", "cpu_seconds", "peak_rss_mb"}
+- progress: {"stage", "percent"}
+- llm_completion: {"prompt_tokens", "completion_tokens", "seconds",
+  "tokens_per_second"}
+- exit: {"peak_rss_mb"}
+
+Without a channel (e.g. a subprocess started by hand) emitting is a no-op.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config.logger import logger
+from utils.utilities import get_peak_rss_mb
+
+EVENT_FD_ENV = "ASR_EVENT_FD"
+PROGRESS_LOG_STEP = 25
+
+_channel = None
+_process = "subprocess"
+_lock = threading.Lock()
+
+
+# --- Subprocess side ---
+
+
+def open_channel(process: str) -> None:
+    """
+    Start emitting events as `process` if the parent passed a channel. The
+    variable is removed, so processes started from this one do not take the
+    descriptor for theirs.
+    """
+    global _channel, _process
+    _process = process
+    fd = os.environ.pop(EVENT_FD_ENV, None)
+    if fd:
+        _channel = os.fdopen(int(fd), "w", encoding="utf-8", buffering=1)
+
+
+def emit(event: str, **fields: Any) -> None:
+    """Write one event line; never fails the subprocess."""
+    global _channel
+    if _channel is None:
+        return
+    line = json.dumps(
+        {"event": event, "process": _process, "time": time.time(), **fields},
+        default=str,
+    )
+    with _lock:
+        try:
+            _channel.write(line + "\n")
+        except (OSError, ValueError):
+            # The parent stopped reading.
+            _channel = None
+
+
+@contextmanager
+def stage(name: str):
+    """Emit stage_start and stage_end (with timings) around the block."""
+    if _channel is None:
+        yield
+        return
+    emit("stage_start", stage=name)
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    try:
+        yield
+    finally:
+        emit(
+            "stage_end",
+            stage=name,
+            wall_seconds=time.perf_counter() - start_wall,
+            cpu_seconds=time.process_time() - start_cpu,
+            peak_rss_mb=get_peak_rss_mb(),
+        )
+
+
+def progress(stage_name: str, percent: float) -> None:
+    emit("progress", stage=stage_name, percent=round(float(percent), 1))
+
+
+def progress_callback(stage_name: str) -> Optional[Callable[[float], None]]:
+    """A whisperx `progress_callback` for the stage, or None without a channel."""
+    if _channel is None:
+        return None
+    return lambda percent: progress(stage_name, percent)
+
+
+# --- Parent side ---
+
+
+class EventReader:
+    """
+    Parent end of the event channel of one subprocess. Pass `env(...)` and
+    `pass_fds=(reader.write_fd,)` to Popen, then call `start()` (also if
+    Popen failed) and `close()` once the subprocess exited. Events are
+    mirrored to the log; stage timings and LLM completions are kept.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._read_fd, self.write_fd = os.pipe()
+        self.stages: List[Dict[str, Any]] = []
+        self.llm_completions: List[Dict[str, Any]] = []
+        self.peak_rss_mb: Optional[float] = None
+        self._progress: Dict[str, Tuple[float, float]] = {}
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def env(self, env: Optional[Dict[str, str]]) -> Dict[str, str]:
+        return {**(env or os.environ), EVENT_FD_ENV: str(self.write_fd)}
+
+    def start(self) -> None:
+        # Only the subprocess writes, so the reader sees EOF once it exits.
+        os.close(self.write_fd)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._thread.join(timeout=5)
+
+    def stage_metrics(self) -> List[Dict[str, Any]]:
+        """Stage records (see utils.stage_metrics) of the stage_end events."""
+        return [
+            {
+                "stage": event["stage"],
+                "wall_seconds": event["wall_seconds"],
+                "cpu_seconds": event["cpu_seconds"],
+                "peak_rss_mb": event["peak_rss_mb"],
+                "process": event["process"],
+            }
+            for event in self.stages
+        ]
+
+    def _run(self) -> None:
+        with os.fdopen(self._read_fd, "r", encoding="utf-8", errors="replace") as lines:
+            for line in lines:
+                try:
+                    self.handle(json.loads(line))
+                except (ValueError, KeyError, TypeError):
+                    logger.debug("[%s] Unreadable event: %r", self.name, line)
+
+    def handle(self, event: Dict[str, Any]) -> None:
+        kind = event["event"]
+        if kind == "stage_start":
+            logger.debug("[%s] %s started", self.name, event["stage"])
+        elif kind == "stage_end":
+            self.stages.append(event)
+            logger.info(
+                "[%s] %s done in %.1fs (CPU %.1fs, peak RSS %.0f MB)",
+                self.name,
+                event["stage"],
+                event["wall_seconds"],
+                event["cpu_seconds"],
+                event["peak_rss_mb"],
+            )
+        elif kind == "progress":
+            self._log_progress(event["stage"], event["percent"])
+        elif kind == "llm_completion":
+            self.llm_completions.append(event)
+            logger.info(
+                "[%s] %d tokens in %.1fs (%.1f tokens/s)",
+                self.name,
+                event["completion_tokens"],
+                event["seconds"],
+                event["tokens_per_second"],
+            )
+        elif kind == "exit":
+            self.peak_rss_mb = event["peak_rss_mb"]
+
+    def _log_progress(self, stage_name: str, percent: float) -> None:
+        """Log every PROGRESS_LOG_STEP percent; a stage starting over logs anew."""
+        step = percent // PROGRESS_LOG_STEP * PROGRESS_LOG_STEP
+        last_percent, logged_step = self._progress.get(stage_name, (None, None))
+        if last_percent is None or percent < last_percent or step > logged_step:
+            logger.info("[%s] %s %.0f%%", self.name, stage_name, percent)
+            logged_step = step
+        self._progress[stage_name] = (percent, logged_step)
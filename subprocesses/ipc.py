@@ -0,0 +1,110 @@
+"""
+Framing helpers for the pipes between the main process and worker subprocesses.
+Each frame is an 8-byte big-endian length header followed by a pickle payload,
+so several requests/responses can travel over one long-lived pipe.
+
+One-shot subprocesses can instead hand over their result in a file: the
+parent names a temporary file in RESULT_PATH_ENV, the subprocess pickles
+into it and the parent unpickles straight from a read-only memory map.
+
+A Whisper subprocess can also stream partial results as frames on an extra
+pipe whose file descriptor the parent passes in SEGMENT_FD_ENV.
+"""
+
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+_HEADER = struct.Struct(">Q")
+RESULT_PATH_ENV = "ASR_RESULT_PATH"
+SEGMENT_FD_ENV = "ASR_SEGMENT_FD"
+
+
+def write_frame(stream, obj) -> None:
+    """Pickle `obj` and write it as a single length-prefixed frame."""
+    payload = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    stream.write(_HEADER.pack(len(payload)))
+    stream.write(payload)
+    stream.flush()
+
+
+def read_frame(stream):
+    """
+    Read the next frame from `stream` and return the unpickled object.
+    Returns None on a clean EOF (peer closed the pipe between frames).
+    """
+    header = _read_exact(stream, _HEADER.size)
+    if header is None:
+        return None
+    (length,) = _HEADER.unpack(header)
+    payload = _read_exact(stream, length)
+    if payload is None:
+        raise EOFError("Pipe closed before frame payload was received")
+    return pickle.loads(payload)
+
+
+def _read_exact(stream, size: int):
+    """Read exactly `size` bytes, or return None if the stream is already at EOF."""
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = stream.readinto(view[received:])
+        if not count:
+            if received == 0:
+                return None
+            raise EOFError(f"Pipe closed after {received} of {size} bytes")
+        received += count
+    return buffer
+
+
+def segment_channel():
+    """
+    Writable stream for segment frames if the parent passed one in
+    SEGMENT_FD_ENV, else None. The variable is removed, so processes started
+    from this one do not take the descriptor for theirs.
+    """
+    fd = os.environ.pop(SEGMENT_FD_ENV, None)
+    return os.fdopen(int(fd), "wb") if fd else None
+
+
+def write_result(obj, stdout) -> None:
+    """
+    Write a subprocess result: into the file named in RESULT_PATH_ENV if the
+    parent set one (streamed, without building the pickle in memory), else
+    pickled to `stdout`.
+    """
+    path = os.environ.get(RESULT_PATH_ENV)
+    if path:
+        with open(path, "wb") as handle:
+            pickle.dump(obj, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        return
+    stdout.write(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+    stdout.flush()
+
+
+@contextmanager
+def result_file(directory: Optional[str] = None) -> Iterator[str]:
+    """Path of an empty temporary result file, removed afterwards."""
+    fd, path = tempfile.mkstemp(prefix="asr-result-", suffix=".pickle", dir=directory)
+    os.close(fd)
+    try:
+        yield path
+    finally:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+def read_result(path: str):
+    """Unpickle a result file written by `write_result` via a memory map."""
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            raise EOFError(f"No result was written to {path}")
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return pickle.loads(mapped)
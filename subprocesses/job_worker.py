@@ -0,0 +1,148 @@
+"""
+Helper processes for splitting one file's Whisper work across CPU cores.
+
+The Whisper subprocess starts `job_worker.py` processes for pieces of work
+(chunks of a long recording, alignment shards, diarization), sends each a
+job frame and collects the answer, in parallel or in the background; all
+processes attach to the same decoded-audio buffer by path, so the audio is
+never copied through the pipes. Each worker reads job frames from stdin
+until EOF and keeps its models loaded in between.
+"""
+
+import subprocess
+import sys
+import threading
+from typing import Any, Dict, List, Optional
+
+from subprocesses.ipc import read_frame, write_frame
+from utils.stage_metrics import StageMetrics, record_stage_metrics
+
+
+class JobProcess:
+    """One job worker subprocess and its job/response pipes."""
+
+    def __init__(self, env: Optional[Dict[str, str]] = None):
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "subprocesses.job_worker"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            env=env,
+        )
+
+    def is_alive(self) -> bool:
+        return self.process.poll() is None
+
+    def send(self, job: Dict[str, Any]) -> None:
+        write_frame(self.process.stdin, job)
+
+    def receive(self) -> Optional[Dict[str, Any]]:
+        try:
+            return read_frame(self.process.stdout)
+        except EOFError:
+            return None
+
+    def close(self) -> int:
+        try:
+            self.process.stdin.close()
+        except Exception:
+            pass
+        return self.process.wait()
+
+    def kill(self) -> None:
+        if self.is_alive():
+            self.process.kill()
+        self.process.wait()
+
+
+class PendingJob:
+    """
+    A job running in a worker process in the background. `result()` waits
+    for it; the worker is closed afterwards unless `keep_worker` is set
+    (e.g. for a worker that keeps a model loaded across files).
+    """
+
+    def __init__(
+        self, worker: JobProcess, job: Dict[str, Any], keep_worker: bool = False
+    ):
+        self.worker = worker
+        self.keep_worker = keep_worker
+        self._response: Optional[Dict[str, Any]] = None
+        self._thread = threading.Thread(target=self._run, args=(job,), daemon=True)
+        self._thread.start()
+
+    def _run(self, job: Dict[str, Any]):
+        try:
+            self.worker.send(job)
+            self._response = self.worker.receive()
+        except BrokenPipeError:
+            self._response = None
+        finally:
+            if not self.keep_worker or self._response is None:
+                self.worker.close()
+
+    def result(self) -> Any:
+        """
+        Wait for the job and return its value. Stage metrics reported by the
+        worker are added to the caller's collector. Raises RuntimeError if the
+        job failed or the worker died.
+        """
+        self._thread.join()
+        response = self._response
+        if response is None:
+            code = self.worker.process.poll()
+            raise RuntimeError(f"Job worker exited unexpectedly (code {code})")
+        if not response["ok"]:
+            raise RuntimeError(f"Job worker failed: {response['error']}")
+        record_stage_metrics(
+            StageMetrics(**entry) for entry in response.get("stage_metrics", [])
+        )
+        return response["value"]
+
+    def cancel(self) -> None:
+        """Stop the worker if the job is still running (no-op once finished)."""
+        if self._thread.is_alive():
+            self.worker.kill()
+            self._thread.join()
+
+
+def run_parallel_jobs(
+    jobs: List[Dict[str, Any]], envs: List[Optional[Dict[str, str]]]
+) -> List[Any]:
+    """
+    Run each job in its own worker process (jobs[i] with envs[i]) and return
+    the values in job order. Raises RuntimeError if any job failed.
+    """
+    pending = [PendingJob(JobProcess(env), job) for job, env in zip(jobs, envs)]
+    try:
+        return [job.result() for job in pending]
+    finally:
+        for job in pending:
+            job.cancel()
+
+
+def serve():
+    """Worker loop: answer job frames from stdin until EOF."""
+    import traceback
+
+    # Importing the Whisper module redirects sys.stdout to stderr; frames go
+    # to the interpreter's original stdout.
+    from subprocesses.whisper_subprocess import ModelCache, handle_job
+
+    models = ModelCache()
+    stdin = sys.stdin.buffer
+    stdout = sys.__stdout__.buffer
+    while True:
+        job = read_frame(stdin)
+        if job is None:
+            break
+        try:
+            value, stage_metrics = handle_job(job, models)
+            response = {"ok": True, "value": value, "stage_metrics": stage_metrics}
+        except Exception as e:
+            traceback.print_exc(file=sys.stderr)
+            response = {"ok": False, "error": f"{e}\n{traceback.format_exc()}"}
+        write_frame(stdout, response)
+
+
+if __name__ == "__main__":
+    serve()
@@ -14,19 +14,23 @@ Returns a unified result dict:
 
 import sys
 import pickle
+import time
 import json
 import os
 from datetime import datetime
 from pathlib import Path
 from llama_cpp import Llama
 from config.app_config import get_config
-from utils.utilities import cleanup_cuda_memory
+from subprocesses import events
+from subprocesses.ipc import write_result
+from utils.utilities import cleanup_cuda_memory, get_peak_rss_mb
 
 config = get_config()
 verbose = config["llm_meta"].get("verbose", False)
 reasoning_log_path = config["llm_meta"].get("reasoning_log", "")
 reasoning_log_max_chars = int(config["llm_meta"].get("reasoning_log_max_chars", 0) or 0)
 run_id = f"{datetime.utcnow().isoformat(timespec='seconds')}Z_{os.getpid()}"
+events.open_channel("llm")
 
 
 class JSONParsingError(Exception):
@@ -147,18 +151,19 @@ def load_model_from_config(model_path: str, profile: int, model_cfg: dict) -> Ll
     if model_name:
         print(f"Loading model: {model_name} (profile {profile})", file=sys.stderr)
 
-    return Llama(
-        model_path=model_path,
-        n_gpu_layers=profile_cfg["n_gpu_layers"],
-        n_ctx=profile_cfg["n_ctx"],
-        n_batch=profile_cfg["n_batch"],
-        n_ubatch=profile_cfg["n_ubatch"],
-        n_threads=model_section.get("n_threads", 8),
-        n_threads_batch=model_section.get("n_threads_batch", 16),
-        flash_attn=model_section.get("flash_attn", True),
-        swa_full=model_section.get("swa_full", True),
-        verbose=verbose,
-    )
+    with events.stage("load_model"):
+        return Llama(
+            model_path=model_path,
+            n_gpu_layers=profile_cfg["n_gpu_layers"],
+            n_ctx=profile_cfg["n_ctx"],
+            n_batch=profile_cfg["n_batch"],
+            n_ubatch=profile_cfg["n_ubatch"],
+            n_threads=model_section.get("n_threads", 8),
+            n_threads_batch=model_section.get("n_threads_batch", 16),
+            flash_attn=model_section.get("flash_attn", True),
+            swa_full=model_section.get("swa_full", True),
+            verbose=verbose,
+        )
 
 
 def strip_reasoning(text: str, meta: dict | None = None) -> str:
@@ -236,6 +241,18 @@ def parse_json_output(text: str) -> dict | list:
         return {"_error": str(e), "_raw": text}
 
 
+def report_completion(usage: dict, seconds: float) -> None:
+    """Send token counts and generation speed of one completion to the parent."""
+    completion_tokens = usage.get("completion_tokens", 0)
+    events.emit(
+        "llm_completion",
+        prompt_tokens=usage.get("prompt_tokens", 0),
+        completion_tokens=completion_tokens,
+        seconds=seconds,
+        tokens_per_second=completion_tokens / seconds if seconds > 0 else 0.0,
+    )
+
+
 def generate(
     llm: Llama,
     system_prompt: str,
@@ -247,6 +264,7 @@ def generate(
     meta: dict | None = None,
 ) -> tuple[str, str]:
     """Generate using llama_cpp. Returns (content, finish_reason)."""
+    start = time.perf_counter()
     output = llm.create_chat_completion(
         messages=[
             {"role": "system", "content": system_prompt},
@@ -257,6 +275,7 @@ def generate(
         top_p=top_p,
         repeat_penalty=repeat_penalty,
     )
+    report_completion(output.get("usage") or {}, time.perf_counter() - start)
     result = output["choices"][0]["message"]["content"]
     finish_reason = output["choices"][0].get("finish_reason", "stop")
 
@@ -270,7 +289,7 @@ def main():
     use_toc = config["llm_meta"].get("use_toc", False)
 
     if not languages:
-        sys.stdout.buffer.write(pickle.dumps({"summaries": {}, "toc": {}}))
+        write_result({"summaries": {}, "toc": {}}, sys.stdout.buffer)
         sys.exit(0)
 
     segments = pickle.loads(sys.stdin.buffer.read())
@@ -279,17 +298,20 @@ def main():
     if use_summarization:
         from llm_workflows.llm_task_summary import run as run_summary
 
-        result["summaries"] = run_summary(segments, languages)
+        with events.stage("summary"):
+            result["summaries"] = run_summary(segments, languages)
 
     cleanup_cuda_memory()
 
     if use_toc:
         from llm_workflows.llm_task_toc import run as run_toc
 
-        result["toc"] = run_toc(segments, languages)
+        with events.stage("toc"):
+            result["toc"] = run_toc(segments, languages)
 
     cleanup_cuda_memory()
-    sys.stdout.buffer.write(pickle.dumps(result))
+    write_result(result, sys.stdout.buffer)
+    events.emit("exit", peak_rss_mb=get_peak_rss_mb())
     sys.exit(0)
 
 
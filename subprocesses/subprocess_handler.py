@@ -1,8 +1,178 @@
+import json
+import os
+import signal
 import subprocess
 import sys
 import threading
 import pickle
-from config.logger import logger
+from contextlib import contextmanager
+from typing import Any, Dict, Generator, Iterator, List, Optional, Tuple
+from config.app_config import get_config
+from config.logger import append_job_log, logger
+from subprocesses.events import EventReader
+from subprocesses.ipc import (
+    RESULT_PATH_ENV,
+    SEGMENT_FD_ENV,
+    read_frame,
+    read_result,
+    result_file,
+    write_frame,
+)
+from utils.cpu_pool import OVERRIDES_ENV, get_cpu_pool
+from utils.utilities import get_rss_mb
+
+config = get_config()
+use_persistent_worker = config["whisper"].get("persistent_worker", False)
+oom_retry = config["whisper"].get("oom_retry", True)
+oom_window_seconds = config["whisper"].get("oom_window_seconds", 600) or 600
+memory_limit_mb = config["whisper"].get("memory_limit_mb", 0) or 0
+result_transfer = config["system"].get("result_transfer", "pipe")
+result_transfer_dir = config["system"].get("result_transfer_dir") or None
+
+PIPE_READ_SIZE = 1 << 16
+LLM_COMPLETION_KEYS = (
+    "prompt_tokens",
+    "completion_tokens",
+    "seconds",
+    "tokens_per_second",
+)
+
+# Error messages of allocation failures in Python, CTranslate2 and torch.
+OOM_MESSAGES = ("out of memory", "MemoryError", "std::bad_alloc")
+LIGHTER_COMPUTE_TYPES = {
+    "float32": "int8",
+    "int8_float32": "int8",
+    "float16": "int8_float16",
+    "bfloat16": "int8_bfloat16",
+}
+
+
+class WhisperOutOfMemory(RuntimeError):
+    """The Whisper subprocess ran out of memory or was stopped by the watchdog."""
+
+    def __init__(self, message: str, peak_rss_mb: float = 0.0):
+        super().__init__(message)
+        self.peak_rss_mb = peak_rss_mb
+
+
+def is_oom_failure(returncode: Optional[int], error_text: str = "") -> bool:
+    """SIGKILL (the kernel OOM killer, or the watchdog) or an allocation error."""
+    if returncode in (-signal.SIGKILL, 128 + signal.SIGKILL):
+        return True
+    return any(message in error_text for message in OOM_MESSAGES)
+
+
+class MemoryWatchdog:
+    """
+    Samples the RSS of a subprocess while it runs and keeps the peak. With a
+    limit, the process is killed once it crosses it, so a runaway job fails
+    (and is retried with lighter settings) before the node is under pressure.
+    """
+
+    def __init__(self, pid: int, limit_mb: float = 0, interval: float = 0.5):
+        self.pid = pid
+        self.limit_mb = limit_mb
+        self.interval = interval
+        self.peak_rss_mb = 0.0
+        self.tripped = False
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            rss_mb = get_rss_mb(self.pid)
+            self.peak_rss_mb = max(self.peak_rss_mb, rss_mb)
+            if self.limit_mb and rss_mb > self.limit_mb:
+                self.tripped = True
+                logger.warning(
+                    "Whisper subprocess exceeded memory_limit_mb (%.0f > %d MB), "
+                    "stopping it",
+                    rss_mb,
+                    self.limit_mb,
+                )
+                try:
+                    os.kill(self.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                return
+            self._stopped.wait(self.interval)
+
+    def stop(self) -> float:
+        """Stop sampling and return the peak RSS in MiB."""
+        self._stopped.set()
+        self._thread.join()
+        return self.peak_rss_mb
+
+
+def oom_ladder(whisper_config: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Settings to try one after the other when Whisper runs out of memory, as
+    (rung name, config overrides): the configured settings, half the batch
+    size, additionally bounded-memory windowed transcription, and finally a
+    lighter compute type.
+    """
+    smaller_batch = {"batch_size": max(1, whisper_config["batch_size"] // 2)}
+    rungs = [("configured", {}), ("smaller_batch", smaller_batch)]
+    chunked = smaller_batch
+    if not whisper_config.get("streaming_window_seconds"):
+        # Parallel chunk/alignment workers each hold their own models.
+        chunked = smaller_batch | {
+            "streaming_window_seconds": oom_window_seconds,
+            "chunk_workers": 1,
+            "align_workers": 1,
+        }
+        rungs.append(("chunked", chunked))
+    lighter = LIGHTER_COMPUTE_TYPES.get(whisper_config["compute_type"])
+    if lighter:
+        rungs.append(("lighter_compute_type", chunked | {"compute_type": lighter}))
+    return rungs
+
+
+def whisper_subprocess_env(overrides: Optional[Dict[str, Any]] = None):
+    """
+    Environment for a Whisper subprocess started from the current thread.
+    In CPU pool mode this carries the thread count and core partition of the
+    thread's pool slot; `overrides` are added to the Whisper config overrides.
+    Without either, the parent environment is inherited.
+    """
+    cpu_pool = get_cpu_pool()
+    env = None
+    if cpu_pool is not None:
+        env = cpu_pool.env_for_slot(cpu_pool.slot_for_current_thread())
+    if overrides:
+        env = dict(env or os.environ)
+        env[OVERRIDES_ENV] = json.dumps(
+            {**json.loads(env.get(OVERRIDES_ENV) or "{}"), **overrides}
+        )
+    return env
+
+
+@contextmanager
+def result_channel() -> Iterator[Optional[str]]:
+    """
+    Temporary file a one-shot subprocess writes its result to, with
+    `result_transfer = "mmap"`; None to receive the result over stdout.
+    """
+    if result_transfer != "mmap":
+        yield None
+        return
+    with result_file(result_transfer_dir) as path:
+        yield path
+
+
+def result_env(env: Optional[Dict[str, str]], result_path: Optional[str]):
+    """Add the result file (if any) to a subprocess environment."""
+    if result_path is None:
+        return env
+    return {**(env or os.environ), RESULT_PATH_ENV: result_path}
+
+
+def load_result(stdout_data, result_path: Optional[str]):
+    """The result of a finished subprocess, from its result file or stdout."""
+    if result_path is not None:
+        return read_result(result_path)
+    return pickle.loads(stdout_data)
 
 
 def stream_subprocess_output(
@@ -18,7 +188,7 @@ def stream_subprocess_output(
         subprocess_name: Name of subprocess for display (e.g., "Whisper", "LLM")
 
     Returns:
-        Tuple of (stdout_data, stderr_data)
+        Tuple of (stdout_data, stderr_data) as bytearrays
     """
     stdout_data = [b""]
     stderr_data = [b""]
@@ -28,16 +198,20 @@ def stream_subprocess_output(
         if stream is None:
             return
 
-        data = b""
+        # Read into one reused buffer and append to a growing bytearray, so
+        # collecting a large result stays linear in its size.
+        data = bytearray()
+        buffer = bytearray(PIPE_READ_SIZE)
+        view = memoryview(buffer)
         try:
             while True:
-                chunk = stream.read(1024)
-                if not chunk:
+                count = stream.readinto1(view)
+                if not count:
                     break
-                data += chunk
+                data += view[:count]
                 if is_stderr:
                     # Display stderr in real-time
-                    sys.stderr.write(chunk.decode("utf-8", errors="ignore"))
+                    sys.stderr.write(str(view[:count], "utf-8", "ignore"))
                     sys.stderr.flush()
         except Exception:
             pass
@@ -75,39 +249,340 @@ def stream_subprocess_output(
     return stdout_data[0], stderr_data[0]
 
 
+class WhisperWorker:
+    """
+    Long-lived Whisper subprocess that keeps its models loaded between files.
+    Jobs and results are exchanged as length-prefixed frames over stdin/stdout;
+    stderr is inherited so worker output still reaches the terminal.
+
+    The worker recycles itself (exits after answering) once it has processed
+    `worker_max_jobs` files or its RSS crosses `worker_max_rss_mb`; the next
+    job then starts a fresh worker, which keeps memory growth bounded.
+    """
+
+    def __init__(self):
+        self.process = None
+        self.peak_rss_mb = 0.0
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        logger.info("Starting persistent Whisper worker...")
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "subprocesses.whisper_subprocess", "--worker"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            env=whisper_subprocess_env(),
+        )
+
+    def run(self, audio_path: str):
+        """Send one job to the worker and return its result dict."""
+        return self.request({"audio_path": str(audio_path)})
+
+    def run_batch(self, audio_paths: List[str]) -> List[Dict[str, Any]]:
+        """Send short files as one job with shared batches; one result per file."""
+        return self.request({"audio_paths": [str(path) for path in audio_paths]})
+
+    def request(self, job: Dict[str, Any]):
+        if not self.is_alive():
+            self.start()
+
+        watchdog = MemoryWatchdog(self.process.pid, memory_limit_mb)
+        try:
+            write_frame(self.process.stdin, job)
+            response = read_frame(self.process.stdout)
+        except (BrokenPipeError, EOFError):
+            response = None
+        finally:
+            self.peak_rss_mb = watchdog.stop()
+
+        if response is None:
+            returncode = self.process.wait()
+            self.process = None
+            message = f"Whisper worker exited unexpectedly (code {returncode})"
+            logger.error(message)
+            if is_oom_failure(returncode):
+                raise WhisperOutOfMemory(message, self.peak_rss_mb)
+            raise RuntimeError(message)
+
+        if response.get("recycle"):
+            logger.info(
+                "Recycling Whisper worker after %d job(s) (RSS %.0f MB)",
+                response.get("jobs_done", 0),
+                response.get("rss_mb", 0.0),
+            )
+            self.close()
+
+        if not response["ok"]:
+            message = f"Whisper worker failed: {response['error']}"
+            logger.error(message)
+            if is_oom_failure(None, response["error"]):
+                # Do not reuse a worker whose allocator may be exhausted.
+                self.close()
+                raise WhisperOutOfMemory(message, self.peak_rss_mb)
+            raise RuntimeError(message)
+
+        logger.info("Whisper worker completed job successfully")
+        return response["result"]
+
+    def close(self):
+        """Close the job pipe and wait for the worker to exit."""
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.close()
+        except Exception:
+            pass
+        self.process.wait()
+        self.process = None
+
+
+# One persistent worker per calling thread, so parallel pipeline stages never
+# share a worker's pipe.
+_whisper_workers = threading.local()
+_all_whisper_workers = []
+_workers_lock = threading.Lock()
+
+
+def get_whisper_worker() -> WhisperWorker:
+    """Return this thread's persistent Whisper worker, creating it on first use."""
+    worker = getattr(_whisper_workers, "worker", None)
+    if worker is None:
+        worker = WhisperWorker()
+        _whisper_workers.worker = worker
+        with _workers_lock:
+            _all_whisper_workers.append(worker)
+    return worker
+
+
+def shutdown_whisper_worker():
+    """Stop all persistent Whisper workers that are still running."""
+    with _workers_lock:
+        workers = list(_all_whisper_workers)
+    for worker in workers:
+        worker.close()
+
+
 def run_whisper_subprocess(audio_path: str):
     """
     Run complete Whisper pipeline in isolated subprocess.
     Returns: dict with segments, word segments, and language/translation metadata.
 
-    Memory is guaranteed to be freed when subprocess exits.
+    Memory is guaranteed to be freed when subprocess exits. With
+    `persistent_worker` enabled the job is handed to a long-lived worker
+    that keeps models loaded and is recycled after a job or memory limit.
+
+    With `oom_retry` a run that runs out of memory is retried on the next
+    rung of `oom_ladder`; every attempt (rung, status, peak RSS) is listed
+    in the result under "whisper_attempts".
+    """
+    rungs = oom_ladder(config["whisper"]) if oom_retry else [("configured", {})]
+    attempts = []
+    for index, (rung, overrides) in enumerate(rungs):
+        try:
+            whisper_result, peak_rss_mb = run_whisper_attempt(audio_path, overrides)
+        except WhisperOutOfMemory as e:
+            attempts.append(
+                {"rung": rung, "status": "oom", "peak_rss_mb": e.peak_rss_mb}
+            )
+            if index + 1 == len(rungs):
+                raise
+            logger.warning(
+                "Whisper ran out of memory with %s settings (peak %.0f MB), "
+                "retrying with %s settings %s",
+                rung,
+                e.peak_rss_mb,
+                rungs[index + 1][0],
+                rungs[index + 1][1],
+            )
+            continue
+        attempts.append({"rung": rung, "status": "ok", "peak_rss_mb": peak_rss_mb})
+        whisper_result["whisper_attempts"] = attempts
+        return whisper_result
+
+
+def run_whisper_batch(audio_paths: List[str]) -> List[Dict[str, Any]]:
+    """
+    Run the Whisper pipeline for several short files in one subprocess (or
+    worker job) whose transcription batches are filled with the speech of
+    all files. Returns one result dict per file, in order.
+    """
+    if use_persistent_worker:
+        return get_whisper_worker().run_batch(audio_paths)
+    results, _ = run_whisper_process(audio_paths, {})
+    # The one-shot subprocess returns a bare result dict for a single file.
+    return [results] if len(audio_paths) == 1 else results
+
+
+def run_whisper_attempt(
+    audio_path: str, overrides: Dict[str, Any]
+) -> Tuple[Dict[str, Any], float]:
+    """
+    One Whisper run with config overrides; returns the result and the peak
+    RSS of the subprocess. Raises WhisperOutOfMemory if it ran out of memory.
+    The persistent worker only serves runs with the configured settings.
     """
+    if use_persistent_worker and not overrides:
+        worker = get_whisper_worker()
+        return worker.run(audio_path), worker.peak_rss_mb
+    return run_whisper_process([audio_path], overrides)
+
+
+def run_whisper_process(
+    audio_paths: List[str], overrides: Dict[str, Any]
+) -> Tuple[Any, float]:
+    """Run one Whisper subprocess for the given files; see run_whisper_attempt."""
     logger.info("Starting Whisper subprocess...")
 
-    # Use Popen for real-time output streaming
-    process = subprocess.Popen(
-        [sys.executable, "-m", "subprocesses.whisper_subprocess", str(audio_path)],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
+    with result_channel() as result_path:
+        events = EventReader("Whisper")
+        try:
+            # Use Popen for real-time output streaming
+            process = subprocess.Popen(
+                whisper_command(audio_paths),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                env=events.env(
+                    result_env(whisper_subprocess_env(overrides), result_path)
+                ),
+                pass_fds=(events.write_fd,),
+            )
+        finally:
+            events.start()
+        watchdog = MemoryWatchdog(process.pid, memory_limit_mb)
+
+        # Stream stderr in real-time while collecting stdout
+        try:
+            stdout_data, stderr_data = stream_subprocess_output(process, "Whisper")
+        finally:
+            peak_rss_mb = exit_peak_rss_mb(watchdog.stop(), events)
+        if len(audio_paths) == 1:
+            # whisperx warnings (e.g. failed alignments) only reach stderr;
+            # keep them with the file for the hallucination check.
+            append_job_log(stderr_data.decode("utf-8", errors="ignore"))
+
+        check_whisper_exit(process, stderr_data, peak_rss_mb)
+
+        # Deserialize result
+        whisper_result = load_result(stdout_data, result_path)
+    logger.info("Whisper subprocess completed successfully")
+
+    return whisper_result, peak_rss_mb
+
+
+def exit_peak_rss_mb(sampled_peak_mb: float, events: EventReader) -> float:
+    """
+    Close the event channel of an exited Whisper subprocess and return its
+    peak RSS. The watchdog only samples, so the exact peak the subprocess
+    reports on exit is used if it is higher; a killed subprocess reports none.
+    """
+    events.close()
+    return max(sampled_peak_mb, events.peak_rss_mb or 0.0)
+
+
+def whisper_command(audio_paths: List[str]) -> List[str]:
+    """Command line of a one-shot Whisper subprocess for the given files."""
+    return [
+        sys.executable,
+        "-m",
+        "subprocesses.whisper_subprocess",
+        *map(str, audio_paths),
+    ]
+
+
+def check_whisper_exit(process, stderr_data, peak_rss_mb: float) -> None:
+    """Raise (WhisperOutOfMemory for OOM failures) if Whisper did not exit cleanly."""
+    if process.returncode == 0:
+        return
+    error_msg = (
+        stderr_data.decode("utf-8", errors="ignore") if stderr_data else "Unknown error"
     )
+    logger.error(f"Whisper subprocess failed: {error_msg}")
+    if is_oom_failure(process.returncode, error_msg):
+        raise WhisperOutOfMemory(
+            f"Whisper subprocess ran out of memory: {error_msg}", peak_rss_mb
+        )
+    raise RuntimeError(f"Whisper subprocess failed: {error_msg}")
 
-    # Stream stderr in real-time while collecting stdout
-    stdout_data, stderr_data = stream_subprocess_output(process, "Whisper")
 
-    if process.returncode != 0:
-        error_msg = (
-            stderr_data.decode("utf-8", errors="ignore")
-            if stderr_data
-            else "Unknown error"
+def stream_whisper_segments(
+    audio_path: str, overrides: Optional[Dict[str, Any]] = None
+) -> Generator[Dict[str, Any], None, Dict[str, Any]]:
+    """
+    Run the Whisper pipeline for one file in a subprocess and yield its
+    aligned segments while it runs: one frame per finished window with
+    `streaming_window_seconds`, otherwise one frame once alignment is done
+    (before diarization). Frames are dicts with "audio_path", "start", "end"
+    (seconds covered), "language", "segments" and "translation_segments";
+    speaker labels are only in the final result.
+
+    The generator returns the complete result, as `run_whisper_attempt`
+    does: `result = yield from stream_whisper_segments(path)`.
+    Always uses a one-shot subprocess, also with `persistent_worker`.
+    Not used by the workflow yet; `run_whisper_subprocess` still returns
+    only the complete result.
+    """
+    read_fd, write_fd = os.pipe()
+    with os.fdopen(read_fd, "rb") as frames, result_channel() as result_path:
+        env = result_env(whisper_subprocess_env(overrides), result_path)
+        events = EventReader("Whisper")
+        try:
+            process = subprocess.Popen(
+                whisper_command([audio_path]),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                env={**events.env(env), SEGMENT_FD_ENV: str(write_fd)},
+                pass_fds=(write_fd, events.write_fd),
+            )
+        finally:
+            # Only the subprocess writes, so EOF follows once it exits.
+            os.close(write_fd)
+            events.start()
+        watchdog = MemoryWatchdog(process.pid, memory_limit_mb)
+        output = []
+        collector = threading.Thread(
+            target=lambda: output.extend(stream_subprocess_output(process, "Whisper")),
+            daemon=True,
         )
-        logger.error(f"Whisper subprocess failed: {error_msg}")
-        raise RuntimeError(f"Whisper subprocess failed: {error_msg}")
+        collector.start()
+        try:
+            while True:
+                try:
+                    frame = read_frame(frames)
+                except EOFError:
+                    frame = None  # Killed while sending a frame, see the exit check.
+                if frame is None:
+                    break
+                yield frame
+            collector.join()
+        finally:
+            peak_rss_mb = exit_peak_rss_mb(watchdog.stop(), events)
+        stdout_data, stderr_data = output
+        check_whisper_exit(process, stderr_data, peak_rss_mb)
+        return load_result(stdout_data, result_path)
 
-    # Deserialize result
-    whisper_result = pickle.loads(stdout_data)
-    logger.info("Whisper subprocess completed successfully")
 
-    return whisper_result
+def run_vad_prepass(audio_paths: List[str]) -> Dict[str, Dict[str, float]]:
+    """
+    Measure speech duration and speech ratio of the files in one VAD-only
+    subprocess. Returns {path: measurement}; files that could not be
+    measured (or all, if the subprocess fails) are missing.
+    """
+    if not audio_paths:
+        return {}
+    logger.info("Starting VAD prepass for %d file(s)...", len(audio_paths))
+    process = subprocess.Popen(
+        [sys.executable, "-m", "subprocesses.vad_prepass", *map(str, audio_paths)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    stdout_data, stderr_data = stream_subprocess_output(process, "VAD")
+    if process.returncode != 0:
+        error_msg = stderr_data.decode("utf-8", errors="ignore") or "Unknown error"
+        logger.warning(f"VAD prepass failed: {error_msg}")
+        return {}
+    return pickle.loads(stdout_data)
 
 
 def run_llm_subprocess(segments):
@@ -118,7 +593,9 @@ def run_llm_subprocess(segments):
         {
             "summaries": {"de": "...", "en": "..."},
             "toc": {"de": "...", "en": "..."},  # future
-            "_meta": {"trial": 1}
+            "_meta": {"trial": 1},
+            "stage_metrics": [...],  # from the event channel
+            "llm_completions": [{"completion_tokens", "tokens_per_second", ...}],
         }
     Returns None if subprocess fails.
 
@@ -129,39 +606,52 @@ def run_llm_subprocess(segments):
     # Serialize segments and pass via stdin
     input_data = pickle.dumps(segments)
 
-    # Use Popen for real-time output streaming
-    process = subprocess.Popen(
-        [sys.executable, "-m", "subprocesses.llm_subprocess"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-    )
+    with result_channel() as result_path:
+        events = EventReader("LLM")
+        try:
+            # Use Popen for real-time output streaming
+            process = subprocess.Popen(
+                [sys.executable, "-m", "subprocesses.llm_subprocess"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                env=events.env(result_env(None, result_path)),
+                pass_fds=(events.write_fd,),
+            )
+        finally:
+            events.start()
 
-    # Send input data and stream stderr in real-time
-    try:
-        process.stdin.write(input_data)
-        process.stdin.close()
-    except BrokenPipeError:
+        # Send input data and stream stderr in real-time
         try:
+            process.stdin.write(input_data)
             process.stdin.close()
-        except Exception:
-            pass
-
-    stdout_data, stderr_data = stream_subprocess_output(
-        process, "LLM", log_stderr_to_logger=True
-    )
-
-    if process.returncode != 0:
-        error_msg = (
-            stderr_data.decode("utf-8", errors="ignore")
-            if stderr_data
-            else "Unknown error"
+        except BrokenPipeError:
+            try:
+                process.stdin.close()
+            except Exception:
+                pass
+
+        stdout_data, stderr_data = stream_subprocess_output(
+            process, "LLM", log_stderr_to_logger=True
         )
-        logger.warning(f"LLM subprocess failed: {error_msg}")
-        return None
-
-    # Deserialize unified result dict
-    llm_result = pickle.loads(stdout_data)
+        events.close()
+
+        if process.returncode != 0:
+            error_msg = (
+                stderr_data.decode("utf-8", errors="ignore")
+                if stderr_data
+                else "Unknown error"
+            )
+            logger.warning(f"LLM subprocess failed: {error_msg}")
+            return None
+
+        # Deserialize unified result dict
+        llm_result = load_result(stdout_data, result_path)
+        llm_result["stage_metrics"] = events.stage_metrics()
+        llm_result["llm_completions"] = [
+            {key: event[key] for key in LLM_COMPLETION_KEYS}
+            for event in events.llm_completions
+        ]
 
     # Log trial info from metadata
     trial = llm_result.get("_meta", {}).get("trial", 0)
@@ -0,0 +1,89 @@
+"""
+VAD-only prepass: speech duration and speech ratio of each input file.
+Uses the same voice activity detection (model and thresholds) as the
+transcription, but loads no Whisper, alignment or diarization model. Runs in
+its own process so torch/pyannote stay out of the coordinator.
+
+Usage: `vad_prepass.py <audio_path> ...`; prints a pickled
+{path: {"audio_seconds", "speech_seconds", "speech_ratio"}} dict to stdout.
+Files that cannot be measured are left out.
+"""
+
+import logging
+import pickle
+import sys
+import warnings
+
+from config.app_config import get_config
+from utils.audio_buffer import SAMPLE_RATE, AudioBuffer
+
+logging.getLogger("whisperx").setLevel(logging.WARNING)
+logging.getLogger("pyannote").setLevel(logging.WARNING)
+warnings.filterwarnings("ignore", category=UserWarning)
+
+# Keep stdout clean for the pickled result.
+_original_stdout = sys.stdout
+sys.stdout = sys.stderr
+
+config = get_config()
+device = config["whisper"]["device"]
+audio_buffer_dir = config["whisper"].get("audio_buffer_dir") or None
+# whisperx.load_model defaults.
+VAD_ONSET = 0.500
+VAD_OFFSET = 0.363
+CHUNK_SECONDS = 30
+
+
+def load_vad_model():
+    import torch
+    from whisperx.vads import Pyannote
+
+    return Pyannote(
+        torch.device(device),
+        token=None,
+        vad_onset=VAD_ONSET,
+        vad_offset=VAD_OFFSET,
+        chunk_size=CHUNK_SECONDS,
+    )
+
+
+def speech_seconds(vad_model, audio) -> float:
+    """Total duration of the speech regions the transcription would see."""
+    from whisperx.vads.pyannote import Binarize
+
+    scores = vad_model(
+        {"waveform": vad_model.preprocess_audio(audio), "sample_rate": SAMPLE_RATE}
+    )
+    binarize = Binarize(max_duration=CHUNK_SECONDS, onset=VAD_ONSET, offset=VAD_OFFSET)
+    return float(sum(segment.duration for segment in binarize(scores).get_timeline()))
+
+
+def measure(vad_model, audio_path: str) -> dict:
+    with AudioBuffer.decode(audio_path, directory=audio_buffer_dir) as audio_buffer:
+        audio_seconds = audio_buffer.seconds
+        speech = (
+            speech_seconds(vad_model, audio_buffer.array)
+            if audio_buffer.num_samples
+            else 0.0
+        )
+    return {
+        "audio_seconds": audio_seconds,
+        "speech_seconds": speech,
+        "speech_ratio": speech / audio_seconds if audio_seconds else 0.0,
+    }
+
+
+def main():
+    vad_model = load_vad_model()
+    results = {}
+    for audio_path in sys.argv[1:]:
+        try:
+            results[audio_path] = measure(vad_model, audio_path)
+        except Exception as e:
+            print(f"VAD prepass failed for {audio_path}: {e}", file=sys.stderr)
+    _original_stdout.buffer.write(pickle.dumps(results))
+    _original_stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Auto-tune Whisper batch size and compute type for this machine.
+Transcribes a calibration clip once per combination, each in a fresh Whisper
+process (so a combination that runs out of memory only kills its own trial),
+records throughput and peak memory, and stores the fastest combination that
+stays within the memory limit in the host profile (see config/host_profile.py).
+
+Usage:
+    python -m subprocesses.whisper_autotune CLIP [--batch-sizes 8 16 28]
+        [--compute-types float32 int8] [--max-memory-mb N] [--dry-run]
+
+CLIP should be a few minutes of typical speech; silence is skipped by VAD
+and would not measure anything.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from config.app_config import get_config
+from config.host_profile import save_host_settings
+
+DEFAULT_BATCH_SIZES = [4, 8, 16, 28, 32]
+DEFAULT_COMPUTE_TYPES = {
+    "cpu": ["float32", "int8"],
+    "cuda": ["float16", "int8_float16"],
+}
+# Leave room for the alignment/diarization models and the rest of the system.
+MEMORY_HEADROOM = 0.8
+
+
+def run_trial(clip: str) -> Dict[str, Any]:
+    """Measure one transcription of `clip` with the (overridden) config."""
+    from subprocesses import whisper_subprocess
+    from utils.utilities import get_peak_rss_mb
+
+    with whisper_subprocess.decode_audio(clip) as audio_buffer:
+        model = whisper_subprocess.load_transcription_model()
+        start = time.perf_counter()
+        whisper_subprocess.transcribe_audio(
+            model, audio_buffer.array, language=whisper_subprocess.language_audio
+        )
+        seconds = time.perf_counter() - start
+        audio_seconds = audio_buffer.seconds
+    measurement = {
+        "audio_seconds": audio_seconds,
+        "transcribe_seconds": seconds,
+        "speed": audio_seconds / seconds if seconds else 0.0,
+        "peak_rss_mb": get_peak_rss_mb(),
+    }
+    if whisper_subprocess.device == "cuda":
+        import torch
+
+        free, total = torch.cuda.mem_get_info()
+        # CTranslate2 keeps its allocations cached, so the memory in use after
+        # the run is the high-water mark of the trial.
+        measurement["gpu_memory_mb"] = (total - free) / (1024 * 1024)
+    return measurement
+
+
+def measure(
+    clip: str, batch_size: int, compute_type: str, timeout: Optional[float]
+) -> Dict[str, Any]:
+    """Run one trial in its own process; failures are returned, not raised."""
+    env = os.environ.copy()
+    env["ASR_WHISPER_OVERRIDES"] = json.dumps(
+        {"batch_size": batch_size, "compute_type": compute_type}
+    )
+    trial = {"batch_size": batch_size, "compute_type": compute_type}
+    try:
+        completed = subprocess.run(
+            [sys.executable, "-m", "subprocesses.whisper_autotune", "--trial", clip],
+            env=env,
+            stdout=subprocess.PIPE,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return trial | {"error": "timeout"}
+    if completed.returncode != 0:
+        # SIGKILL is what the kernel OOM killer sends.
+        error = "oom" if completed.returncode == -9 else f"exit {completed.returncode}"
+        return trial | {"error": error}
+    return trial | json.loads(completed.stdout.decode().strip().splitlines()[-1])
+
+
+def memory_limits(max_memory_mb: Optional[float]) -> Dict[str, float]:
+    """RAM (and GPU) budget for a trial in MiB."""
+    if max_memory_mb:
+        return {"peak_rss_mb": max_memory_mb, "gpu_memory_mb": max_memory_mb}
+    total_ram = os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    limits = {"peak_rss_mb": MEMORY_HEADROOM * total_ram / (1024 * 1024)}
+    if get_config()["whisper"]["device"] == "cuda":
+        import torch
+
+        _, total_gpu = torch.cuda.mem_get_info()
+        limits["gpu_memory_mb"] = MEMORY_HEADROOM * total_gpu / (1024 * 1024)
+    return limits
+
+
+def choose_settings(
+    trials: List[Dict[str, Any]], limits: Dict[str, float]
+) -> Optional[Dict[str, Any]]:
+    """The fastest successful trial within the memory limits, if any."""
+    candidates = [
+        trial
+        for trial in trials
+        if "error" not in trial
+        and all(trial.get(key, 0) <= limit for key, limit in limits.items())
+    ]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda trial: trial["speed"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("clip")
+    parser.add_argument("--trial", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--batch-sizes", type=int, nargs="+")
+    parser.add_argument("--compute-types", nargs="+")
+    parser.add_argument("--max-memory-mb", type=float)
+    parser.add_argument("--timeout", type=float, help="seconds per trial")
+    parser.add_argument("--dry-run", action="store_true", help="do not save")
+    args = parser.parse_args()
+
+    if args.trial:
+        # whisper_subprocess sends stdout to stderr; report on the real stdout.
+        print(json.dumps(run_trial(args.clip)), file=sys.__stdout__, flush=True)
+        return
+
+    whisper_config = get_config()["whisper"]
+    model, device = whisper_config["model"], whisper_config["device"]
+    batch_sizes = args.batch_sizes or DEFAULT_BATCH_SIZES
+    compute_types = args.compute_types or DEFAULT_COMPUTE_TYPES.get(
+        device, [whisper_config["compute_type"]]
+    )
+
+    trials = []
+    for compute_type in compute_types:
+        for batch_size in batch_sizes:
+            trial = measure(args.clip, batch_size, compute_type, args.timeout)
+            trials.append(trial)
+            if "error" in trial:
+                print(f"{compute_type:>14} batch {batch_size:>3}  {trial['error']}")
+                # Larger batches of the same compute type will not fit either.
+                if trial["error"] == "oom":
+                    break
+                continue
+            print(
+                f"{compute_type:>14} batch {batch_size:>3}  "
+                f"{trial['speed']:6.1f}x real time  "
+                f"peak RSS {trial['peak_rss_mb']:8.0f} MiB"
+                + (
+                    f"  GPU {trial['gpu_memory_mb']:8.0f} MiB"
+                    if "gpu_memory_mb" in trial
+                    else ""
+                )
+            )
+
+    best = choose_settings(trials, memory_limits(args.max_memory_mb))
+    if best is None:
+        print("No combination succeeded within the memory limit.")
+        sys.exit(1)
+    print(f"Best: compute_type={best['compute_type']} batch_size={best['batch_size']}")
+    if args.dry_run:
+        return
+    settings = {
+        "batch_size": best["batch_size"],
+        "compute_type": best["compute_type"],
+        "measured": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "trials": trials,
+    }
+    path = save_host_settings(
+        model, device, settings, whisper_config.get("host_profile_path") or None
+    )
+    print(f"Saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,16 +2,51 @@
 Subprocess wrapper for Whisper transcription pipeline.
 Runs complete Whisper workflow (transcribe + align + diarize) in isolated subprocess.
 Models stay loaded within the subprocess for efficiency, then all memory is freed on exit.
+
+Two modes:
+- `whisper_subprocess.py <audio_path>`: process one file, pickle result to stdout
+  (or to the result file the parent names in ASR_RESULT_PATH), exit.
+  Several paths (short files) share transcription batches; the result is a list.
+- `whisper_subprocess.py --worker`: persistent worker that reads job frames from
+  stdin and keeps models loaded across jobs until it is recycled.
 """
 
 import sys
-import pickle
+import json
+import time
 import logging
+import traceback
 import warnings
-from typing import Optional
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import whisperx
 from config.app_config import get_config
 from config.logger import logger
+from subprocesses import events
+from subprocesses.chunking import (
+    merge_results,
+    plan_chunks,
+    plan_windows,
+    quietest_point,
+    shift_result,
+    speech_gap_point,
+    split_contiguous,
+)
+from subprocesses.dual_decode import (
+    transcribe_and_translate,
+    transcribe_files,
+    vad_segments,
+)
+from subprocesses.job_worker import JobProcess, PendingJob, run_parallel_jobs
+from subprocesses.ipc import read_frame, segment_channel, write_frame, write_result
+from utils.audio_buffer import SAMPLE_RATE, AudioBuffer, attach_audio
+from utils.cpu_pool import AFFINITY_ENV, CorePool, available_cores
+from utils.speaker_assignment import assign_speakers
+from utils.stage_cache import StageCache, diarization_key
+from utils.stage_metrics import collect_stage_metrics, stage_timer
+from utils.utilities import cleanup_cuda_memory, get_peak_rss_mb, get_rss_mb
 import os
 
 # Suppress whisperx and its dependencies' logging to keep stdout clean for pickle
@@ -31,25 +66,53 @@ sys.stdout = sys.stderr
 
 config = get_config()
 
+# Per-worker overrides from the parent process (e.g. the thread count of a
+# CPU pool slot), applied before the module-level settings below are read.
+_overrides = json.loads(os.environ.get("ASR_WHISPER_OVERRIDES") or "{}")
+config["whisper"].update(_overrides)
+_pinned_cpus = os.environ.get("ASR_WHISPER_CPUS")
+if _pinned_cpus and hasattr(os, "sched_setaffinity"):
+    os.sched_setaffinity(0, {int(cpu) for cpu in _pinned_cpus.split(",")})
+# Channel for partial results if the parent streams segments (see emit_segments).
+segment_frames = segment_channel()
+# Stage, progress and memory events for the parent (see subprocesses/events.py).
+events.open_channel("whisper")
+
 # Whisper configuration
 requested_model_name = config["whisper"]["model"]
 device = config["whisper"]["device"]
 batch_size = config["whisper"]["batch_size"]
 beam_size = config["whisper"]["beam_size"]
 compute_type = config["whisper"]["compute_type"]
+thread_count = config["whisper"].get("thread_count") or 4
 language_audio = config["whisper"].get("language")
 translation_enabled = config["whisper"].get("translation_enabled", False)
 translation_target_language = (
     config["whisper"].get("translation_target_language", "en") or "en"
 )
 translation_model_preference = config["whisper"].get("translation_model", "large-v3")
+shared_translation_pass = config["whisper"].get("shared_translation_pass", False)
 initial_prompt = config["whisper"]["initial_prompt"]
 use_initial_prompt = config["whisper"].get("use_initial_prompt", False)
 min_speakers = config["whisper"]["min_speakers"]
 max_speakers = config["whisper"]["max_speakers"]
 hf_token = config["whisper"]["hf_token"]
 use_speaker_diarization = config["whisper"]["use_speaker_diarization"]
+worker_max_jobs = config["whisper"].get("worker_max_jobs", 0) or 0
+worker_max_rss_mb = config["whisper"].get("worker_max_rss_mb", 0) or 0
+audio_buffer_dir = config["whisper"].get("audio_buffer_dir") or None
+streaming_window_seconds = config["whisper"].get("streaming_window_seconds", 0) or 0
+chunk_workers = config["whisper"].get("chunk_workers", 1) or 1
+concurrent_diarization = config["whisper"].get("concurrent_diarization", False)
+align_workers = config["whisper"].get("align_workers", 1) or 1
+# Shorter recordings / transcripts are not worth the extra model loads of
+# parallel chunks or alignment shards.
+MIN_CHUNK_SECONDS = 300
+MIN_SEGMENTS_PER_SHARD = 20
 MULTILINGUAL_PREFIXES = ("tiny", "base", "small", "medium", "large")
+DIARIZATION_MODEL = "pyannote/speaker-diarization-community-1"
+# Speaker turns are cached across runs (e.g. with a different Whisper model).
+diarization_cache = StageCache(config["system"].get("cache_path") or None)
 
 
 def is_multilingual_model(name: Optional[str]) -> bool:
@@ -93,14 +156,13 @@ def resolve_model_name() -> str:
 model_name = resolve_model_name()
 
 
-def get_audio(path: str):
+def decode_audio(path: str) -> AudioBuffer:
     """
-    Load audio file on path.
-    Returns numpy rank-1 tensor with 16,000 values per second
-    (16kHz).
+    Decode the audio file on path once into a memory-mapped buffer.
+    Its `array` is a numpy rank-1 float32 array with 16,000 values per second
+    (16kHz) that all pipeline steps share.
     """
-    result = whisperx.load_audio(path)
-    return result
+    return AudioBuffer.decode(path, directory=audio_buffer_dir)
 
 
 def get_audio_length(audio):
@@ -133,6 +195,7 @@ def load_transcription_model():
         language=language_audio,
         compute_type=compute_type,
         asr_options=asr_options,
+        threads=thread_count,
     )
     return model
 
@@ -148,25 +211,98 @@ def load_alignment_model(language_code: str):
 def load_diarization_model():
     """Load WhisperX diarization model."""
     diarize_model = whisperx.diarize.DiarizationPipeline(
-        token=hf_token, device=device
+        model_name=DIARIZATION_MODEL, token=hf_token, device=device
     )
     return diarize_model
 
 
-def transcribe_audio(model, audio, task: Optional[str] = None):
-    """Transcribe or translate audio with the loaded Whisper model."""
-    kwargs = {"batch_size": batch_size}
-    if task == "translate":
-        kwargs["task"] = "translate"
-        if language_audio:
-            kwargs["language"] = language_audio
+class ModelCache:
+    """
+    Keeps loaded models alive between jobs of the persistent worker.
+    Models are loaded lazily on first use; alignment models are cached per language.
+    """
+
+    def __init__(self):
+        self._transcription_model = None
+        self._alignment_models = {}
+        self._diarization_model = None
+        self._diarization_worker = None
+
+    def transcription_model(self):
+        if self._transcription_model is None:
+            self._transcription_model = load_transcription_model()
+        return self._transcription_model
+
+    def alignment_model(self, language_code: str):
+        if language_code not in self._alignment_models:
+            self._alignment_models[language_code] = load_alignment_model(language_code)
+        return self._alignment_models[language_code]
+
+    def diarization_model(self):
+        if self._diarization_model is None:
+            self._diarization_model = load_diarization_model()
+        return self._diarization_model
+
+    def diarization_worker(self) -> JobProcess:
+        """Job worker that keeps the diarization model for concurrent diarization."""
+        if self._diarization_worker is None or not self._diarization_worker.is_alive():
+            self._diarization_worker = JobProcess()
+        return self._diarization_worker
+
+
+@contextmanager
+def timed(stage: str):
+    """
+    Stage timer for this subprocess; CPU time includes native threads.
+    Start and end of the stage are also sent on the event channel.
+    """
+    with events.stage(stage):
+        with stage_timer(stage, process="whisper", cpu_clock=time.process_time):
+            yield
+
+
+def transcribe_audio(
+    model, audio, task: str = "transcribe", language: Optional[str] = None
+):
+    """
+    Transcribe or translate audio with the loaded Whisper model.
+    `language` (e.g. detected on an earlier window) skips language detection.
+    The task is always passed: without it whisperx keeps the task of the
+    previous call, so a cached model would go on translating.
+    """
+    kwargs = {
+        "batch_size": batch_size,
+        "task": task,
+        "progress_callback": events.progress_callback(task),
+    }
+    if language:
+        kwargs["language"] = language
     return model.transcribe(audio, **kwargs)
 
 
-def align_transcription(transcription_result, audio_data):
-    """Align transcription output with the alignment model."""
+def align_transcription(
+    transcription_result,
+    audio_data,
+    models: Optional[ModelCache] = None,
+    buffer_path: Optional[str] = None,
+):
+    """
+    Align transcription output with the alignment model.
+    If `audio_data` is the whole recording and its buffer file is given,
+    the segments can be aligned in parallel shards (see `align_workers`).
+    """
     language = transcription_result["language"]
-    alignment_model, metadata = load_alignment_model(language)
+    shards = (
+        alignment_shards(transcription_result["segments"]) if buffer_path else []
+    )
+    if len(shards) > 1:
+        return align_parallel(
+            transcription_result["segments"], shards, language, buffer_path
+        )
+
+    alignment_model, metadata = (
+        models.alignment_model(language) if models else load_alignment_model(language)
+    )
     aligned = whisperx.align(
         transcription_result["segments"],
         alignment_model,
@@ -174,55 +310,538 @@ def align_transcription(transcription_result, audio_data):
         audio_data,
         device,
         return_char_alignments=False,
+        progress_callback=events.progress_callback("align"),
     )
     del alignment_model, metadata
     return aligned
 
 
-def process_audio_file(audio_path: str):
+def alignment_shards(segments) -> List[Tuple[int, int]]:
+    """
+    Contiguous (start, stop) ranges of segments with about equal audio
+    duration, one per alignment worker; a single range disables sharding.
+    """
+    parts = min(align_workers, len(segments) // MIN_SEGMENTS_PER_SHARD)
+    if parts <= 1:
+        return [(0, len(segments))]
+    durations = [segment["end"] - segment["start"] for segment in segments]
+    return split_contiguous(durations, parts)
+
+
+def align_parallel(segments, shards, language: str, buffer_path: str):
+    """
+    Align each shard of segments in its own job worker process.
+    Workers map the whole recording, not a re-based slice: whisperx.align
+    handles every segment on its own, so with the same audio and absolute
+    timestamps the concatenated shards equal the serial result exactly.
+    """
+    jobs = [
+        {
+            "task": "align",
+            "buffer_path": str(buffer_path),
+            "segments": segments[start:stop],
+            "language": language,
+        }
+        for start, stop in shards
+    ]
+    return merge_results(run_parallel_jobs(jobs, job_worker_envs(len(jobs))))
+
+
+def process_audio_file(
+    audio_path: str,
+    models: Optional[ModelCache] = None,
+    audio_buffer: Optional[AudioBuffer] = None,
+    transcription: Optional[Dict[str, Any]] = None,
+):
     """
     Complete Whisper pipeline: transcribe + align + (optional) diarize.
-    Keeps models loaded for efficiency within this subprocess.
+    The audio is decoded once into a shared buffer that every step maps;
+    the buffer file is removed when the job is done. Long recordings are
+    split into `chunk_workers` parallel chunks or, with
+    `streaming_window_seconds`, transcribed and aligned window by window.
+    `audio_buffer` and `transcription` (already decoded audio, an unaligned
+    transcription) are passed by `process_audio_files`. Aligned segments are
+    streamed to the parent per window, or once before diarization, if it
+    opened a segment channel (see emit_segments).
+    Timings of the steps are returned in result["stage_metrics"].
     """
-    # Load audio
-    audio = get_audio(audio_path)
+    metrics = []
+    with collect_stage_metrics(metrics):
+        if audio_buffer is None:
+            with timed("decode"):
+                audio_buffer = decode_audio(audio_path)
+        cache_key = diarization_cache_key(audio_path)
+        cached_turns = (
+            diarization_cache.get("diarization", cache_key) if cache_key else None
+        )
+        with audio_buffer:
+            # Diarization only needs the audio, so it can start right away.
+            diarization = (
+                start_diarization(audio_buffer, models)
+                if cached_turns is None
+                else None
+            )
+            emit_part = partial(emit_segments, audio_path)
+            try:
+                parts = chunk_count(audio_buffer.seconds)
+                windowed = False
+                if transcription is not None:
+                    transcript = transcribe_and_align(
+                        audio_buffer.array,
+                        models,
+                        language=language_audio,
+                        buffer_path=str(audio_buffer.path),
+                        transcription=transcription,
+                    )
+                elif parts > 1:
+                    transcript = transcribe_parallel(audio_buffer, parts)
+                elif 0 < streaming_window_seconds < audio_buffer.seconds:
+                    windowed = True
+                    transcript = transcribe_windowed(
+                        audio_buffer, models, on_part=emit_part
+                    )
+                else:
+                    transcript = transcribe_and_align(
+                        audio_buffer.array,
+                        models,
+                        language=language_audio,
+                        buffer_path=str(audio_buffer.path),
+                    )
+                if not windowed:  # Windows are sent as soon as they are done.
+                    emit_part(transcript, 0.0, audio_buffer.seconds)
+                if use_speaker_diarization:
+                    diarize(
+                        audio_buffer.array,
+                        transcript,
+                        models,
+                        pending=diarization,
+                        cached_turns=cached_turns,
+                        cache_key=cache_key,
+                    )
+            finally:
+                if diarization is not None:
+                    diarization.cancel()
+            # The decoded length is the authoritative audio length
+            audio_length = get_audio_length(audio_buffer.array)
+    result = build_result(transcript, audio_length)
+    result["stage_metrics"] = [entry.as_dict() for entry in metrics]
+    return result
+
 
+def process_audio_files(
+    audio_paths: List[str], models: Optional[ModelCache] = None
+) -> List[Dict[str, Any]]:
+    """
+    Whisper pipeline for several short files at once: the VAD segments of
+    all files share the transcription batches, alignment and diarization
+    then run per file. Returns one result per file; the timings of the
+    shared steps are reported with the first file.
+    """
+    models = models or ModelCache()
+    shared_metrics = []
+    with ExitStack() as buffers:
+        with collect_stage_metrics(shared_metrics):
+            with timed("decode"):
+                audio_buffers = [
+                    buffers.enter_context(decode_audio(path)) for path in audio_paths
+                ]
+            with timed("load_model"):
+                transcription_model = models.transcription_model()
+            with timed("transcribe_batched"):
+                transcriptions = transcribe_files(
+                    transcription_model,
+                    [audio_buffer.array for audio_buffer in audio_buffers],
+                    batch_size,
+                    language=language_audio,
+                )
+            del transcription_model
+        results = [
+            process_audio_file(path, models, audio_buffer, transcription)
+            for path, audio_buffer, transcription in zip(
+                audio_paths, audio_buffers, transcriptions
+            )
+        ]
+    shared = [entry.as_dict() for entry in shared_metrics]
+    results[0]["stage_metrics"] = shared + results[0]["stage_metrics"]
+    return results
+
+
+@dataclass
+class AlignedTranscript:
+    """Aligned transcription (and optional translation) of one piece of audio."""
+
+    result: Dict[str, Any]
+    translation: Optional[Dict[str, Any]]
+    source_language: Optional[str]
+    translation_language: Optional[str]
+
+    def shift(self, offset_seconds: float) -> "AlignedTranscript":
+        shift_result(self.result, offset_seconds)
+        if self.translation:
+            shift_result(self.translation, offset_seconds)
+        return self
+
+
+def transcribe_and_align(
+    audio,
+    models: Optional[ModelCache] = None,
+    language: Optional[str] = None,
+    buffer_path: Optional[str] = None,
+    transcription: Optional[Dict[str, Any]] = None,
+) -> AlignedTranscript:
+    """
+    Steps 1 and 2: transcribe (and translate), then align.
+    `buffer_path` is the buffer file of `audio` when it is the whole recording;
+    a given `transcription` (from shared batches) skips the transcribe step.
+    """
     # Step 1: Transcribe (always capture original language)
-    transcription_model = load_transcription_model()
-    base_transcription = transcribe_audio(transcription_model, audio)
-    translation_transcription = None
-    if translation_enabled:
-        translation_transcription = transcribe_audio(
-            transcription_model, audio, task="translate"
+    with timed("load_model"):
+        transcription_model = (
+            models.transcription_model() if models else load_transcription_model()
         )
+    translation_transcription = None
+    if transcription is not None:
+        base_transcription = transcription
+    elif translation_enabled and shared_translation_pass:
+        with timed("transcribe_translate"):
+            base_transcription, translation_transcription = transcribe_and_translate(
+                transcription_model, audio, batch_size, language=language
+            )
+    else:
+        with timed("transcribe"):
+            base_transcription = transcribe_audio(
+                transcription_model, audio, task="transcribe", language=language
+            )
+    if translation_enabled and translation_transcription is None:
+        with timed("translate"):
+            translation_transcription = transcribe_audio(
+                transcription_model, audio, task="translate", language=language
+            )
     del transcription_model  # Free model before alignment
 
     # Step 2: Align
-    result = align_transcription(base_transcription, audio)
-    translation_aligned = (
-        align_transcription(translation_transcription, audio)
-        if translation_transcription
-        else None
+    with timed("align"):
+        result = align_transcription(base_transcription, audio, models, buffer_path)
+        translation_aligned = (
+            align_transcription(translation_transcription, audio, models, buffer_path)
+            if translation_transcription
+            else None
+        )
+
+    return AlignedTranscript(
+        result=result,
+        translation=translation_aligned,
+        source_language=base_transcription.get("language"),
+        translation_language=(
+            translation_transcription.get("language")
+            if translation_transcription
+            else None
+        ),
+    )
+
+
+def run_diarization(audio, models: Optional[ModelCache] = None):
+    """Run the diarization model over the whole recording."""
+    diarization_model = (
+        models.diarization_model() if models else load_diarization_model()
+    )
+    diarize_segments = diarization_model(
+        audio,
+        min_speakers=min_speakers,
+        max_speakers=max_speakers,
+        progress_callback=events.progress_callback("diarize"),
     )
+    del diarization_model  # Free diarization model
+    return diarize_segments
 
-    # Step 3: Diarize (optional) - reuse diarization output for both results
-    if use_speaker_diarization:
-        diarization_model = load_diarization_model()
-        diarize_segments = diarization_model(
-            audio, min_speakers=min_speakers, max_speakers=max_speakers
+
+def diarization_cache_key(audio_path: str) -> Optional[str]:
+    """Cache key of the speaker turns of `audio_path`, or None without a cache."""
+    if not (use_speaker_diarization and diarization_cache.enabled):
+        return None
+    with timed("audio_hash"):
+        return diarization_key(
+            audio_path, min_speakers, max_speakers, DIARIZATION_MODEL
         )
-        result = whisperx.assign_word_speakers(diarize_segments, result)
-        if translation_aligned:
-            translation_aligned = whisperx.assign_word_speakers(
-                diarize_segments, translation_aligned
-            )
-        del diarization_model  # Free diarization model
 
-    # Attach metadata for downstream consumers
-    source_language = base_transcription.get("language")
-    translation_output_language = (
-        translation_transcription.get("language") if translation_transcription else None
+
+def start_diarization(
+    audio_buffer: AudioBuffer, models: Optional[ModelCache] = None
+) -> Optional[PendingJob]:
+    """
+    With `concurrent_diarization`, start diarizing the buffer in a job worker
+    while this process transcribes; returns None if diarization runs inline.
+    """
+    if not (use_speaker_diarization and concurrent_diarization):
+        return None
+    job = {"task": "diarize", "buffer_path": str(audio_buffer.path)}
+    if models:
+        return PendingJob(models.diarization_worker(), job, keep_worker=True)
+    return PendingJob(JobProcess(), job)
+
+
+def diarize(
+    audio,
+    transcript: AlignedTranscript,
+    models: Optional[ModelCache] = None,
+    pending: Optional[PendingJob] = None,
+    cached_turns=None,
+    cache_key: Optional[str] = None,
+):
+    """
+    Step 3: diarize (or take cached speaker turns, or collect the concurrent
+    diarization) and reuse the diarization output for both results.
+    Freshly computed turns are stored under `cache_key`.
+    """
+    if cached_turns is not None:
+        logger.info("Reusing cached diarization (%s)", cache_key[:12])
+        diarize_segments = cached_turns
+    else:
+        if pending is not None:
+            with timed("diarize_wait"):
+                diarize_segments = pending.result()
+        else:
+            with timed("diarize"):
+                diarize_segments = run_diarization(audio, models)
+        if cache_key:
+            diarization_cache.put("diarization", cache_key, diarize_segments)
+    with timed("assign_speakers"):
+        assign_speakers(
+            diarize_segments,
+            transcript.result,
+            *([transcript.translation] if transcript.translation else []),
+        )
+
+
+def emit_segments(
+    audio_path: str,
+    transcript: AlignedTranscript,
+    start_seconds: float,
+    end_seconds: float,
+) -> None:
+    """
+    Send the aligned segments of a finished window (or recording) to the
+    parent as one frame, if it opened a segment channel. Speaker labels
+    come only with the final result: diarization needs the whole recording.
+    """
+    global segment_frames
+    if segment_frames is None:
+        return
+    frame = {
+        "audio_path": str(audio_path),
+        "start": start_seconds,
+        "end": end_seconds,
+        "language": transcript.source_language,
+        "segments": transcript.result["segments"],
+        "translation_segments": (
+            transcript.translation["segments"] if transcript.translation else None
+        ),
+    }
+    try:
+        write_frame(segment_frames, frame)
+    except OSError:
+        # The consumer stopped reading; the final result is still returned.
+        segment_frames = None
+
+
+def transcribe_span(
+    audio_buffer: AudioBuffer,
+    start: int,
+    stop: int,
+    models: Optional[ModelCache] = None,
+    language: Optional[str] = None,
+    on_part: Optional[Callable[[AlignedTranscript, float, float], None]] = None,
+) -> AlignedTranscript:
+    """
+    Transcribe and align samples [start, stop) of the buffer, in windows of
+    about `streaming_window_seconds` if set. Windows are cut in a VAD pause
+    (see `vad_cut_point`). Each window is read from the buffer file on its
+    own and shifted to its offset in the recording, so peak memory of
+    transcription and alignment follows the window size, not the recording
+    length. The language detected in the first window is kept for the
+    following ones. Without `models` (one-shot subprocess) the models are
+    loaded once for all windows, not once per window.
+    `on_part(part, start_seconds, end_seconds)` is called per shifted window.
+    """
+    window_samples = int(streaming_window_seconds * SAMPLE_RATE)
+    windowed = 0 < window_samples < stop - start
+    if windowed and models is None:
+        models = ModelCache()
+    with timed("plan_windows"):
+        windows = plan_windows(
+            stop - start,
+            window_samples,
+            lambda low, high: audio_buffer.read(start + low, start + high),
+            find_cut=(
+                partial(vad_cut_point, models.transcription_model())
+                if windowed
+                else quietest_point
+            ),
+        )
+    parts = []
+    for low, high in windows:
+        window = audio_buffer.read(start + low, start + high)
+        part = transcribe_and_align(window, models, language=language)
+        del window
+        language = language or part.source_language
+        parts.append(part.shift((start + low) / SAMPLE_RATE))
+        if on_part is not None:
+            on_part(part, (start + low) / SAMPLE_RATE, (start + high) / SAMPLE_RATE)
+        events.progress("windows", 100 * high / (stop - start))
+        if len(windows) > 1:
+            cleanup_cuda_memory()
+    return merge_transcripts(parts)
+
+
+def vad_cut_point(transcription_model, samples) -> int:
+    """
+    Where to cut a window in `samples` (the end of the window): the middle
+    of the longest pause between the speech regions the model's VAD finds,
+    or the quietest point if it hears speech throughout.
+    """
+    speech = [
+        (int(speech_start * SAMPLE_RATE), int(speech_end * SAMPLE_RATE))
+        for chunk in vad_segments(transcription_model, samples)
+        for speech_start, speech_end in chunk["segments"]
+    ]
+    point = speech_gap_point(len(samples), speech)
+    return quietest_point(samples) if point is None else point
+
+
+def merge_transcripts(parts: List[AlignedTranscript]) -> AlignedTranscript:
+    """Merge shifted transcripts of consecutive pieces of one recording."""
+    languages = {part.source_language for part in parts}
+    if len(languages) > 1:
+        logger.warning(
+            "Pieces were detected as different languages (%s); using '%s'. "
+            "Set whisper.language to avoid this.",
+            ", ".join(sorted(str(language) for language in languages)),
+            parts[0].source_language,
+        )
+    return AlignedTranscript(
+        result=merge_results([part.result for part in parts]),
+        translation=(
+            merge_results([part.translation for part in parts])
+            if translation_enabled
+            else None
+        ),
+        source_language=parts[0].source_language,
+        translation_language=parts[0].translation_language,
+    )
+
+
+def transcribe_windowed(
+    audio_buffer: AudioBuffer,
+    models: Optional[ModelCache] = None,
+    on_part: Optional[Callable[[AlignedTranscript, float, float], None]] = None,
+) -> AlignedTranscript:
+    """
+    Bounded-memory transcription of a very long recording (see
+    `transcribe_span`). Diarization is not windowed: it runs once over the
+    whole mapped buffer, so speaker labels stay consistent across windows,
+    and its memory still grows with the recording length.
+    """
+    logger.info(
+        "Processing %.0fs of audio in windows of ~%ss",
+        audio_buffer.seconds,
+        streaming_window_seconds,
     )
+    return transcribe_span(
+        audio_buffer,
+        0,
+        audio_buffer.num_samples,
+        models,
+        language=language_audio,
+        on_part=on_part,
+    )
+
+
+def chunk_count(audio_seconds: float) -> int:
+    """Number of parallel chunks for a recording (1 = no chunk parallelism)."""
+    if chunk_workers <= 1:
+        return 1
+    return max(1, min(chunk_workers, int(audio_seconds // MIN_CHUNK_SECONDS)))
+
+
+def transcribe_parallel(audio_buffer: AudioBuffer, parts: int) -> AlignedTranscript:
+    """
+    Split the recording at pauses into `parts` chunks and transcribe + align
+    them in parallel job worker processes, each on its own share of the
+    cores; the shifted chunk results are merged into one transcript.
+    """
+    chunks = plan_chunks(audio_buffer.num_samples, parts, audio_buffer.read)
+    logger.info(
+        "Transcribing %.0fs of audio in %d parallel chunks",
+        audio_buffer.seconds,
+        len(chunks),
+    )
+    jobs = [
+        {
+            "task": "transcribe",
+            "buffer_path": str(audio_buffer.path),
+            "start": start,
+            "stop": stop,
+            "language": language_audio,
+        }
+        for start, stop in chunks
+    ]
+    with timed("parallel_transcribe"):
+        parts_done = run_parallel_jobs(jobs, job_worker_envs(len(jobs)))
+    return merge_transcripts(parts_done)
+
+
+def job_worker_envs(count: int) -> List[Dict[str, str]]:
+    """
+    Environments for `count` job workers: the cores allotted to this process
+    are split between them. These are its pinned cores, or else
+    `thread_count` of them (e.g. the share of its CPU pool slot), so
+    parallel files do not each claim every core of the host.
+    """
+    pinned = bool(os.environ.get(AFFINITY_ENV))
+    cores = available_cores() if pinned else available_cores()[:thread_count]
+    pool = CorePool(count, pin=pinned, cores=cores)
+    return [pool.env_for_slot(slot % pool.size) for slot in range(count)]
+
+
+def handle_job(job: Dict[str, Any], models: ModelCache):
+    """
+    Run one job in a job worker process (see subprocesses/job_worker.py).
+    Returns the job's value and the stage metrics measured while running it.
+    """
+    metrics = []
+    with collect_stage_metrics(metrics):
+        if job["task"] == "transcribe":
+            audio_buffer = AudioBuffer(job["buffer_path"], owner=False)
+            value = transcribe_span(
+                audio_buffer,
+                job["start"],
+                job["stop"],
+                models,
+                language=job.get("language"),
+            )
+        elif job["task"] == "diarize":
+            with timed("diarize"):
+                value = run_diarization(attach_audio(job["buffer_path"]), models)
+        elif job["task"] == "align":
+            with timed("align"):
+                value = align_transcription(
+                    {"segments": job["segments"], "language": job["language"]},
+                    attach_audio(job["buffer_path"]),
+                    models,
+                )
+        else:
+            raise ValueError(f"Unknown job task: {job['task']}")
+    for entry in metrics:
+        entry.process = f"{job['task']}_worker"
+    return value, [entry.as_dict() for entry in metrics]
+
+
+def build_result(transcript: AlignedTranscript, audio_length: float):
+    """Attach metadata for downstream consumers to the aligned result."""
+    result = transcript.result
+    translation_aligned = transcript.translation
+    source_language = transcript.source_language
+    translation_output_language = transcript.translation_language
     result["source_language"] = source_language
     result["requested_language"] = language_audio
     result["translation_enabled"] = translation_enabled
@@ -232,6 +851,7 @@ def process_audio_file(audio_path: str):
     result["translation_output_language"] = translation_output_language
     result["output_language"] = source_language
     result["model_name"] = model_name
+    result["audio_length"] = audio_length
     result["requested_model_name"] = requested_model_name
     result["language"] = result.get("language") or result["output_language"]
     result["translation_result"] = translation_aligned
@@ -245,28 +865,86 @@ def process_audio_file(audio_path: str):
     return result
 
 
+def should_recycle(jobs_done: int, rss_mb: float) -> bool:
+    """Return True once the worker has hit its job count or memory limit."""
+    if worker_max_jobs and jobs_done >= worker_max_jobs:
+        return True
+    if worker_max_rss_mb and rss_mb >= worker_max_rss_mb:
+        return True
+    return False
+
+
+def serve_jobs():
+    """
+    Persistent worker loop.
+    Reads job frames ({"audio_path": ...}, or {"audio_paths": [...]} for
+    short files with shared batches) from stdin and answers each with a
+    response frame on stdout. Exits on EOF or after answering the job that
+    crossed the recycle limits, so the parent starts a fresh worker.
+    """
+    models = ModelCache()
+    jobs_done = 0
+    stdin = sys.stdin.buffer
+    stdout = _original_stdout.buffer
+
+    while True:
+        job = read_frame(stdin)
+        if job is None:
+            break
+
+        try:
+            if "audio_paths" in job:
+                result = process_audio_files(job["audio_paths"], models=models)
+            else:
+                result = process_audio_file(job["audio_path"], models=models)
+            response = {"ok": True, "result": result}
+        except Exception as e:
+            traceback.print_exc(file=sys.stderr)
+            response = {"ok": False, "error": f"{e}\n{traceback.format_exc()}"}
+
+        cleanup_cuda_memory()
+        jobs_done += 1
+        rss_mb = get_rss_mb()
+        response["recycle"] = should_recycle(jobs_done, rss_mb)
+        response["jobs_done"] = jobs_done
+        response["rss_mb"] = rss_mb
+        write_frame(stdout, response)
+
+        if response["recycle"]:
+            break
+
+
 def main():
     """Main subprocess entry point."""
     if len(sys.argv) < 2:
-        print("Usage: whisper_subprocess.py <audio_path>", file=sys.stderr)
+        print(
+            "Usage: whisper_subprocess.py <audio_path> ... | --worker",
+            file=sys.stderr,
+        )
         sys.exit(1)
 
-    audio_path = sys.argv[1]
+    if sys.argv[1] == "--worker":
+        serve_jobs()
+        sys.exit(0)
+
+    audio_paths = sys.argv[1:]
 
     try:
-        # Process the audio file
-        result = process_audio_file(audio_path)
+        # Process the audio file (several short files: one result per file)
+        if len(audio_paths) > 1:
+            result = process_audio_files(audio_paths)
+        else:
+            result = process_audio_file(audio_paths[0])
 
         # Restore stdout and serialize result to clean stdout
         sys.stdout = _original_stdout
-        sys.stdout.buffer.write(pickle.dumps(result))
+        write_result(result, sys.stdout.buffer)
+        events.emit("exit", peak_rss_mb=get_peak_rss_mb())
         sys.exit(0)
 
     except Exception as e:
         # Write error to stderr and exit with error code
         print(f"Whisper subprocess error: {e}", file=sys.stderr)
-        import traceback
-
         traceback.print_exc(file=sys.stderr)
         sys.exit(1)
 
@@ -832,3 +832,1474 @@ def test_send_success_email_includes_full_llm_configuration(monkeypatch):
     assert "Toc_model_config: /configs/toc.toml<br>" in body
     assert "Translation:<br>" in body
     assert "Translation_model_path: /models/translate.gguf<br>" in body
+
+
+# --- Subprocess IPC Tests ---
+
+
+def test_ipc_frames_roundtrip_and_clean_eof():
+    import io
+    from subprocesses.ipc import read_frame, write_frame
+
+    stream = io.BytesIO()
+    write_frame(stream, {"audio_path": "a.wav"})
+    write_frame(stream, [1, 2, 3])
+    stream.seek(0)
+
+    assert read_frame(stream) == {"audio_path": "a.wav"}
+    assert read_frame(stream) == [1, 2, 3]
+    assert read_frame(stream) is None
+
+
+def test_whisper_worker_recycles_when_worker_requests_it():
+    import subprocess
+    import sys
+    from subprocesses.subprocess_handler import WhisperWorker
+
+    fake_worker = (
+        "import sys\n"
+        "from subprocesses.ipc import read_frame, write_frame\n"
+        "job = read_frame(sys.stdin.buffer)\n"
+        "write_frame(sys.stdout.buffer, {'ok': True, 'recycle': True,\n"
+        "    'result': {'path': job['audio_path']}})\n"
+    )
+    worker = WhisperWorker()
+    worker.process = subprocess.Popen(
+        [sys.executable, "-c", fake_worker],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+    )
+
+    assert worker.run("interview.wav") == {"path": "interview.wav"}
+    assert worker.process is None
+
+
+def test_cached_model_transcribes_again_after_translating():
+    import json
+    import subprocess
+    import sys
+
+    # Stand-in for the whisperx pipeline, which keeps the task of its
+    # tokenizer when transcribe() is called without one.
+    code = (
+        "import json, sys\n"
+        "from subprocesses import whisper_subprocess as ws\n"
+        "class Pipeline:\n"
+        "    task = 'transcribe'\n"
+        "    def transcribe(self, audio, task=None, **kwargs):\n"
+        "        self.task = task or self.task\n"
+        "        return {'task': self.task}\n"
+        "models = ws.ModelCache()\n"
+        "models._transcription_model = Pipeline()\n"
+        "tasks = [\n"
+        "    ws.transcribe_audio(models.transcription_model(), [], task=task,\n"
+        "                        language='de')['task']\n"
+        "    for task in ('transcribe', 'translate', 'transcribe')\n"
+        "]\n"
+        "tasks.append(ws.transcribe_audio(models.transcription_model(), [])['task'])\n"
+        "sys.__stdout__.write(json.dumps(tasks))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+
+    assert json.loads(output) == ["transcribe", "translate", "transcribe", "transcribe"]
+
+
+# --- Pipeline Tests ---
+
+
+def test_staged_pipeline_runs_all_items_through_stages_and_drains():
+    from utils.pipeline import Stage, StagedPipeline
+
+    written = []
+
+    def drop_odd(item):
+        return None if item % 2 else item
+
+    def write(item):
+        written.append(item)
+        return item
+
+    pipeline = StagedPipeline(
+        [
+            Stage("drop", drop_odd, workers=2),
+            Stage("double", lambda item: item * 2),
+            Stage("fail", lambda item: 1 // (item - 4)),
+            Stage("write", write, workers=3),
+        ],
+        queue_size=1,
+    )
+    pipeline.run(range(1, 8))
+
+    # 2, 4, 6 survive "drop"; 2 -> 4 raises ZeroDivisionError and is dropped
+    assert sorted(written) == [0, 0]
+
+
+def test_staged_pipeline_respects_stage_concurrency_limit():
+    import threading
+    import time
+    from utils.pipeline import Stage, StagedPipeline
+
+    lock = threading.Lock()
+    active = {"now": 0, "max": 0}
+
+    def slow(item):
+        with lock:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+        time.sleep(0.01)
+        with lock:
+            active["now"] -= 1
+        return item
+
+    StagedPipeline([Stage("slow", slow, workers=2)]).run(range(10))
+
+    assert active["max"] == 2
+
+
+def test_staged_pipeline_drains_when_the_item_source_fails():
+    import threading
+    from utils.pipeline import Stage, StagedPipeline
+
+    written = []
+
+    def items():
+        yield 1
+        yield 2
+        raise OSError("input share gone")
+
+    pipeline = StagedPipeline(
+        [
+            Stage("double", lambda item: item * 2, workers=2),
+            Stage("write", written.append),
+        ]
+    )
+    with pytest.raises(OSError, match="input share gone"):
+        pipeline.run(items())
+
+    assert sorted(written) == [2, 4]
+    assert not [t for t in threading.enumerate() if t.name.startswith("double-")]
+
+
+def test_pipelined_batch_skips_a_file_that_cannot_be_set_up(tmp_path, monkeypatch):
+    import socket
+
+    monkeypatch.setattr(socket, "gethostbyname", lambda _name: "127.0.0.1")
+    import asr_workflow
+
+    new_file_job = asr_workflow.new_file_job
+    failed = []
+    written = []
+
+    def setup(filepath, output_directory):
+        if filepath.name == "bad.wav":
+            raise OSError("unreadable")
+        return new_file_job(filepath, output_directory)
+
+    monkeypatch.setattr(asr_workflow, "new_file_job", setup)
+    monkeypatch.setattr(
+        asr_workflow,
+        "handle_file_failure",
+        lambda filepath, exception, process_info=None: failed.append(filepath.name),
+    )
+    monkeypatch.setattr(
+        asr_workflow,
+        "FILE_STAGES",
+        (("whisper", lambda job: job), ("writer", written.append)),
+    )
+    monkeypatch.setattr(asr_workflow, "get_cpu_pool", lambda: None)
+
+    filepaths = [tmp_path / name for name in ("a.wav", "bad.wav", "c.wav")]
+    asr_workflow.process_files_pipelined(filepaths, tmp_path)
+
+    assert failed == ["bad.wav"]
+    assert sorted(job.filepath.name for job in written) == ["a.wav", "c.wav"]
+
+
+def test_process_directory_uses_pipeline_when_enabled(tmp_path, monkeypatch):
+    import socket
+
+    monkeypatch.setattr(socket, "gethostbyname", lambda _name: "127.0.0.1")
+    import asr_workflow
+
+    seen = []
+
+    def _fake_stage(name):
+        def run(job):
+            seen.append((name, job.filepath.name))
+            return job
+
+        return run
+
+    monkeypatch.setattr(asr_workflow, "send_success_email", lambda **_kwargs: None)
+    monkeypatch.setattr(
+        asr_workflow,
+        "FILE_STAGES",
+        tuple((name, _fake_stage(name)) for name in ("whisper", "llm", "writer")),
+    )
+    monkeypatch.setitem(asr_workflow.pipeline_config, "pipeline_enabled", True)
+
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    for name in ("a.wav", "b.wav"):
+        (input_dir / name).write_text("data", encoding="utf-8")
+
+    asr_workflow.process_directory(input_dir, tmp_path)
+
+    assert sorted(seen) == sorted(
+        (stage, name)
+        for stage in ("whisper", "llm", "writer")
+        for name in ("a.wav", "b.wav")
+    )
+
+
+def test_pipelined_hallucination_warnings_stay_with_their_file(tmp_path, monkeypatch):
+    import socket
+    import threading
+
+    monkeypatch.setattr(socket, "gethostbyname", lambda _name: "127.0.0.1")
+    import asr_workflow
+    from config.logger import logger
+
+    both_started = threading.Barrier(2, timeout=5)
+    emails = []
+
+    def transcribe(job):
+        both_started.wait()  # both files are in Whisper at the same time
+        logger.warning('Failed to align segment ("%s"): backtrack failed', job.filepath)
+        both_started.wait()
+        return job
+
+    def write(job):
+        asr_workflow.handle_hallucination_warnings_for_file(
+            job.filepath.name, job.log.getvalue()
+        )
+        return job
+
+    monkeypatch.setattr(
+        asr_workflow,
+        "send_warning_email",
+        lambda audio_input, warnings: emails.append((audio_input, warnings)),
+    )
+    monkeypatch.setattr(
+        asr_workflow,
+        "FILE_STAGES",
+        (("whisper", transcribe), ("llm", lambda job: job), ("writer", write)),
+    )
+    monkeypatch.setattr(asr_workflow, "whisper_stage_workers", lambda: 2)
+    monkeypatch.setattr(asr_workflow, "get_cpu_pool", lambda: None)
+    monkeypatch.setattr(asr_workflow, "warning_count", 0)
+    monkeypatch.setattr(asr_workflow, "warning_audio_inputs", [])
+
+    asr_workflow.process_files_pipelined(
+        [tmp_path / "a.wav", tmp_path / "b.wav"], tmp_path
+    )
+
+    assert sorted(emails) == [
+        ("a.wav", [f'"{tmp_path / "a.wav"}"']),
+        ("b.wav", [f'"{tmp_path / "b.wav"}"']),
+    ]
+
+
+# --- Stage Cache Tests ---
+
+
+def test_stage_cache_roundtrip_and_disabled_cache(tmp_path):
+    from utils.stage_cache import StageCache
+
+    cache = StageCache(tmp_path / "cache")
+    assert cache.get("whisper", "ab" * 32) is None
+
+    cache.put("whisper", "ab" * 32, {"segments": [{"text": "Hallo"}]})
+    assert cache.get("whisper", "ab" * 32) == {"segments": [{"text": "Hallo"}]}
+    assert cache.path_for("whisper", "ab" * 32).parent.name == "ab"
+
+    disabled = StageCache(None)
+    disabled.put("whisper", "ab" * 32, {"segments": []})
+    assert disabled.get("whisper", "ab" * 32) is None
+
+
+def test_stage_keys_only_change_downstream_of_changed_config(tmp_path, monkeypatch):
+    from utils import stage_cache
+
+    audio = tmp_path / "interview.wav"
+    audio.write_bytes(b"RIFF-audio")
+    before = stage_cache.build_stage_keys(audio)
+
+    monkeypatch.setitem(stage_cache.config["llm_meta"], "llm_languages", ["en"])
+    after_llm_change = stage_cache.build_stage_keys(audio)
+    assert after_llm_change["whisper"] == before["whisper"]
+    assert after_llm_change["postprocess"] == before["postprocess"]
+    assert after_llm_change["llm"] != before["llm"]
+
+    monkeypatch.setitem(stage_cache.config["whisper"], "beam_size", 1)
+    after_whisper_change = stage_cache.build_stage_keys(audio)
+    assert after_whisper_change["whisper"] != before["whisper"]
+    assert after_whisper_change["llm"] != after_llm_change["llm"]
+
+
+def test_whisper_and_diarization_keys_change_with_library_versions(
+    tmp_path, monkeypatch
+):
+    from utils import stage_cache
+
+    audio = tmp_path / "interview.wav"
+    audio.write_bytes(b"RIFF-audio")
+    whisper_key = stage_cache.build_stage_keys(audio)["whisper"]
+    diarization_key = stage_cache.diarization_key(audio, 2, 4, "pyannote/model")
+
+    monkeypatch.setitem(stage_cache.config["whisper"], "shared_translation_pass", True)
+    assert stage_cache.build_stage_keys(audio)["whisper"] != whisper_key
+    monkeypatch.undo()
+
+    installed = stage_cache.package_versions
+    monkeypatch.setattr(
+        stage_cache,
+        "package_versions",
+        lambda packages: {**installed(packages), "pyannote.audio": "99.0"},
+    )
+    assert stage_cache.build_stage_keys(audio)["whisper"] != whisper_key
+    assert stage_cache.diarization_key(audio, 2, 4, "pyannote/model") != diarization_key
+
+
+# --- Watch Mode Tests ---
+
+
+def test_folder_watcher_reports_files_once_they_are_stable(tmp_path):
+    from utils.utilities import should_be_processed
+    from utils.watcher import FolderWatcher, ProcessedLedger
+
+    now = {"t": 0.0}
+    ledger = ProcessedLedger(tmp_path / "ledger.jsonl")
+    watcher = FolderWatcher(
+        tmp_path / "input",
+        ledger,
+        should_be_processed,
+        stable_seconds=10,
+        clock=lambda: now["t"],
+    )
+    (tmp_path / "input").mkdir()
+    upload = tmp_path / "input" / "interview.wav"
+    upload.write_bytes(b"part")
+    (tmp_path / "input" / "_ignored.wav").write_bytes(b"x")
+
+    assert watcher.poll() == []
+    now["t"] = 5
+    upload.write_bytes(b"partial upload grows")
+    assert watcher.poll() == []
+    now["t"] = 10
+    assert watcher.poll() == []
+    now["t"] = 16
+    assert watcher.poll() == [upload]
+    now["t"] = 30
+    assert watcher.poll() == []
+
+
+def test_processed_ledger_survives_restart_and_detects_replaced_files(tmp_path):
+    from utils.watcher import ProcessedLedger
+
+    audio = tmp_path / "interview.wav"
+    audio.write_bytes(b"first version")
+    ProcessedLedger(tmp_path / "ledger.jsonl").record(audio, "done")
+
+    restarted = ProcessedLedger(tmp_path / "ledger.jsonl")
+    assert restarted.contains(audio)
+
+    audio.write_bytes(b"a different, longer version")
+    assert not restarted.contains(audio)
+
+
+# --- CPU Pool Tests ---
+
+
+def test_partition_cores_splits_contiguously_and_evenly():
+    from utils.cpu_pool import partition_cores
+
+    assert partition_cores(list(range(10)), 3) == [[0, 1, 2, 3], [4, 5, 6], [7, 8, 9]]
+    assert partition_cores([0, 1], 4) == [[0], [1]]
+
+
+def test_core_pool_gives_each_thread_its_own_slot_and_environment():
+    import json
+    import threading
+    from utils.cpu_pool import AFFINITY_ENV, OVERRIDES_ENV, CorePool
+
+    pool = CorePool(2, pin=True, cores=list(range(8)))
+    slots = []
+    threads = [
+        threading.Thread(target=lambda: slots.append(pool.slot_for_current_thread()))
+        for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(slots) == [0, 1]
+
+    env = pool.env_for_slot(1)
+    assert json.loads(env[OVERRIDES_ENV])["thread_count"] == 4
+    assert env["OMP_NUM_THREADS"] == "4"
+    assert env[AFFINITY_ENV] == "4,5,6,7"
+
+
+# --- Scheduling Tests ---
+
+
+def test_probe_duration_reads_wav_header(tmp_path):
+    import wave
+    from utils.audio_probe import probe_duration_seconds
+
+    path = tmp_path / "tone.wav"
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(8000)
+        wav_file.writeframes(b"\x00\x00" * 12000)
+
+    assert probe_duration_seconds(path) == pytest.approx(1.5)
+
+
+def test_order_longest_first_and_makespan_estimate():
+    from pathlib import Path
+    from utils.scheduling import estimate_makespan, order_longest_first
+
+    paths = [Path(name) for name in ("a.wav", "b.wav", "c.wav", "d.wav")]
+    costs = {paths[0]: 10.0, paths[1]: None, paths[2]: 240.0, paths[3]: 30.0}
+
+    ordered = order_longest_first(paths, costs)
+    assert [path.name for path in ordered] == ["c.wav", "d.wav", "a.wav", "b.wav"]
+
+    assert estimate_makespan([240.0, 30.0, 10.0], workers=2) == 240.0
+    assert estimate_makespan([10.0, 30.0, 240.0], workers=1) == 280.0
+    assert estimate_makespan([5.0, 4.0, 3.0, 3.0], workers=2) == 8.0
+
+
+def test_transcribe_stage_uses_probe_then_decoded_length(tmp_path, monkeypatch):
+    import socket
+    import wave
+
+    monkeypatch.setattr(socket, "gethostbyname", lambda _name: "127.0.0.1")
+    import asr_workflow
+
+    path = tmp_path / "interview.wav"
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(16000)
+        wav_file.writeframes(b"\x00\x00" * 16000)
+
+    logged_lengths = []
+
+    def _fake_whisper(_filepath):
+        logged_lengths.append(job.process_info.audio_length)
+        return {"segments": [], "audio_length": 1.02}
+
+    monkeypatch.setattr(asr_workflow, "run_whisper_pipeline", _fake_whisper)
+    monkeypatch.setattr(asr_workflow, "postprocess_pipeline", lambda _r: ({}, None))
+
+    job = asr_workflow.FileJob(
+        filepath=path,
+        output_directory=tmp_path,
+        process_info=asr_workflow.init_process_info(path),
+    )
+    asr_workflow.transcribe_stage(job)
+
+    assert logged_lengths == [pytest.approx(1.0)]
+    assert job.process_info.audio_length == pytest.approx(1.02)
+    assert not hasattr(asr_workflow, "get_audio")
+
+
+# --- Startup Tests ---
+
+
+def test_coordinator_import_does_not_load_heavy_dependencies():
+    from benchmarks.bench_startup import HEAVY_MODULES, measure_import
+
+    for module in ("asr_workflow", "llm_workflows.llm_debug"):
+        report = measure_import(module)
+        assert report["heavy"] == [], (module, report["heavy"])
+    assert "torch" in HEAVY_MODULES
+
+
+# --- Audio Buffer Tests ---
+
+
+def test_audio_buffer_converts_pcm_like_whisperx_and_is_shared(tmp_path, monkeypatch):
+    import io
+    import numpy as np
+    from utils import audio_buffer
+
+    monkeypatch.setattr(audio_buffer, "_READ_SIZE", 7)  # odd: samples span reads
+    samples = np.array([0, 1, -1, 32767, -32768, 1234, -4321], dtype=np.int16)
+    buffer = audio_buffer.AudioBuffer.from_pcm_stream(
+        io.BytesIO(samples.tobytes()), directory=tmp_path
+    )
+
+    expected = samples.astype(np.float32) / 32768.0
+    with buffer:
+        assert buffer.array.dtype == np.float32
+        np.testing.assert_array_equal(buffer.array, expected)
+        attached = audio_buffer.attach_audio(buffer.path)
+        attached[0] = 1.0  # copy-on-write: other consumers are unaffected
+        assert buffer.array[0] == 0.0
+        assert buffer.seconds == pytest.approx(len(samples) / 16000)
+    assert not buffer.path.exists()
+
+
+# --- Stage Metrics Tests ---
+
+
+def test_stage_timer_records_into_collector_and_totals_aggregate(tmp_path):
+    import json
+    from utils.stage_metrics import MetricsLog, collect_stage_metrics, stage_timer
+    from utils.stats import ProcessInfo
+
+    with stage_timer("ignored"):
+        pass  # no collector bound: nothing is recorded
+
+    process_info = ProcessInfo("interview.wav")
+    with collect_stage_metrics(process_info.stage_metrics):
+        with stage_timer("write_outputs"):
+            with stage_timer("pdf"):
+                sum(range(10000))
+        with stage_timer("pdf"):
+            pass
+    process_info.add_stage_metrics(
+        [
+            {
+                "stage": "align",
+                "wall_seconds": 2.0,
+                "cpu_seconds": 7.5,
+                "peak_rss_mb": 900.0,
+                "process": "whisper",
+            }
+        ]
+    )
+
+    assert [entry.stage for entry in process_info.stage_metrics] == [
+        "pdf",
+        "write_outputs",
+        "pdf",
+        "align",
+    ]
+    assert all(entry.peak_rss_mb > 0 for entry in process_info.stage_metrics)
+    breakdown = process_info.formatted_stage_breakdown()
+    assert breakdown.startswith("pdf ")
+    assert breakdown.count("pdf ") == 1
+    assert "whisper.align 2.0s (cpu 7.5s, 900 MB)" in breakdown
+
+    log = MetricsLog(tmp_path / "metrics" / "run.jsonl")
+    log.write(process_info.metrics_record("done"))
+    record = json.loads(log.path.read_text(encoding="utf-8"))
+    assert record["file"] == "interview.wav"
+    assert record["status"] == "done"
+    assert record["stages"][-1]["process"] == "whisper"
+
+
+def test_transcribe_stage_keeps_subprocess_metrics_out_of_cached_result(
+    tmp_path, monkeypatch
+):
+    import socket
+
+    monkeypatch.setattr(socket, "gethostbyname", lambda _name: "127.0.0.1")
+    import asr_workflow
+    from utils.stage_cache import StageCache
+    from utils.stage_metrics import collect_stage_metrics
+
+    subprocess_metrics = {
+        "stage": "transcribe",
+        "wall_seconds": 1.0,
+        "cpu_seconds": 3.0,
+        "peak_rss_mb": 500.0,
+        "process": "whisper",
+    }
+    monkeypatch.setattr(
+        asr_workflow,
+        "run_whisper_pipeline",
+        lambda _path: {"segments": [], "stage_metrics": [dict(subprocess_metrics)]},
+    )
+    monkeypatch.setattr(asr_workflow, "postprocess_pipeline", lambda _r: ({}, None))
+    monkeypatch.setattr(asr_workflow, "stage_cache", StageCache(tmp_path / "cache"))
+
+    path = tmp_path / "interview.mp3"
+    path.write_bytes(b"not really audio")
+    job = asr_workflow.FileJob(
+        filepath=path,
+        output_directory=tmp_path,
+        process_info=asr_workflow.init_process_info(path),
+    )
+    with collect_stage_metrics(job.process_info.stage_metrics):
+        asr_workflow.transcribe_stage(job)
+
+    labels = [
+        (entry.process, entry.stage) for entry in job.process_info.stage_metrics
+    ]
+    assert labels == [
+        ("main", "probe"),
+        ("main", "audio_hash"),
+        ("main", "whisper"),
+        ("whisper", "transcribe"),
+        ("main", "postprocess"),
+    ]
+    cached = asr_workflow.stage_cache.get("whisper", job.cache_keys["whisper"])
+    assert "stage_metrics" not in cached
+
+
+def test_transcribe_stage_does_not_cache_results_of_a_lighter_rung(
+    tmp_path, monkeypatch
+):
+    import socket
+
+    monkeypatch.setattr(socket, "gethostbyname", lambda _name: "127.0.0.1")
+    import asr_workflow
+    from utils.stage_cache import StageCache, build_stage_keys
+
+    runs = [
+        {
+            "segments": [{"text": "LIGHTER RUNG TEXT.", "end": 1.0}],
+            "whisper_attempts": [
+                {"rung": "configured", "status": "oom", "peak_rss_mb": 900.0},
+                {"rung": "smaller_batch", "status": "ok", "peak_rss_mb": 500.0},
+            ],
+        },
+        {"segments": [{"text": "CONFIGURED TEXT.", "end": 1.0}]},
+    ]
+    monkeypatch.setattr(asr_workflow, "run_whisper_pipeline", lambda _p: runs.pop(0))
+    monkeypatch.setattr(
+        asr_workflow,
+        "postprocess_pipeline",
+        lambda result: ({"segments": list(result["segments"])}, None),
+    )
+    monkeypatch.setattr(asr_workflow, "stage_cache", StageCache(tmp_path / "cache"))
+
+    path = tmp_path / "interview.mp3"
+    path.write_bytes(b"not really audio")
+
+    def transcribe():
+        job = asr_workflow.FileJob(
+            filepath=path,
+            output_directory=tmp_path,
+            process_info=asr_workflow.init_process_info(path),
+        )
+        return asr_workflow.transcribe_stage(job)
+
+    first = transcribe()
+    assert first.processed == {"segments": [{"text": "LIGHTER RUNG TEXT.", "end": 1.0}]}
+    assert first.cache_keys is None
+    keys = build_stage_keys(path)
+    assert asr_workflow.stage_cache.get("whisper", keys["whisper"]) is None
+    assert asr_workflow.stage_cache.get("postprocess", keys["postprocess"]) is None
+
+    second = transcribe()
+    assert second.result == {"segments": [{"text": "CONFIGURED TEXT.", "end": 1.0}]}
+    assert second.processed == {"segments": [{"text": "CONFIGURED TEXT.", "end": 1.0}]}
+
+
+# --- Chunking Tests ---
+
+
+def test_plan_windows_cuts_in_pauses_and_reads_only_search_regions():
+    import numpy as np
+    from subprocesses.chunking import SAMPLE_RATE, plan_windows
+
+    rng = np.random.default_rng(0)
+    audio = rng.uniform(-0.5, 0.5, 100 * SAMPLE_RATE).astype(np.float32)
+    pause = slice(35 * SAMPLE_RATE, 37 * SAMPLE_RATE)
+    audio[pause] = 0.0
+    reads = []
+
+    def read(start, stop):
+        reads.append((start, stop))
+        return audio[start:stop]
+
+    windows = plan_windows(len(audio), 40 * SAMPLE_RATE, read)
+
+    assert windows[0][0] == 0 and windows[-1][1] == len(audio)
+    assert all(a[1] == b[0] for a, b in zip(windows, windows[1:]))
+    assert pause.start <= windows[0][1] < pause.stop
+    assert all(stop - start <= 10 * SAMPLE_RATE for start, stop in reads)
+    assert plan_windows(len(audio), 0, read) == [(0, len(audio))]
+
+
+def test_plan_windows_cuts_in_longest_vad_pause():
+    import numpy as np
+    from subprocesses.chunking import SAMPLE_RATE, plan_windows, speech_gap_point
+
+    assert speech_gap_point(100, [(0, 10), (20, 30), (70, 90)]) == 50
+    assert speech_gap_point(100, [(10, 95)]) == 5
+    assert speech_gap_point(100, [(-5, 60), (40, 105)]) is None
+    assert speech_gap_point(100, []) == 50
+
+    # Speech throughout except for pauses at 31-32, 34-37 and 68-70 s.
+    speech = [(0, 31), (32, 34), (37, 68), (70, 100)]
+    regions = [(start * SAMPLE_RATE, stop * SAMPLE_RATE) for start, stop in speech]
+    audio = np.ones(100 * SAMPLE_RATE, dtype=np.float32)
+    search_starts = []
+
+    def read(start, stop):
+        search_starts.append(start)
+        return audio[start:stop]
+
+    def find_cut(samples):
+        offset = search_starts[-1]
+        shifted = [(start - offset, stop - offset) for start, stop in regions]
+        return speech_gap_point(len(samples), shifted)
+
+    windows = plan_windows(len(audio), 40 * SAMPLE_RATE, read, find_cut=find_cut)
+    cuts = [int(35.5 * SAMPLE_RATE), 69 * SAMPLE_RATE]
+    assert windows == [(0, cuts[0]), (cuts[0], cuts[1]), (cuts[1], len(audio))]
+
+
+def test_shift_and_merge_results_offset_segments_and_words():
+    from subprocesses.chunking import merge_results, shift_result
+
+    def window_result(text):
+        word = {"word": text, "start": 1.0, "end": 1.5, "score": 0.9}
+        unaligned = {"word": "42"}  # words without timestamps stay untouched
+        return {
+            "segments": [
+                {"start": 1.0, "end": 2.0, "text": text, "words": [word, unaligned]}
+            ],
+            "word_segments": [dict(word), dict(unaligned)],
+        }
+
+    first = shift_result(window_result("Hallo"), 0.0)
+    second = shift_result(window_result("Welt"), 30.0)
+    merged = merge_results([first, second])
+
+    assert [s["start"] for s in merged["segments"]] == [1.0, 31.0]
+    assert merged["segments"][1]["words"][0]["end"] == 31.5
+    assert merged["segments"][1]["words"][1] == {"word": "42"}
+    assert [w.get("start") for w in merged["word_segments"]] == [1.0, None, 31.0, None]
+
+    # whisperx shares the word dicts between segments and word_segments.
+    shared = window_result("Welt")
+    shared["word_segments"] = list(shared["segments"][0]["words"])
+    assert shift_result(shared, 30.0)["word_segments"][0]["start"] == 31.0
+
+
+def test_windowed_transcription_loads_models_once(tmp_path):
+    import json
+    import subprocess
+    import sys
+
+    # Three 1 s windows of a one-shot subprocess (no model cache given).
+    code = (
+        "import io, json, sys\n"
+        "import numpy as np\n"
+        "from subprocesses import whisper_subprocess as ws\n"
+        "from utils.audio_buffer import AudioBuffer\n"
+        "loads = []\n"
+        "class Pipeline:\n"
+        "    def transcribe(self, audio, **kwargs):\n"
+        "        return {'segments': [], 'language': 'de'}\n"
+        "def load(name, value):\n"
+        "    def loader(*args):\n"
+        "        loads.append(name)\n"
+        "        return value\n"
+        "    return loader\n"
+        "ws.load_transcription_model = load('transcribe', Pipeline())\n"
+        "ws.load_alignment_model = load('align', (None, None))\n"
+        "ws.whisperx.align = lambda *args, **kwargs: {'segments': [], 'word_segments': []}\n"
+        "ws.vad_segments = lambda pipeline, samples: []\n"
+        "ws.streaming_window_seconds = 1\n"
+        "ws.translation_enabled = False\n"
+        "ws.shared_translation_pass = False\n"
+        "samples = np.zeros(3 * 16000, dtype=np.int16).tobytes()\n"
+        f"buffer = AudioBuffer.from_pcm_stream(io.BytesIO(samples), {str(tmp_path)!r})\n"
+        "with buffer:\n"
+        "    ws.transcribe_span(buffer, 0, buffer.num_samples)\n"
+        "sys.__stdout__.write(json.dumps(loads))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+
+    assert json.loads(output) == ["transcribe", "align"]
+
+
+def test_plan_chunks_splits_evenly_at_pauses():
+    import numpy as np
+    from subprocesses.chunking import SAMPLE_RATE, plan_chunks
+
+    rng = np.random.default_rng(1)
+    audio = rng.uniform(-0.5, 0.5, 120 * SAMPLE_RATE).astype(np.float32)
+    audio[38 * SAMPLE_RATE : 39 * SAMPLE_RATE] = 0.0
+    audio[81 * SAMPLE_RATE : 82 * SAMPLE_RATE] = 0.0
+
+    chunks = plan_chunks(len(audio), 3, lambda start, stop: audio[start:stop])
+
+    assert len(chunks) == 3
+    assert chunks[0][0] == 0 and chunks[-1][1] == len(audio)
+    assert 38 * SAMPLE_RATE <= chunks[0][1] < 39 * SAMPLE_RATE
+    assert 81 * SAMPLE_RATE <= chunks[1][1] < 82 * SAMPLE_RATE
+    assert plan_chunks(len(audio), 1, None) == [(0, len(audio))]
+
+
+def test_parallel_job_worker_reports_failures():
+    from subprocesses.job_worker import run_parallel_jobs
+
+    with pytest.raises(RuntimeError, match="Unknown job task"):
+        run_parallel_jobs([{"task": "unknown"}], [None])
+
+
+def test_job_worker_envs_split_only_the_thread_count():
+    import json
+    import os
+    import subprocess
+    import sys
+
+    from utils.cpu_pool import available_cores, partition_cores
+
+    # An unpinned slot of 4 threads must not hand each worker the whole host.
+    env = {**os.environ, "ASR_WHISPER_OVERRIDES": json.dumps({"thread_count": 4})}
+    env.pop("ASR_WHISPER_CPUS", None)
+    code = (
+        "import json, sys\n"
+        "from subprocesses import whisper_subprocess as ws\n"
+        "envs = ws.job_worker_envs(2)\n"
+        "sys.__stdout__.write(json.dumps([\n"
+        "    json.loads(env['ASR_WHISPER_OVERRIDES'])['thread_count'] for env in envs\n"
+        "]))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+    partitions = partition_cores(available_cores()[:4], 2)
+    expected = [len(partitions[slot % len(partitions)]) for slot in range(2)]
+    assert json.loads(output) == expected
+
+
+def test_split_contiguous_balances_weight_and_keeps_order():
+    from subprocesses.chunking import split_contiguous
+
+    assert split_contiguous([1] * 10, 3) == [(0, 4), (4, 7), (7, 10)]
+    assert split_contiguous([9, 1, 1, 1, 1, 1, 1, 1, 1, 1], 2) == [(0, 1), (1, 10)]
+    assert split_contiguous([1, 1], 5) == [(0, 1), (1, 2)]
+    assert split_contiguous([], 3) == [(0, 0)]
+
+
+def test_pending_job_runs_in_background_and_can_keep_its_worker():
+    from subprocesses.job_worker import JobProcess, PendingJob
+
+    worker = JobProcess()
+    try:
+        first = PendingJob(worker, {"task": "unknown"}, keep_worker=True)
+        with pytest.raises(RuntimeError, match="Unknown job task"):
+            first.result()
+        assert worker.is_alive()
+
+        second = PendingJob(worker, {"task": "unknown"}, keep_worker=True)
+        with pytest.raises(RuntimeError, match="Unknown job task"):
+            second.result()
+        second.cancel()  # finished jobs are not cancelled
+        assert worker.is_alive()
+    finally:
+        worker.close()
+
+
+def test_diarization_key_ignores_whisper_settings(tmp_path, monkeypatch):
+    from utils import stage_cache
+
+    audio = tmp_path / "interview.wav"
+    audio.write_bytes(b"audio")
+    key = stage_cache.diarization_key(audio, 2, 4, "pipeline-1")
+
+    monkeypatch.setitem(stage_cache.config["whisper"], "model", "medium")
+    assert stage_cache.diarization_key(audio, 2, 4, "pipeline-1") == key
+    assert stage_cache.diarization_key(audio, 2, 5, "pipeline-1") != key
+    assert stage_cache.diarization_key(audio, None, 4, "pipeline-1") != key
+    assert stage_cache.diarization_key(audio, 2, 4, "pipeline-2") != key
+
+
+def test_shared_translation_pass_encodes_each_batch_once(monkeypatch):
+    import numpy as np
+    from subprocesses import dual_decode
+
+    segments = [{"start": float(i), "end": i + 0.5} for i in range(5)]
+    monkeypatch.setattr(dual_decode, "vad_segments", lambda pipeline, audio: segments)
+    monkeypatch.setattr(
+        dual_decode,
+        "Tokenizer",
+        lambda *args, task, language: SimpleNamespace(task=task),
+    )
+    monkeypatch.setattr(
+        dual_decode,
+        "segment_features",
+        lambda pipeline, audio, segment: np.zeros((2, 3)),
+    )
+
+    monkeypatch.setattr(
+        dual_decode,
+        "decode_prompt",
+        lambda whisper_model, tokenizer, options: tokenizer.task,
+    )
+
+    def fake_decode(whisper_model, encoder_output, prompts, tokenizer, options):
+        texts = [f"{prompt} {encoder_output}" for prompt in prompts]
+        return texts, [-0.1] * len(prompts)
+
+    monkeypatch.setattr(dual_decode, "decode", fake_decode)
+    encoded = []
+
+    def encode(features):
+        encoded.append(features.shape[0])
+        return len(encoded)
+
+    pipeline = SimpleNamespace(
+        model=SimpleNamespace(
+            encode=encode,
+            hf_tokenizer=None,
+            model=SimpleNamespace(is_multilingual=True),
+        ),
+        options=None,
+        suppress_numerals=False,
+        preset_language=None,
+        detect_language=lambda audio: "de",
+    )
+
+    transcription, translation = dual_decode.transcribe_and_translate(
+        pipeline, np.zeros(16000 * 6, dtype=np.float32), batch_size=2
+    )
+
+    assert encoded == [2, 2, 1]
+    assert transcription["language"] == translation["language"] == "de"
+    assert [s["text"] for s in transcription["segments"]] == [
+        "transcribe 1",
+        "transcribe 1",
+        "transcribe 2",
+        "transcribe 2",
+        "transcribe 3",
+    ]
+    assert [s["text"] for s in translation["segments"]][-1] == "translate 3"
+    assert [s["start"] for s in translation["segments"]] == [0, 1, 2, 3, 4]
+
+
+# --- Auto-tuning Tests ---
+
+
+def test_host_profile_overrides_tuned_whisper_settings(tmp_path):
+    from config import host_profile
+
+    path = str(tmp_path / "profiles.json")
+    host_profile.save_host_settings(
+        "large-v3", "cpu", {"batch_size": 8, "compute_type": "int8"}, path
+    )
+    host_profile.save_host_settings("medium", "cpu", {"batch_size": 32}, path)
+
+    whisper_config = {
+        "model": "large-v3",
+        "device": "cpu",
+        "batch_size": 28,
+        "compute_type": "float32",
+        "host_profile_path": path,
+    }
+    applied = host_profile.apply_host_profile(whisper_config)
+    assert applied == {"batch_size": 8, "compute_type": "int8"}
+    assert whisper_config["batch_size"] == 8
+
+    other_device = dict(whisper_config, device="cuda", batch_size=28)
+    assert host_profile.apply_host_profile(other_device) is None
+    disabled = dict(whisper_config, batch_size=28, use_host_profile=False)
+    assert host_profile.apply_host_profile(disabled) is None
+    assert disabled["batch_size"] == 28
+
+
+def test_autotune_picks_fastest_trial_within_memory_limit():
+    from subprocesses.whisper_autotune import choose_settings
+
+    trials = [
+        {"batch_size": 8, "compute_type": "int8", "speed": 4.0, "peak_rss_mb": 3000},
+        {"batch_size": 16, "compute_type": "int8", "speed": 6.0, "peak_rss_mb": 9000},
+        {"batch_size": 32, "compute_type": "int8", "error": "oom"},
+        {"batch_size": 8, "compute_type": "float32", "speed": 3.0, "peak_rss_mb": 5000},
+    ]
+    assert choose_settings(trials, {"peak_rss_mb": 8000})["batch_size"] == 8
+    assert choose_settings(trials, {"peak_rss_mb": 10000})["batch_size"] == 16
+    assert choose_settings(trials, {"peak_rss_mb": 1000}) is None
+
+
+# --- OOM Retry Tests ---
+
+
+def test_oom_ladder_retries_with_lighter_settings(monkeypatch):
+    from subprocesses import subprocess_handler
+
+    whisper_config = {
+        "batch_size": 28,
+        "compute_type": "float32",
+        "streaming_window_seconds": 0,
+    }
+    rungs = subprocess_handler.oom_ladder(whisper_config)
+    assert [name for name, _ in rungs] == [
+        "configured",
+        "smaller_batch",
+        "chunked",
+        "lighter_compute_type",
+    ]
+    assert rungs[-1][1]["batch_size"] == 14
+    assert rungs[-1][1]["compute_type"] == "int8"
+    assert rungs[-1][1]["streaming_window_seconds"] > 0
+
+    calls = []
+
+    def fake_attempt(audio_path, overrides):
+        calls.append(overrides)
+        if len(calls) < 3:
+            raise subprocess_handler.WhisperOutOfMemory("killed", 1000.0 * len(calls))
+        return {"segments": []}, 500.0
+
+    monkeypatch.setattr(subprocess_handler, "run_whisper_attempt", fake_attempt)
+    monkeypatch.setitem(subprocess_handler.config, "whisper", whisper_config)
+    result = subprocess_handler.run_whisper_subprocess("interview.wav")
+
+    assert calls == [rung[1] for rung in rungs[:3]]
+    assert result["whisper_attempts"] == [
+        {"rung": "configured", "status": "oom", "peak_rss_mb": 1000.0},
+        {"rung": "smaller_batch", "status": "oom", "peak_rss_mb": 2000.0},
+        {"rung": "chunked", "status": "ok", "peak_rss_mb": 500.0},
+    ]
+
+
+def test_memory_watchdog_stops_process_over_limit():
+    import subprocess
+    import sys
+    from subprocesses.subprocess_handler import MemoryWatchdog, is_oom_failure
+
+    process = subprocess.Popen(
+        [sys.executable, "-c", "import time; b = bytearray(300 << 20); time.sleep(30)"]
+    )
+    watchdog = MemoryWatchdog(process.pid, limit_mb=150, interval=0.05)
+    returncode = process.wait(timeout=20)
+    peak_rss_mb = watchdog.stop()
+
+    assert watchdog.tripped
+    assert peak_rss_mb > 150
+    assert is_oom_failure(returncode)
+    assert is_oom_failure(1, "RuntimeError: CUDA failed with error out of memory")
+    assert not is_oom_failure(1, "FileNotFoundError")
+
+
+# --- VAD Prepass Tests ---
+
+
+def test_vad_prepass_orders_by_speech_and_skips_silent_files(tmp_path, monkeypatch):
+    import socket
+
+    monkeypatch.setattr(socket, "gethostbyname", lambda _name: "127.0.0.1")
+    import asr_workflow
+
+    paths = [tmp_path / name for name in ("a.wav", "b.wav", "silence.wav")]
+    measured = {
+        str(path): {
+            "audio_seconds": audio,
+            "speech_seconds": speech,
+            "speech_ratio": speech / audio,
+        }
+        for path, audio, speech in zip(paths, (600, 300, 900), (60, 290, 0.0))
+    }
+    monkeypatch.setattr(asr_workflow, "use_vad_prepass", True)
+    monkeypatch.setattr(asr_workflow, "run_vad_prepass", lambda _paths: measured)
+    monkeypatch.setattr(
+        asr_workflow, "probe_durations", lambda paths: {p: 600.0 for p in paths}
+    )
+    monkeypatch.setitem(asr_workflow.pipeline_config, "job_order", "longest_first")
+
+    assert asr_workflow.schedule_files(paths) == [paths[1], paths[0], paths[2]]
+
+    def _unexpected(*_args):
+        raise AssertionError("heavy stage ran for a file without speech")
+
+    monkeypatch.setattr(asr_workflow, "run_whisper_pipeline", _unexpected)
+    monkeypatch.setattr(asr_workflow, "run_llm_if_enabled", _unexpected)
+    monkeypatch.setattr(asr_workflow, "write_primary_outputs", _unexpected)
+    monkeypatch.setattr(asr_workflow, "finalize_and_zip_bag", lambda *args: None)
+
+    job = asr_workflow.new_file_job(paths[2], tmp_path)
+    assert job.has_no_speech
+    for _name, stage_func in asr_workflow.FILE_STAGES:
+        job = stage_func(job)
+
+    no_speech_files = list(tmp_path.rglob("*_no_speech.json"))
+    assert len(no_speech_files) == 1
+    assert job.process_info.audio_length == 900
+    assert job.process_info.speech_seconds == 0.0
+
+
+def test_zero_length_input_is_written_without_a_realtime_factor(tmp_path, monkeypatch):
+    import socket
+
+    monkeypatch.setattr(socket, "gethostbyname", lambda _name: "127.0.0.1")
+    import asr_workflow
+    from utils import email_notifications
+
+    path = tmp_path / "empty.wav"
+    empty = {"audio_seconds": 0.0, "speech_seconds": 0.0, "speech_ratio": 0.0}
+    monkeypatch.setitem(asr_workflow.speech_activity, path, empty)
+    monkeypatch.setattr(asr_workflow, "finalize_and_zip_bag", lambda *args: None)
+    monkeypatch.setattr(asr_workflow, "stats", [])
+
+    job = asr_workflow.new_file_job(path, tmp_path)
+    for _name, stage_func in asr_workflow.FILE_STAGES:
+        job = stage_func(job)
+
+    assert job.process_info.audio_length == 0.0
+    assert job.process_info.realtime_factor() is None
+    assert asr_workflow.stats == [job.process_info]
+
+    bodies = []
+    monkeypatch.setattr(
+        email_notifications,
+        "send_email",
+        lambda subject, body, type: bodies.append(body),
+    )
+    email_notifications.send_success_email(asr_workflow.stats, 0, [])
+    assert "rtf n/a" in bodies[0]
+
+
+# --- Clip Batching Tests ---
+
+
+def test_clip_batcher_runs_each_group_once_and_falls_back(tmp_path):
+    from utils.clip_batcher import ClipBatcher
+
+    paths = [tmp_path / f"{name}.wav" for name in ("long", "a", "b", "c", "d")]
+    calls = []
+
+    def run_batch(group):
+        calls.append(list(group))
+        if paths[4] in group:
+            raise RuntimeError("boom")
+        return [f"result {path.name}" for path in group]
+
+    batcher = ClipBatcher(run_batch, max_files=2)
+    assert batcher.plan(paths, lambda path: path != paths[0]) == 4
+
+    assert batcher.result(paths[0]) is None
+    assert batcher.result(paths[2]) == "result b.wav"
+    assert batcher.result(paths[1]) == "result a.wav"
+    assert calls == [[paths[1], paths[2]]]
+
+    # A failed group makes each of its files run on its own.
+    assert batcher.result(paths[3]) is None
+    assert batcher.result(paths[4]) is None
+    assert len(calls) == 2
+
+
+def test_clip_batches_leave_out_cached_and_discarded_files(tmp_path, monkeypatch):
+    import socket
+
+    monkeypatch.setattr(socket, "gethostbyname", lambda _name: "127.0.0.1")
+    import asr_workflow
+    from utils.clip_batcher import ClipBatcher
+    from utils.stage_cache import StageCache, build_stage_keys
+
+    paths = [tmp_path / f"{name}.wav" for name in ("a", "cached", "b", "c", "d")]
+    for path in paths:
+        path.write_bytes(path.name.encode())
+    cache = StageCache(tmp_path / "cache")
+    cache.put("whisper", build_stage_keys(paths[1])["whisper"], {"segments": []})
+    calls = []
+
+    def run_batch(group):
+        calls.append([path.name for path in group])
+        return [f"result {path.name}" for path in group]
+
+    batcher = ClipBatcher(run_batch, max_files=8)
+    monkeypatch.setattr(asr_workflow, "stage_cache", cache)
+    monkeypatch.setattr(asr_workflow, "clip_batcher", batcher)
+    monkeypatch.setattr(asr_workflow, "clip_batch_seconds", 60)
+    asr_workflow.plan_clip_batches(paths, {path: 30.0 for path in paths}, {})
+
+    assert batcher.result(paths[1]) is None  # cached: not grouped
+    batcher.discard(paths[4])  # e.g. failed before reaching Whisper
+    assert batcher.result(paths[2]) == "result b.wav"
+    assert calls == [["a.wav", "b.wav", "c.wav"]]
+
+    # Results of files that leave after the run are dropped.
+    batcher.discard(paths[3])
+    assert batcher.result(paths[0]) == "result a.wav"
+    assert batcher._groups == {}
+    assert batcher.result(paths[3]) is None
+
+
+def test_clip_batch_of_one_file_returns_a_list(tmp_path, monkeypatch):
+    from subprocesses import subprocess_handler
+    from utils.clip_batcher import ClipBatcher
+
+    calls = []
+
+    def fake_process(audio_paths, overrides):
+        calls.append(list(audio_paths))
+        # Like the one-shot subprocess: a bare result dict for a single file.
+        if len(audio_paths) == 1:
+            return {"segments": ["one"]}, 0.0
+        return [{"segments": [str(path)]} for path in audio_paths], 0.0
+
+    monkeypatch.setattr(subprocess_handler, "use_persistent_worker", False)
+    monkeypatch.setattr(subprocess_handler, "run_whisper_process", fake_process)
+    a, b = tmp_path / "a.wav", tmp_path / "b.wav"
+    assert subprocess_handler.run_whisper_batch([a]) == [{"segments": ["one"]}]
+
+    # A group that shrank to one file is not run as a batch.
+    batcher = ClipBatcher(subprocess_handler.run_whisper_batch, max_files=8)
+    batcher.plan([a, b], lambda path: True)
+    batcher.discard(b)
+    assert batcher.result(a) is None
+    assert calls == [[a]]
+
+
+# --- Speaker Assignment Tests ---
+
+
+def test_assign_speakers_matches_whisperx():
+    import copy
+    import random
+
+    import pandas as pd
+    from whisperx.diarize import assign_word_speakers
+
+    from utils.speaker_assignment import assign_speakers
+
+    rng = random.Random(7)
+    turns = []
+    for _ in range(300):
+        start = round(rng.uniform(0, 600), 2)
+        end = round(start + rng.choice([0.0, rng.uniform(0.1, 20)]), 2)
+        turns.append((start, end, f"SPEAKER_{rng.randrange(4):02d}"))
+    turns.append(turns[0][:2] + ("SPEAKER_09",))  # Same start, tie on overlap.
+    diarize_df = pd.DataFrame(turns, columns=["start", "end", "speaker"])
+
+    def transcript():
+        segments = []
+        position = 0.0
+        while position < 620:
+            words = []
+            for _ in range(rng.randrange(0, 12)):
+                word_start = round(position, 3)
+                position += rng.choice([0.0, rng.uniform(0.05, 1.5)])
+                word = {"word": "w", "start": word_start, "end": round(position, 3)}
+                if rng.random() < 0.05:
+                    del word["end"]
+                if rng.random() < 0.05:
+                    word = {"word": "7"}
+                words.append(word)
+            segment = {"start": round(position - 5, 3), "end": round(position, 3)}
+            if rng.random() < 0.1:
+                segment["speaker"] = "PREVIOUS"
+            segments.append(dict(segment, words=words))
+            position += rng.uniform(0, 3)
+        return {"segments": segments}
+
+    result, translation = transcript(), transcript()
+    expected = [
+        assign_word_speakers(diarize_df, copy.deepcopy(item))
+        for item in (result, translation)
+    ]
+    assign_speakers(diarize_df, result, translation)
+    assert [result, translation] == expected
+
+    empty = {"segments": [{"start": 0.0, "end": 1.0}]}
+    assign_speakers(diarize_df.iloc[:0], empty)
+    assert "speaker" not in empty["segments"][0]
+
+
+# --- Result Transfer Tests ---
+
+
+def test_subprocess_result_over_pipe_and_result_file(monkeypatch):
+    import subprocess
+    import sys
+
+    from subprocesses import subprocess_handler
+
+    # A result larger than the pipe buffer, built in the child.
+    result = {"segments": [{"text": "x" * 1000, "start": i} for i in range(500)]}
+    code = (
+        "import sys; from subprocesses.ipc import write_result; "
+        "print('progress', file=sys.stderr); write_result("
+        '{"segments": [{"text": "x" * 1000, "start": i} for i in range(500)]}, '
+        "sys.stdout.buffer)"
+    )
+    for mode in ("pipe", "mmap"):
+        monkeypatch.setattr(subprocess_handler, "result_transfer", mode)
+        with subprocess_handler.result_channel() as result_path:
+            process = subprocess.Popen(
+                [sys.executable, "-c", code],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                env=subprocess_handler.result_env(None, result_path),
+            )
+            stdout_data, stderr_data = subprocess_handler.stream_subprocess_output(
+                process, "Test"
+            )
+            assert (result_path is None) == (mode == "pipe")
+            assert bytes(stderr_data) == b"progress\n"
+            assert bool(stdout_data) == (mode == "pipe")
+            assert subprocess_handler.load_result(stdout_data, result_path) == result
+
+
+# --- Segment Streaming Tests ---
+
+
+def test_stream_whisper_segments_yields_frames_before_result(monkeypatch):
+    import sys
+
+    from subprocesses import subprocess_handler
+
+    # Stand-in for the Whisper subprocess: two window frames, then the result.
+    code = (
+        "import sys, time\n"
+        "from subprocesses.ipc import segment_channel, write_frame, write_result\n"
+        "frames = segment_channel()\n"
+        "for start in (0, 600):\n"
+        "    write_frame(frames, {'start': start, 'segments': [{'text': str(start)}]})\n"
+        "    print('window done', file=sys.stderr)\n"
+        "time.sleep(0.2)\n"
+        "write_result({'segments': ['all']}, sys.stdout.buffer)\n"
+    )
+    monkeypatch.setattr(
+        subprocess_handler, "whisper_command", lambda paths: [sys.executable, "-c", code]
+    )
+
+    stream = subprocess_handler.stream_whisper_segments("interview.wav")
+    assert next(stream)["segments"] == [{"text": "0"}]
+    assert next(stream)["start"] == 600
+    with pytest.raises(StopIteration) as done:
+        next(stream)
+    assert done.value.value == {"segments": ["all"]}
+
+
+# --- Event Channel Tests ---
+
+
+def test_event_channel_feeds_stage_metrics_and_llm_speed(caplog):
+    import logging
+    import subprocess
+    import sys
+
+    from subprocesses.events import EventReader
+    from utils.stats import ProcessInfo
+
+    code = (
+        "from subprocesses import events\n"
+        "events.open_channel('llm')\n"
+        "with events.stage('summary'):\n"
+        "    for percent in (10, 30, 35, 60, 100):\n"
+        "        events.progress('summary', percent)\n"
+        "    events.emit('llm_completion', prompt_tokens=900, completion_tokens=120,\n"
+        "                seconds=4.0, tokens_per_second=30.0)\n"
+        "print('not an event')\n"
+    )
+    reader = EventReader("LLM")
+    try:
+        process = subprocess.Popen(
+            [sys.executable, "-c", code],
+            stdout=subprocess.DEVNULL,
+            env=reader.env(None),
+            pass_fds=(reader.write_fd,),
+        )
+    finally:
+        reader.start()
+    with caplog.at_level(logging.INFO, logger="asr-transcribe"):
+        process.wait()
+        reader.close()
+
+    [record] = reader.stage_metrics()
+    assert record["stage"] == "summary" and record["process"] == "llm"
+    assert reader.llm_completions[0]["tokens_per_second"] == 30.0
+    process_info = ProcessInfo("interview.wav")
+    process_info.add_stage_metrics(reader.stage_metrics())
+    assert process_info.stage_metrics[0].process == "llm"
+
+    # Progress is logged once per 25% step.
+    progress = [message for message in caplog.messages if message.endswith("%")]
+    assert progress == [f"[LLM] summary {percent}%" for percent in (10, 30, 60, 100)]
+
+
+def test_whisper_peak_rss_comes_from_the_exit_event(monkeypatch):
+    import sys
+
+    from subprocesses import subprocess_handler
+
+    # Stand-in for the Whisper subprocess: reports its peak on exit.
+    code = (
+        "import sys\n"
+        "from subprocesses import events\n"
+        "from subprocesses.ipc import write_result\n"
+        "events.open_channel('whisper')\n"
+        "write_result({'segments': []}, sys.stdout.buffer)\n"
+        "events.emit('exit', peak_rss_mb=123456.0)\n"
+    )
+    monkeypatch.setattr(
+        subprocess_handler, "whisper_command", lambda paths: [sys.executable, "-c", code]
+    )
+    monkeypatch.setattr(subprocess_handler, "memory_limit_mb", 0)
+
+    result, peak_rss_mb = subprocess_handler.run_whisper_process(["interview.wav"], {})
+
+    assert result == {"segments": []}
+    assert peak_rss_mb == 123456.0
+
+
+# --- Columnar Transcript Tests ---
+
+
+def test_columnar_transcript_round_trip_and_dict_views(tmp_path):
+    import pickle
+
+    from output.writers import _collect_pause_markers_per_segment, write_srt
+    from utils.transcript import ColumnarTranscript, pack_result, unpack_result
+
+    def result(text):
+        words = [
+            {"word": text, "start": 1.0, "end": 1.4, "score": 0.91, "speaker": "S1"},
+            {"word": "42"},  # not aligned
+            {"word": text, "start": 1.6, "end": 2.0, "score": None},
+        ]
+        segments = [
+            {"start": 1.0, "end": 2.0, "text": f"{text} 42 {text}", "words": words}
+            | {"avg_logprob": -0.2, "speaker": "S1"},
+            {"start": 2.5, "end": 3.0, "text": "ohne Wörter"},
+        ]
+        return {
+            "segments": segments,
+            "word_segments": list(words),
+            "language": "de",
+        }
+
+    original = result("Hallo") | {"translation_result": result("Hello")}
+    expected = copy.deepcopy(original)
+
+    packed = pack_result(original)
+    transcript = packed["segments"]
+    assert isinstance(transcript, ColumnarTranscript)
+    assert transcript.word_count == 3 and transcript.speakers() == ["S1"]
+    assert transcript.strings.add("Hallo") == transcript.word_text[0]
+
+    restored = unpack_result(pickle.loads(pickle.dumps(packed)))
+    assert restored == expected
+    assert list(restored["segments"][0]) == list(expected["segments"][0])
+    words = restored["segments"][0]["words"]
+    assert all(a is b for a, b in zip(words, restored["word_segments"]))
+
+    # The views read like the original dicts, e.g. for the writers.
+    segment = transcript.segments[0]
+    assert segment["speaker"] == "S1" and segment.get("missing") is None
+    assert segment["words"][1] == {"word": "42"}
+    assert "words" not in transcript.segments[-1]
+    write_srt(tmp_path / "dicts", expected["segments"])
+    write_srt(tmp_path / "columns", transcript.segments)
+    srt = (tmp_path / "dicts.srt").read_text(encoding="utf-8")
+    assert srt == (tmp_path / "columns.srt").read_text(encoding="utf-8")
+    assert _collect_pause_markers_per_segment(
+        transcript.segments, transcript.word_segments, gap_threshold=0.1
+    ) == _collect_pause_markers_per_segment(
+        expected["segments"], expected["word_segments"], gap_threshold=0.1
+    )
@@ -0,0 +1,139 @@
+"""
+Decoded audio shared through a memory-mapped file.
+An input is decoded once per job into a raw float32 file (16 kHz mono, the
+same samples `whisperx.load_audio` produces); transcription, alignment and
+diarization, in this or in other processes, map that file instead of holding
+their own copy. The page cache backs every mapping, so a multi-hour recording
+is resident once no matter how many consumers attach to it.
+"""
+
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+_READ_SIZE = 1 << 20
+
+
+def attach_audio(path: Path) -> np.ndarray:
+    """
+    Map a decoded-audio file as a float32 array without copying it.
+    The mapping is copy-on-write, so a consumer that modifies samples in place
+    gets private pages and never changes what other consumers see.
+    """
+    if os.path.getsize(path) == 0:
+        return np.zeros(0, dtype=np.float32)
+    return np.memmap(path, dtype=np.float32, mode="c")
+
+
+class AudioBuffer:
+    """
+    A decoded-audio file plus its mapping; removes the file on close when it
+    owns it. Use `AudioBuffer.decode(...)` as a context manager.
+    """
+
+    def __init__(self, path: Path, owner: bool = True):
+        self.path = Path(path)
+        self.owner = owner
+        self._array = None
+
+    @classmethod
+    def decode(cls, audio_path: str, directory: Optional[str] = None) -> "AudioBuffer":
+        """Decode `audio_path` with ffmpeg straight into a new buffer file."""
+        cmd = [
+            "ffmpeg",
+            "-nostdin",
+            "-threads",
+            "0",
+            "-i",
+            str(audio_path),
+            "-f",
+            "s16le",
+            "-ac",
+            "1",
+            "-acodec",
+            "pcm_s16le",
+            "-ar",
+            str(SAMPLE_RATE),
+            "-",
+        ]
+        with tempfile.TemporaryFile() as stderr:
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr)
+            try:
+                buffer = cls.from_pcm_stream(process.stdout, directory)
+            finally:
+                process.stdout.close()
+                returncode = process.wait()
+            if returncode != 0:
+                buffer.close()
+                stderr.seek(0)
+                raise RuntimeError(
+                    f"Failed to load audio: {stderr.read().decode(errors='replace')}"
+                )
+        return buffer
+
+    @classmethod
+    def from_pcm_stream(
+        cls, stream: BinaryIO, directory: Optional[str] = None
+    ) -> "AudioBuffer":
+        """
+        Convert a stream of 16-bit PCM samples chunk by chunk into a buffer
+        file, so the whole waveform is never held in memory at once.
+        """
+        fd, name = tempfile.mkstemp(prefix="asr-audio-", suffix=".f32", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as out:
+                leftover = b""
+                while True:
+                    chunk = stream.read(_READ_SIZE)
+                    if not chunk:
+                        break
+                    chunk = leftover + chunk
+                    usable = len(chunk) - len(chunk) % 2
+                    leftover = chunk[usable:]
+                    samples = np.frombuffer(chunk[:usable], np.int16)
+                    # Same conversion as whisperx.load_audio.
+                    out.write((samples.astype(np.float32) / 32768.0).tobytes())
+        except BaseException:
+            os.unlink(name)
+            raise
+        return cls(Path(name))
+
+    @property
+    def array(self) -> np.ndarray:
+        if self._array is None:
+            self._array = attach_audio(self.path)
+        return self._array
+
+    @property
+    def num_samples(self) -> int:
+        return os.path.getsize(self.path) // 4
+
+    @property
+    def seconds(self) -> float:
+        return self.num_samples / SAMPLE_RATE
+
+    def read(self, start: int, stop: int) -> np.ndarray:
+        """
+        Copy samples [start, stop) into a private array. Unlike slicing
+        `array`, this leaves no file pages mapped into the process, so windowed
+        processing stays bounded by the window size.
+        """
+        start = max(0, start)
+        count = max(0, min(stop, self.num_samples) - start)
+        return np.fromfile(self.path, dtype=np.float32, count=count, offset=start * 4)
+
+    def close(self) -> None:
+        self._array = None
+        if self.owner and self.path.exists():
+            self.path.unlink()
+
+    def __enter__(self) -> "AudioBuffer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
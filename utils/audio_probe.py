@@ -0,0 +1,64 @@
+"""
+Cheap audio duration probes that read container metadata instead of decoding
+the audio. Used for scheduling and for reporting audio length up front.
+"""
+
+import subprocess
+import wave
+from pathlib import Path
+from typing import Optional
+
+from config.logger import logger
+
+
+def probe_duration_seconds(path: Path) -> Optional[float]:
+    """
+    Return the duration of an audio file in seconds, or None if unknown.
+    WAV headers are read directly; everything else is asked from ffprobe.
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".wav":
+        duration = _probe_wav(path)
+        if duration is not None:
+            return duration
+    return _probe_ffprobe(path)
+
+
+def _probe_wav(path: Path) -> Optional[float]:
+    try:
+        with wave.open(str(path), "rb") as wav_file:
+            rate = wav_file.getframerate()
+            if rate <= 0:
+                return None
+            return wav_file.getnframes() / rate
+    except (wave.Error, EOFError, OSError):
+        return None
+
+
+def _probe_ffprobe(path: Path) -> Optional[float]:
+    try:
+        completed = subprocess.run(
+            [
+                "ffprobe",
+                "-v",
+                "error",
+                "-show_entries",
+                "format=duration",
+                "-of",
+                "default=noprint_wrappers=1:nokey=1",
+                str(path),
+            ],
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired) as e:
+        logger.debug("ffprobe unavailable for %s: %s", path.name, e)
+        return None
+
+    if completed.returncode != 0:
+        return None
+    try:
+        return float(completed.stdout.strip())
+    except ValueError:
+        return None
@@ -0,0 +1,122 @@
+"""
+Cross-file batching of short recordings.
+A 60 s clip yields only a few VAD segments, so transcribing it alone leaves
+most rows of each inference batch empty. Consecutive short files of the
+schedule are grouped, and the first file of a group that reaches the
+Whisper stage transcribes the whole group in one run with shared batches;
+the other files of the group then just pick up their results.
+"""
+
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from config.logger import logger
+
+
+class _ClipGroup:
+    def __init__(self, paths: List[Path]):
+        # Files of the group that have not taken (or discarded) their result.
+        self.paths = paths
+        self.run_lock = threading.Lock()
+        self.done = False
+        self.results: Dict[Path, Any] = {}
+
+
+class ClipBatcher:
+    """
+    Plans groups of short files and runs each group once, on demand.
+    `run_batch(paths)` returns one result per path; if it fails, the files
+    of the group are transcribed one by one (`result` returns None). So are
+    the files of a group that has shrunk to a single file before it ran.
+    """
+
+    def __init__(self, run_batch: Callable[[List[Path]], List[Any]], max_files: int):
+        self._run_batch = run_batch
+        self.max_files = max(1, max_files)
+        self._groups: Dict[Path, _ClipGroup] = {}
+        self._lock = threading.Lock()
+
+    def plan(self, paths: List[Path], is_clip: Callable[[Path], bool]) -> int:
+        """
+        Group runs of consecutive clips in `paths` (in processing order) into
+        groups of up to `max_files`. Returns the number of grouped files.
+        """
+        run = []
+        grouped = 0
+
+        def close_run():
+            nonlocal grouped
+            if len(run) > 1:
+                group = _ClipGroup(list(run))
+                with self._lock:
+                    for path in run:
+                        self._groups[path] = group
+                grouped += len(run)
+            run.clear()
+
+        for path in paths:
+            if not is_clip(path):
+                close_run()
+                continue
+            run.append(path)
+            if len(run) == self.max_files:
+                close_run()
+        close_run()
+        return grouped
+
+    def result(self, path: Path) -> Optional[Any]:
+        """
+        The result of a grouped file, running its group if no other file of
+        the group has yet. None if the file is not grouped, the group failed
+        or it is the only file left in its group.
+        """
+        with self._lock:
+            group = self._groups.get(path)
+        if group is None:
+            return None
+        with group.run_lock:
+            if not group.done:
+                with self._lock:
+                    paths = list(group.paths)
+                results = {}
+                # A file left alone in its group has nothing to share batches with.
+                if len(paths) > 1:
+                    try:
+                        results = dict(zip(paths, self._run_batch(paths)))
+                    except Exception as e:
+                        logger.warning(
+                            "Shared transcription of %d short files failed (%s); "
+                            "transcribing them one by one.",
+                            len(paths),
+                            e,
+                        )
+                with self._lock:
+                    group.done = True
+                    # Files discarded while the batch ran keep no result.
+                    group.results = {
+                        member: result
+                        for member, result in results.items()
+                        if member in group.paths
+                    }
+        with self._lock:
+            self._forget(group, path)
+            return group.results.pop(path, None)
+
+    def discard(self, path: Path) -> None:
+        """
+        Take a grouped file out of its group because it will not ask for its
+        result (e.g. it was cached or failed before): it is left out of the
+        group's run, or its result is dropped if the group already ran.
+        """
+        with self._lock:
+            group = self._groups.get(path)
+            if group is not None:
+                self._forget(group, path)
+                group.results.pop(path, None)
+
+    def _forget(self, group: _ClipGroup, path: Path) -> None:
+        # Called with self._lock held.
+        self._groups.pop(path, None)
+        if path in group.paths:
+            group.paths.remove(path)
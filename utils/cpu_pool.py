@@ -0,0 +1,99 @@
+"""
+CPU pool for running several Whisper workers side by side on CPU nodes.
+The available cores are split into one contiguous partition per worker slot;
+each Whisper subprocess gets an explicit thread count for its partition and,
+optionally, is pinned to those cores.
+"""
+
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+from config.app_config import get_config
+
+config = get_config()
+
+# Environment variables read by the Whisper subprocess.
+OVERRIDES_ENV = "ASR_WHISPER_OVERRIDES"
+AFFINITY_ENV = "ASR_WHISPER_CPUS"
+
+
+def available_cores() -> List[int]:
+    """Cores this process may run on (respects cgroup/taskset restrictions)."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def partition_cores(cores: List[int], parts: int) -> List[List[int]]:
+    """Split cores into `parts` contiguous, near-equal partitions."""
+    parts = max(1, min(parts, len(cores)))
+    size, remainder = divmod(len(cores), parts)
+    partitions = []
+    start = 0
+    for index in range(parts):
+        end = start + size + (1 if index < remainder else 0)
+        partitions.append(cores[start:end])
+        start = end
+    return partitions
+
+
+class CorePool:
+    """
+    Assigns each calling thread (one per concurrent Whisper job) a fixed
+    slot with its own core partition, so a thread's persistent worker always
+    runs on the same cores.
+    """
+
+    def __init__(self, size: int, pin: bool = False, cores: Optional[List[int]] = None):
+        self.partitions = partition_cores(cores or available_cores(), size)
+        self.pin = pin
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._next_slot = 0
+
+    @property
+    def size(self) -> int:
+        return len(self.partitions)
+
+    def slot_for_current_thread(self) -> int:
+        slot = getattr(self._local, "slot", None)
+        if slot is None:
+            with self._lock:
+                slot = self._next_slot % self.size
+                self._next_slot += 1
+            self._local.slot = slot
+        return slot
+
+    def env_for_slot(self, slot: int) -> Dict[str, str]:
+        """Environment for a Whisper subprocess running in `slot`."""
+        cores = self.partitions[slot]
+        threads = str(len(cores))
+        env = dict(os.environ)
+        env[OVERRIDES_ENV] = json.dumps(
+            {**json.loads(env.get(OVERRIDES_ENV) or "{}"), "thread_count": len(cores)}
+        )
+        # Keep OpenMP/MKL (torch alignment + diarization) inside the partition too.
+        env["OMP_NUM_THREADS"] = threads
+        env["MKL_NUM_THREADS"] = threads
+        if self.pin:
+            env[AFFINITY_ENV] = ",".join(str(core) for core in cores)
+        return env
+
+
+_cpu_pool = None
+_cpu_pool_lock = threading.Lock()
+
+
+def get_cpu_pool() -> Optional[CorePool]:
+    """Return the configured CPU pool, or None if pool mode is off."""
+    global _cpu_pool
+    whisper_config = config["whisper"]
+    size = whisper_config.get("cpu_pool_size", 1) or 1
+    if size <= 1 or whisper_config.get("device") != "cpu":
+        return None
+    with _cpu_pool_lock:
+        if _cpu_pool is None:
+            _cpu_pool = CorePool(size, pin=whisper_config.get("cpu_affinity", False))
+    return _cpu_pool
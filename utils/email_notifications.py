@@ -16,6 +16,7 @@ from config.app_config import (
     bag_config_html,
 )
 from config.logger import logger
+from utils.stats import format_realtime_factor, format_stage_breakdown
 
 computer_host_name = socket.gethostname()
 computer_host_ip = socket.gethostbyname(computer_host_name)
@@ -95,11 +96,26 @@ def send_success_email(stats, warning_count, warning_audio_inputs):
             + f"{process_info.formatted_audio_length()}, "
         )
         email_body += f"took {process_info.formatted_process_duration()}, rtf "
-        email_body += "{:.2f}".format(process_info.realtime_factor())
+        email_body += format_realtime_factor(process_info.realtime_factor())
+        stage_metrics = getattr(process_info, "stage_metrics", None)
+        if stage_metrics:
+            email_body += "<br>Stages: " + format_stage_breakdown(stage_metrics)
         email_body += "</li>"
 
     email_body += "</ul><br>"
 
+    all_stage_metrics = [
+        entry
+        for process_info in stats
+        for entry in getattr(process_info, "stage_metrics", None) or []
+    ]
+    if all_stage_metrics:
+        email_body += (
+            "<b>Stage totals:</b> "
+            + format_stage_breakdown(all_stage_metrics)
+            + "<br><br>"
+        )
+
     if warning_count > 0:
         email_body += (
             "<b>Number of hallucination warnings:</b> " + str(warning_count) + "<br>"
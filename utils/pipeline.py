@@ -0,0 +1,109 @@
+"""
+Staged pipeline with bounded queues between stages.
+Every stage runs in its own pool of worker threads and hands items to the next
+stage as soon as they are done, so different files can be in different stages
+at the same time. The heavy lifting happens in subprocesses (Whisper, LLM), so
+threads are enough to keep those stages busy concurrently.
+"""
+
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, List
+
+from config.logger import logger
+
+# Marks the end of the item stream on a queue; one is sent per consumer thread.
+_STOP = object()
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    func: Callable[[Any], Any]
+    workers: int = 1
+
+
+class StagedPipeline:
+    """
+    Runs items through a chain of stages connected by bounded queues.
+
+    A stage function receives the item produced by the previous stage and
+    returns the item for the next one. Returning None (or raising) drops the
+    item from the pipeline. The queue bound applies backpressure, so a slow
+    stage stops upstream stages from running arbitrarily far ahead.
+    """
+
+    def __init__(self, stages: List[Stage], queue_size: int = 2):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage.")
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+
+    def run(self, items: Iterable[Any]) -> None:
+        """
+        Feed all items through the pipeline and block until it has drained.
+        If iterating `items` raises, the items fed so far are still finished
+        before the exception is passed on.
+        """
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        threads = []
+
+        for index, stage in enumerate(self.stages):
+            next_queue = queues[index + 1] if index + 1 < len(queues) else None
+            next_workers = (
+                max(1, self.stages[index + 1].workers) if next_queue else 0
+            )
+            remaining = [max(1, stage.workers)]
+            lock = threading.Lock()
+
+            for worker_index in range(remaining[0]):
+                thread = threading.Thread(
+                    target=self._worker,
+                    args=(
+                        stage,
+                        queues[index],
+                        next_queue,
+                        next_workers,
+                        remaining,
+                        lock,
+                    ),
+                    name=f"{stage.name}-{worker_index + 1}",
+                    daemon=True,
+                )
+                thread.start()
+                threads.append(thread)
+
+        try:
+            for item in items:
+                queues[0].put(item)
+        finally:
+            for _ in range(max(1, self.stages[0].workers)):
+                queues[0].put(_STOP)
+            for thread in threads:
+                thread.join()
+
+    @staticmethod
+    def _worker(stage, in_queue, out_queue, out_workers, remaining, lock):
+        while True:
+            item = in_queue.get()
+            if item is _STOP:
+                break
+            try:
+                result = stage.func(item)
+            except Exception as e:
+                logger.error(
+                    "Pipeline stage '%s' failed: %s", stage.name, e, exc_info=True
+                )
+                result = None
+            if result is not None and out_queue is not None:
+                out_queue.put(result)
+
+        # The last worker of a stage to finish passes the shutdown downstream,
+        # after every item of this stage has been forwarded.
+        with lock:
+            remaining[0] -= 1
+            last_worker = remaining[0] == 0
+        if last_worker and out_queue is not None:
+            for _ in range(out_workers):
+                out_queue.put(_STOP)
@@ -0,0 +1,47 @@
+"""
+Batch scheduling helpers.
+Jobs are ordered longest-first (LPT), which keeps one long recording at the
+end of the list from stretching the batch while other workers sit idle.
+"""
+
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from utils.audio_probe import probe_duration_seconds
+
+
+def probe_durations(
+    paths: List[Path],
+    probe: Callable[[Path], Optional[float]] = probe_duration_seconds,
+    max_workers: int = 8,
+) -> Dict[Path, Optional[float]]:
+    """Probe the durations of all paths concurrently (metadata only)."""
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(paths, executor.map(probe, paths)))
+
+
+def order_longest_first(
+    paths: List[Path], costs: Dict[Path, Optional[float]]
+) -> List[Path]:
+    """
+    Sort paths by descending cost. Paths without a known cost keep their
+    relative (name) order and are scheduled after all known ones.
+    """
+    known = [path for path in paths if costs.get(path) is not None]
+    unknown = [path for path in paths if costs.get(path) is None]
+    known.sort(key=lambda path: costs[path], reverse=True)
+    return known + unknown
+
+
+def estimate_makespan(costs: List[float], workers: int) -> float:
+    """
+    Simulate list scheduling of `costs` (in the given order) onto `workers`
+    identical workers and return the time at which the last job finishes.
+    """
+    loads = [0.0] * max(1, workers)
+    heapq.heapify(loads)
+    for cost in costs:
+        heapq.heappush(loads, heapq.heappop(loads) + cost)
+    return max(loads)
@@ -0,0 +1,76 @@
+"""
+Speaker assignment for transcripts, replacing `whisperx.assign_word_speakers`.
+whisperx queries its turn index once per segment and word, and each query
+scans all turns that start before the queried span, so long recordings
+(tens of thousands of words, thousands of turns) spend minutes here.
+This module sorts the turns once and assigns segments and words of any
+number of results in one sweep, keeping only the turns that can still
+overlap the next span.
+
+The output matches whisperx 3.8.5 exactly: per speaker the intersections
+are summed in turn order, the largest sum wins (first speaker on ties),
+words without a start are skipped and spans without overlap keep their
+previous speaker, if any.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+def _spans(results) -> List[tuple]:
+    """(start, end, item) for every segment and timed word, in result order."""
+    spans = []
+    for result in results:
+        for segment in result.get("segments", []):
+            spans.append((segment.get("start", 0.0), segment.get("end", 0.0), segment))
+            for word in segment.get("words", ()):
+                if "start" not in word:
+                    continue
+                spans.append((word["start"], word.get("end", word["start"]), word))
+    return spans
+
+
+def assign_speakers(
+    diarize_df,
+    *results: Dict[str, Any],
+    speaker_embeddings: Optional[Dict[str, List[float]]] = None,
+) -> None:
+    """
+    Set the dominant speaker on the segments and words of `results`
+    (in place) from the diarization turns in `diarize_df`.
+    """
+    if diarize_df is None or len(diarize_df) == 0:
+        return
+    order = np.argsort(diarize_df["start"].to_numpy(dtype=np.float64), kind="stable")
+    starts = diarize_df["start"].to_numpy(dtype=np.float64)[order].tolist()
+    ends = diarize_df["end"].to_numpy(dtype=np.float64)[order].tolist()
+    speakers = diarize_df["speaker"].to_numpy()[order].tolist()
+
+    spans = _spans(results)
+    spans.sort(key=lambda span: span[0])
+    active: List[int] = []  # Turns that started, in turn order.
+    next_turn = 0
+    for start, end, item in spans:
+        # Spans come by start, so a turn ending before this one never overlaps again.
+        active = [turn for turn in active if ends[turn] > start]
+        while next_turn < len(starts) and starts[next_turn] < end:
+            if ends[next_turn] > start:
+                active.append(next_turn)
+            next_turn += 1
+
+        totals: Dict[str, float] = {}
+        for turn in active:
+            if starts[turn] >= end:
+                continue
+            intersection = min(ends[turn], end) - max(starts[turn], start)
+            if intersection > 0:
+                speaker = speakers[turn]
+                totals[speaker] = totals.get(speaker, 0.0) + intersection
+        if totals:
+            item["speaker"] = max(totals.items(), key=lambda total: total[1])[0]
+
+    if speaker_embeddings is not None:
+        for result in results:
+            if result.get("segments"):
+                result["speaker_embeddings"] = speaker_embeddings
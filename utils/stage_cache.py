@@ -0,0 +1,234 @@
+"""
+Content-addressed on-disk cache for the results of the processing stages.
+
+Every stage key is derived from the key of the stage before it plus a
+fingerprint of the config values the stage depends on; the first key starts
+from the SHA-256 of the audio content. Changing e.g. only the LLM prompts
+therefore keeps the Whisper and post-processing keys stable, and only the LLM
+stage (and the writers, which always run) is recomputed.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+from functools import lru_cache
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from config.app_config import get_config
+from config.logger import logger
+
+config = get_config()
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PROMPTS_DIR = REPO_ROOT / "llm_workflows" / "prompts"
+
+# Config values each stage depends on, as (section, key) pairs. Keys that only
+# influence speed or resource usage (thread_count, workers, ...) are left out.
+STAGE_CONFIG_KEYS = {
+    "whisper": [
+        ("whisper", "model"),
+        ("whisper", "device"),
+        ("whisper", "compute_type"),
+        ("whisper", "beam_size"),
+        ("whisper", "language"),
+        ("whisper", "translation_enabled"),
+        ("whisper", "translation_target_language"),
+        ("whisper", "translation_model"),
+        ("whisper", "shared_translation_pass"),
+        ("whisper", "use_initial_prompt"),
+        ("whisper", "initial_prompt"),
+        ("whisper", "use_speaker_diarization"),
+        ("whisper", "min_speakers"),
+        ("whisper", "max_speakers"),
+        ("whisper", "no_repeat_ngram_size"),
+        ("whisper", "repetition_penalty"),
+        ("whisper", "streaming_window_seconds"),
+        ("whisper", "chunk_workers"),
+    ],
+    "postprocess": [
+        ("whisper", "max_sentence_length"),
+        ("whisper", "use_speaker_diarization"),
+    ],
+    "llm": [
+        ("llm_meta", "use_summarization"),
+        ("llm_meta", "use_toc"),
+        ("llm_meta", "llm_languages"),
+        ("summarization", "sum_model_path"),
+        ("summarization", "sum_model_config"),
+        ("toc", "toc_model_path"),
+        ("toc", "toc_model_config"),
+        ("translation", "translation_model_path"),
+        ("translation", "translation_model_config"),
+    ],
+}
+
+# Libraries whose upgrades can change a stage's results; their installed
+# versions are part of the stage's key.
+STAGE_PACKAGES = {
+    "whisper": ("whisperx", "faster-whisper", "ctranslate2", "pyannote.audio"),
+}
+DIARIZATION_PACKAGES = ("pyannote.audio", "whisperx")
+
+_audio_hash_memo = {}
+_audio_hash_lock = threading.Lock()
+
+
+def audio_content_hash(path: Path) -> str:
+    """SHA-256 of the file content, memoised per (path, size, mtime)."""
+    path = Path(path)
+    stat = path.stat()
+    memo_key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    with _audio_hash_lock:
+        if memo_key in _audio_hash_memo:
+            return _audio_hash_memo[memo_key]
+
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    value = digest.hexdigest()
+
+    with _audio_hash_lock:
+        _audio_hash_memo[memo_key] = value
+    return value
+
+
+def config_fingerprint(stage: str) -> str:
+    """Hash of the config values (and, for the LLM, prompt files) of a stage."""
+    values = {
+        f"{section}.{key}": config.get(section, {}).get(key)
+        for section, key in STAGE_CONFIG_KEYS[stage]
+    }
+    if stage == "llm":
+        values["files"] = _files_fingerprint(_llm_input_files())
+    if stage in STAGE_PACKAGES:
+        values["packages"] = package_versions(STAGE_PACKAGES[stage])
+    return _sha256(json.dumps(values, sort_keys=True, default=str))
+
+
+@lru_cache(maxsize=None)
+def package_versions(packages: Tuple[str, ...]) -> Dict[str, Optional[str]]:
+    """Installed version of each package (None if it is not installed)."""
+    versions = {}
+    for package in packages:
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    return versions
+
+
+def stage_key(parent_key: str, stage: str) -> str:
+    """Chain a stage's config fingerprint onto the key of the stage before it."""
+    return _sha256(f"{parent_key}\0{stage}\0{config_fingerprint(stage)}")
+
+
+def build_stage_keys(audio_path: Path) -> Dict[str, str]:
+    """Return the cache keys for all cached stages of one audio file."""
+    whisper_key = stage_key(audio_content_hash(audio_path), "whisper")
+    postprocess_key = stage_key(whisper_key, "postprocess")
+    llm_key = stage_key(postprocess_key, "llm")
+    return {"whisper": whisper_key, "postprocess": postprocess_key, "llm": llm_key}
+
+
+def diarization_key(
+    audio_path: Path,
+    min_speakers: Optional[int],
+    max_speakers: Optional[int],
+    model_name: str,
+) -> str:
+    """
+    Cache key of the diarization (speaker turns) of one audio file: the
+    audio, speaker bounds, diarization model and library versions. It does
+    not depend on any Whisper setting, so turns survive model/prompt changes.
+    """
+    values = {
+        "audio": audio_content_hash(audio_path),
+        "min_speakers": min_speakers,
+        "max_speakers": max_speakers,
+        "model": model_name,
+        "packages": package_versions(DIARIZATION_PACKAGES),
+    }
+    return _sha256(json.dumps(values, sort_keys=True))
+
+
+def _llm_input_files() -> Iterable[Path]:
+    files = sorted(PROMPTS_DIR.rglob("*.md"))
+    for section, key in (
+        ("summarization", "sum_model_config"),
+        ("toc", "toc_model_config"),
+        ("translation", "translation_model_config"),
+    ):
+        config_path = config.get(section, {}).get(key)
+        if config_path:
+            path = Path(config_path).expanduser()
+            if not path.is_absolute():
+                path = REPO_ROOT / path
+            files.append(path)
+    return files
+
+
+def _files_fingerprint(paths: Iterable[Path]) -> Dict[str, Optional[str]]:
+    result = {}
+    for path in paths:
+        try:
+            result[str(path)] = _sha256(path.read_bytes())
+        except OSError:
+            result[str(path)] = None
+    return result
+
+
+def _sha256(data) -> str:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+class StageCache:
+    """Pickle files under <root>/<stage>/<key[:2]>/<key>.pkl; disabled without root."""
+
+    def __init__(self, root: Optional[Path]):
+        self.root = Path(root).expanduser() if root else None
+
+    @property
+    def enabled(self) -> bool:
+        return self.root is not None
+
+    def path_for(self, stage: str, key: str) -> Path:
+        return self.root / stage / key[:2] / f"{key}.pkl"
+
+    def get(self, stage: str, key: str) -> Any:
+        """Return the cached value, or None if missing or unreadable."""
+        if not self.enabled:
+            return None
+        path = self.path_for(stage, key)
+        if not path.exists():
+            return None
+        try:
+            with path.open("rb") as handle:
+                return pickle.load(handle)
+        except Exception as e:
+            logger.warning("Ignoring unreadable cache entry %s: %s", path, e)
+            return None
+
+    def put(self, stage: str, key: str, value: Any) -> None:
+        """Store a value atomically (write to a temp file, then rename)."""
+        if not self.enabled:
+            return
+        path = self.path_for(stage, key)
+        tmp_name = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as handle:
+                pickle.dump(value, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, path)
+        except Exception as e:
+            logger.warning("Could not write cache entry %s: %s", path, e)
+            if tmp_name and os.path.exists(tmp_name):
+                os.unlink(tmp_name)
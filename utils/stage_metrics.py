@@ -0,0 +1,106 @@
+"""
+Per-stage wall time, CPU time and peak RSS of a file's processing.
+
+A stage function runs inside `collect_stage_metrics(sink)`; every
+`stage_timer(...)` block entered by the same thread then appends one
+StageMetrics record to that sink. Outside a collector the timers are no-ops,
+so library code (writers, bag helpers) can be instrumented unconditionally.
+The Whisper subprocess collects its own records and returns them with the
+result, tagged with `process="whisper"`.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List
+
+_collector = threading.local()
+
+
+@dataclass
+class StageMetrics:
+    stage: str
+    wall_seconds: float
+    cpu_seconds: float
+    peak_rss_mb: float
+    process: str = "main"
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@contextmanager
+def collect_stage_metrics(sink: List[StageMetrics]):
+    """Send the records of stage timers in this thread to `sink`."""
+    previous = getattr(_collector, "sink", None)
+    _collector.sink = sink
+    try:
+        yield sink
+    finally:
+        _collector.sink = previous
+
+
+def record_stage_metrics(entries: Iterable[StageMetrics]) -> None:
+    """Add records measured elsewhere (e.g. in a helper process) to the collector."""
+    sink = getattr(_collector, "sink", None)
+    if sink is not None:
+        sink.extend(entries)
+
+
+@contextmanager
+def stage_timer(
+    stage: str,
+    process: str = "main",
+    cpu_clock: Callable[[], float] = time.thread_time,
+):
+    """
+    Measure the enclosed block as one stage.
+    CPU time defaults to the calling thread's, which stays correct when
+    several files are processed by parallel threads; single-job subprocesses
+    pass `time.process_time` to include their native worker threads.
+    Peak RSS is the process high-water mark if the stage raised it, otherwise
+    the larger of the RSS at start and end of the stage.
+    """
+    sink = getattr(_collector, "sink", None)
+    if sink is None:
+        yield
+        return
+
+    # Imported here because utils.utilities itself uses the stage timers.
+    from utils.utilities import get_peak_rss_mb, get_rss_mb
+
+    start_peak = get_peak_rss_mb()
+    start_rss = get_rss_mb()
+    start_wall = time.perf_counter()
+    start_cpu = cpu_clock()
+    try:
+        yield
+    finally:
+        wall_seconds = time.perf_counter() - start_wall
+        cpu_seconds = cpu_clock() - start_cpu
+        end_peak = get_peak_rss_mb()
+        if end_peak > start_peak:
+            peak_rss_mb = end_peak
+        else:
+            peak_rss_mb = max(start_rss, get_rss_mb())
+        sink.append(
+            StageMetrics(stage, wall_seconds, cpu_seconds, peak_rss_mb, process)
+        )
+
+
+class MetricsLog:
+    """JSON-lines file with one record per processed (or failed) file."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as metrics_file:
+                metrics_file.write(line + "\n")
@@ -1,6 +1,52 @@
+from typing import Any, Dict, Iterable, List
+
+from utils.stage_metrics import StageMetrics
 from utils.utilities import format_timestamp
 
 
+def stage_label(metrics: StageMetrics) -> str:
+    "Stage name, prefixed with the subprocess it ran in."
+    if metrics.process == "main":
+        return metrics.stage
+    return f"{metrics.process}.{metrics.stage}"
+
+
+def stage_totals(metrics: Iterable[StageMetrics]) -> List[StageMetrics]:
+    """
+    Sum wall and CPU time per stage (keeping first-seen order); peak RSS is
+    the maximum over all runs of the stage.
+    """
+    totals = {}
+    for entry in metrics:
+        key = (entry.process, entry.stage)
+        total = totals.get(key)
+        if total is None:
+            totals[key] = StageMetrics(**entry.as_dict())
+        else:
+            total.wall_seconds += entry.wall_seconds
+            total.cpu_seconds += entry.cpu_seconds
+            total.peak_rss_mb = max(total.peak_rss_mb, entry.peak_rss_mb)
+    return list(totals.values())
+
+
+def format_stage_breakdown(metrics: Iterable[StageMetrics]) -> str:
+    "Returns a one-line summary like 'whisper.align 12.3s (cpu 40.1s, 2100 MB)'."
+    return ", ".join(
+        "{} {:.1f}s (cpu {:.1f}s, {:.0f} MB)".format(
+            stage_label(entry),
+            entry.wall_seconds,
+            entry.cpu_seconds,
+            entry.peak_rss_mb,
+        )
+        for entry in stage_totals(metrics)
+    )
+
+
+def format_realtime_factor(rtf) -> str:
+    "Returns a real time factor with two decimals, or 'n/a' if there is none."
+    return "n/a" if rtf is None else "{:.2f}".format(rtf)
+
+
 class ProcessInfo:
     """
     Stores information about the transcription process.
@@ -8,6 +54,40 @@ class ProcessInfo:
 
     def __init__(self, filename, start=0, end=0):
         self.filename = filename
+        self.audio_length = None
+        self.stage_metrics: List[StageMetrics] = []
+        # Whisper runs of this file ({"rung", "status", "peak_rss_mb"}); more
+        # than one if earlier runs ran out of memory.
+        self.whisper_attempts: List[Dict[str, Any]] = []
+        # Speech duration measured by the VAD prepass, if it ran.
+        self.speech_seconds = None
+        # Token counts and speed of each LLM completion (from the event channel).
+        self.llm_completions: List[Dict[str, Any]] = []
+
+    def add_stage_metrics(self, records: Iterable[Dict[str, Any]]):
+        "Adds stage records reported by a subprocess (as plain dicts)."
+        self.stage_metrics.extend(StageMetrics(**record) for record in records)
+
+    def formatted_stage_breakdown(self):
+        "Returns the per-stage wall time, CPU time and peak RSS as one line."
+        return format_stage_breakdown(self.stage_metrics)
+
+    def metrics_record(self, status: str) -> Dict[str, Any]:
+        "Returns the JSON-serialisable metrics of this file for the metrics log."
+        start = getattr(self, "start", None)
+        end = getattr(self, "end", None)
+        return {
+            "file": self.filename,
+            "status": status,
+            "start": start.isoformat(timespec="seconds") if start else None,
+            "end": end.isoformat(timespec="seconds") if end else None,
+            "audio_length": self.audio_length,
+            "speech_seconds": self.speech_seconds,
+            "process_duration": self.process_duration() if start and end else None,
+            "stages": [entry.as_dict() for entry in self.stage_metrics],
+            "whisper_attempts": self.whisper_attempts,
+            "llm_completions": self.llm_completions,
+        }
 
     def process_duration(self):
         "Return process duration in seconds."
@@ -23,6 +103,8 @@ class ProcessInfo:
 
     def formatted_audio_length(self):
         "Returns formatted length of audio file."
+        if self.audio_length is None:
+            return "unknown length"
         formatted_time, _ = format_timestamp(self.audio_length)
         formatted_seconds = "{:.1f}s".format(self.audio_length)
         return f"{formatted_time} ({formatted_seconds})"
@@ -30,8 +112,11 @@ class ProcessInfo:
     def realtime_factor(self):
         """
         Calculate the real time factor for processing an audio file,
-        i.e. the ratio of process duration and audio length.
+        i.e. the ratio of process duration and audio length. None if the
+        audio length is unknown or zero (e.g. an empty file without speech).
         """
+        if not self.audio_length:
+            return None
         return self.process_duration() / self.audio_length
 
     def __str__(self):
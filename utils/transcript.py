@@ -0,0 +1,349 @@
+"""
+Columnar in-memory form of an aligned transcript.
+A whisperx result is a list of segment dicts, each with a list of word
+dicts; a long interview means hundreds of thousands of small dicts, each
+repeating its keys. ColumnarTranscript keeps the same data as numpy columns
+(start/end/score/speaker id per word and per segment), an interned string
+table for words, texts and speakers, and per segment the range of its words.
+
+`segments` and `word_segments` are read-only views whose items behave like
+the original dicts (`seg["start"]`, `seg.get("speaker")`, `seg["words"]`),
+so code reading segments keeps working; `to_segments` rebuilds plain dicts.
+Missing keys stay missing: NaN / -1 in a column means the key was absent.
+Keys the columns do not cover (e.g. "avg_logprob", "chars") are kept per
+item as they are.
+"""
+
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+_NO_ID = -1
+
+
+class StringTable:
+    """Each distinct string once; items refer to it by index."""
+
+    def __init__(self, strings: Optional[List[str]] = None):
+        self.strings: List[str] = list(strings or [])
+        self._ids = {string: index for index, string in enumerate(self.strings)}
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    def __getitem__(self, index: int) -> str:
+        return self.strings[index]
+
+    def add(self, string: Optional[str]) -> int:
+        if string is None:
+            return _NO_ID
+        index = self._ids.get(string)
+        if index is None:
+            index = self._ids[string] = len(self.strings)
+            self.strings.append(string)
+        return index
+
+    def __getstate__(self):
+        return self.strings
+
+    def __setstate__(self, strings):
+        self.__init__(strings)
+
+
+def _number(value) -> float:
+    return np.nan if value is None else float(value)
+
+
+def _split(item: Dict[str, Any], columns: Tuple[str, ...]) -> Optional[dict]:
+    """
+    Keys of `item` that do not fit the columns: other keys, and values that
+    are not numbers/strings (e.g. an explicit None), which the columns would
+    turn into a missing key.
+    """
+    extra = {}
+    for key, value in item.items():
+        if key not in columns:
+            extra[key] = value
+        elif key in ("start", "end", "score") and not isinstance(value, (int, float)):
+            extra[key] = value
+        elif key in ("word", "text", "speaker") and not isinstance(value, str):
+            extra[key] = value
+    return extra or None
+
+
+WORD_COLUMNS = ("word", "start", "end", "score", "speaker")
+SEGMENT_COLUMNS = ("start", "end", "text", "words", "speaker")
+
+
+class ColumnarTranscript:
+    """Segments and words of an aligned transcript as columns, see module doc."""
+
+    def __init__(self):
+        self.strings = StringTable()
+        self.segment_start = np.empty(0)
+        self.segment_end = np.empty(0)
+        self.segment_text = np.empty(0, dtype=np.int32)
+        self.segment_speaker = np.empty(0, dtype=np.int32)
+        # Words of segment i are word_offsets[i]:word_offsets[i + 1];
+        # has_words is False for segments without a "words" key.
+        self.word_offsets = np.zeros(1, dtype=np.int64)
+        self.has_words = np.empty(0, dtype=bool)
+        self.word_text = np.empty(0, dtype=np.int32)
+        self.word_start = np.empty(0)
+        self.word_end = np.empty(0)
+        self.word_score = np.empty(0)
+        self.word_speaker = np.empty(0, dtype=np.int32)
+        self.segment_extra: Dict[int, dict] = {}
+        self.word_extra: Dict[int, dict] = {}
+
+    @classmethod
+    def from_segments(cls, segments: List[Dict[str, Any]]) -> "ColumnarTranscript":
+        transcript = cls()
+        strings = transcript.strings
+        segment_columns = ([], [], [], [])
+        word_columns = ([], [], [], [], [])
+        offsets = [0]
+        has_words = []
+        for index, segment in enumerate(segments):
+            for column, value in zip(
+                segment_columns,
+                (
+                    _number(segment.get("start")),
+                    _number(segment.get("end")),
+                    strings.add(_string(segment.get("text"))),
+                    strings.add(_string(segment.get("speaker"))),
+                ),
+            ):
+                column.append(value)
+            extra = _split(segment, SEGMENT_COLUMNS)
+            if extra:
+                transcript.segment_extra[index] = extra
+            has_words.append("words" in segment)
+            for word in segment.get("words") or ():
+                extra = _split(word, WORD_COLUMNS)
+                if extra:
+                    transcript.word_extra[len(word_columns[0])] = extra
+                for column, value in zip(
+                    word_columns,
+                    (
+                        strings.add(_string(word.get("word"))),
+                        _number(_numeric(word.get("start"))),
+                        _number(_numeric(word.get("end"))),
+                        _number(_numeric(word.get("score"))),
+                        strings.add(_string(word.get("speaker"))),
+                    ),
+                ):
+                    column.append(value)
+            offsets.append(len(word_columns[0]))
+
+        transcript.segment_start = np.array(segment_columns[0], dtype=np.float64)
+        transcript.segment_end = np.array(segment_columns[1], dtype=np.float64)
+        transcript.segment_text = np.array(segment_columns[2], dtype=np.int32)
+        transcript.segment_speaker = np.array(segment_columns[3], dtype=np.int32)
+        transcript.word_offsets = np.array(offsets, dtype=np.int64)
+        transcript.has_words = np.array(has_words, dtype=bool)
+        transcript.word_text = np.array(word_columns[0], dtype=np.int32)
+        transcript.word_start = np.array(word_columns[1], dtype=np.float64)
+        transcript.word_end = np.array(word_columns[2], dtype=np.float64)
+        transcript.word_score = np.array(word_columns[3], dtype=np.float64)
+        transcript.word_speaker = np.array(word_columns[4], dtype=np.int32)
+        return transcript
+
+    def __len__(self) -> int:
+        return len(self.segment_start)
+
+    @property
+    def word_count(self) -> int:
+        return len(self.word_start)
+
+    @property
+    def segments(self) -> "_SegmentsView":
+        return _SegmentsView(self)
+
+    @property
+    def word_segments(self) -> "_WordsView":
+        return _WordsView(self, 0, self.word_count)
+
+    def speakers(self) -> List[str]:
+        """Speaker labels in order of their ids (for `word_speaker` etc.)."""
+        ids = np.union1d(self.segment_speaker, self.word_speaker)
+        return [self.strings[index] for index in ids if index != _NO_ID]
+
+    def segment_dict(self, index: int, words: Optional[List[dict]] = None) -> dict:
+        item = {}
+        _put_number(item, "start", self.segment_start[index])
+        _put_number(item, "end", self.segment_end[index])
+        _put_string(item, "text", self.strings, self.segment_text[index])
+        if self.has_words[index]:
+            item["words"] = words if words is not None else self.word_dicts(index)
+        item.update(self.segment_extra.get(index, ()))
+        _put_string(item, "speaker", self.strings, self.segment_speaker[index])
+        return item
+
+    def word_dict(self, index: int) -> dict:
+        item = {}
+        _put_string(item, "word", self.strings, self.word_text[index])
+        _put_number(item, "start", self.word_start[index])
+        _put_number(item, "end", self.word_end[index])
+        _put_number(item, "score", self.word_score[index])
+        item.update(self.word_extra.get(index, ()))
+        _put_string(item, "speaker", self.strings, self.word_speaker[index])
+        return item
+
+    def word_dicts(self, segment_index: int) -> List[dict]:
+        first, last = self.word_offsets[segment_index : segment_index + 2]
+        return [self.word_dict(index) for index in range(first, last)]
+
+    def to_segments(self) -> Tuple[List[dict], List[dict]]:
+        """
+        Plain (segments, word_segments) lists; as in a whisperx result, the
+        word dicts in word_segments are the ones in the segments.
+        """
+        segments = []
+        word_segments = []
+        for index in range(len(self)):
+            words = self.word_dicts(index)
+            word_segments.extend(words)
+            segments.append(self.segment_dict(index, words))
+        return segments, word_segments
+
+
+def _string(value):
+    return value if isinstance(value, str) else None
+
+
+def _numeric(value):
+    return value if isinstance(value, (int, float)) else None
+
+
+def _put_number(item: dict, key: str, value: float) -> None:
+    if not np.isnan(value):
+        item[key] = float(value)
+
+
+def _put_string(item: dict, key: str, strings: StringTable, index: int) -> None:
+    if index != _NO_ID:
+        item[key] = strings[index]
+
+
+class _ItemView(Mapping):
+    """Read-only dict-like view of one segment or word."""
+
+    def __init__(self, build):
+        self._build = build
+        self._item = None
+
+    def _dict(self) -> dict:
+        if self._item is None:
+            self._item = self._build()
+        return self._item
+
+    def __getitem__(self, key):
+        return self._dict()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._dict())
+
+    def __len__(self) -> int:
+        return len(self._dict())
+
+    def __repr__(self) -> str:
+        return repr(self._dict())
+
+
+class _WordsView(Sequence):
+    def __init__(self, transcript: ColumnarTranscript, first: int, last: int):
+        self._transcript = transcript
+        self._first = first
+        self._last = last
+
+    def __len__(self) -> int:
+        return self._last - self._first
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        word = self._first + index
+        return _ItemView(lambda: self._transcript.word_dict(word))
+
+
+class _SegmentsView(Sequence):
+    def __init__(self, transcript: ColumnarTranscript):
+        self._transcript = transcript
+
+    def __len__(self) -> int:
+        return len(self._transcript)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        transcript = self._transcript
+
+        def build():
+            first, last = transcript.word_offsets[index : index + 2]
+            return transcript.segment_dict(
+                index, _WordsView(transcript, int(first), int(last))
+            )
+
+        return _ItemView(build)
+
+
+# word_segments of a packed result that are just the words of its segments.
+WORDS_OF_SEGMENTS = "words_of_segments"
+
+
+def _pack(part: Dict[str, Any]) -> Dict[str, Any]:
+    segments = part.get("segments")
+    if not isinstance(segments, list):
+        return part
+    packed = dict(part)
+    packed["segments"] = ColumnarTranscript.from_segments(segments)
+    if "word_segments" in part:
+        words = [word for segment in segments for word in segment.get("words") or ()]
+        if part["word_segments"] == words:
+            packed["word_segments"] = WORDS_OF_SEGMENTS
+    return packed
+
+
+def _unpack(part: Dict[str, Any]) -> Dict[str, Any]:
+    if not isinstance(part.get("segments"), ColumnarTranscript):
+        return part
+    segments, words = part["segments"].to_segments()
+    part["segments"] = segments
+    if part.get("word_segments") == WORDS_OF_SEGMENTS:
+        part["word_segments"] = words
+    return part
+
+
+def pack_result(result):
+    """
+    Whisper result (or list of results) with the segments of the result and
+    of its translation in columnar form, for handing it to another process.
+    """
+    if isinstance(result, list):
+        return [pack_result(item) for item in result]
+    packed = _pack(result)
+    if isinstance(result.get("translation_result"), dict):
+        packed["translation_result"] = _pack(result["translation_result"])
+    return packed
+
+
+def unpack_result(result):
+    """Inverse of `pack_result` (in place); other results are returned as they are."""
+    if isinstance(result, list):
+        return [unpack_result(item) for item in result]
+    if not isinstance(result, dict):
+        return result
+    _unpack(result)
+    if isinstance(result.get("translation_result"), dict):
+        _unpack(result["translation_result"])
+    return result
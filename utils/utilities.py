@@ -8,11 +8,14 @@ import re
 from pathlib import Path
 from decimal import Decimal
 import gc
+import os
+import resource
 import shutil
-from typing import Dict, Any
-import torch
+import sys
+from typing import Dict, Any, Optional
 from config.app_config import get_config
 from config.logger import logger
+from utils.stage_metrics import stage_timer
 
 config = get_config()
 device = config["whisper"]["device"]
@@ -87,11 +90,38 @@ def cleanup_cuda_memory():
     """Aggressive CUDA memory cleanup."""
     gc.collect()
     if device == "cuda":
+        import torch
+
         torch.cuda.empty_cache()
         torch.cuda.ipc_collect()
         torch.cuda.synchronize()
 
 
+def get_rss_mb(pid: Optional[int] = None) -> float:
+    """Return the current resident set size of this (or another) process in MiB."""
+    try:
+        with open(f"/proc/{pid or 'self'}/statm", encoding="ascii") as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        if pid is not None:
+            return 0.0
+        # No procfs (e.g. macOS): fall back to the peak RSS reported by getrusage.
+        return get_peak_rss_mb()
+
+
+def get_peak_rss_mb() -> float:
+    """Return the peak resident set size of this process so far in MiB."""
+    return _maxrss_to_mb(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def _maxrss_to_mb(maxrss: int) -> float:
+    """Convert a getrusage ru_maxrss value (KiB on Linux, bytes on macOS) to MiB."""
+    if sys.platform == "darwin":
+        return maxrss / (1024 * 1024)
+    return maxrss / 1024
+
+
 def prepare_bag_directory(bag_root: Path) -> Path:
     """Create the BagIt directory structure and return the payload directory."""
     if bag_root.exists():
@@ -390,11 +420,13 @@ def finalize_and_zip_bag(
 ) -> None:
     """Finalize the bag and create a ZIP archive if configured."""
     payload_files = [p for p in data_dir.rglob("*") if p.is_file()]
-    finalize_bag(dir_path, payload_files, bag_info)
+    with stage_timer("bag_manifests"):
+        finalize_bag(dir_path, payload_files, bag_info)
 
     if config["system"].get("zip_bags", True):
         try:
-            zip_bag_directory(dir_path)
+            with stage_timer("zip"):
+                zip_bag_directory(dir_path)
         except Exception as zip_error:
             logger.warning(
                 "Failed to create ZIP archive for %s: %s", dir_path, zip_error
@@ -0,0 +1,121 @@
+"""
+Watch-folder support for the daemon mode.
+FolderWatcher polls the input directory and reports files once their size and
+mtime have stopped changing; ProcessedLedger remembers which inputs have been
+handled so that a restarted daemon does not process them again.
+"""
+
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from config.logger import logger
+
+
+def file_identity(filepath: Path) -> Tuple[str, int, int]:
+    """Identify an input by name, size and mtime, so a replaced file is new."""
+    stat = filepath.stat()
+    return (filepath.name, stat.st_size, stat.st_mtime_ns)
+
+
+class ProcessedLedger:
+    """Append-only JSON-lines file of inputs that were processed (or failed)."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries = set()
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        with self.path.open(encoding="utf-8") as ledger_file:
+            for line in ledger_file:
+                try:
+                    entry = json.loads(line)
+                    self._entries.add((entry["name"], entry["size"], entry["mtime_ns"]))
+                except (ValueError, KeyError):
+                    logger.warning("Skipping malformed ledger line in %s", self.path)
+
+    def contains(self, filepath: Path) -> bool:
+        with self._lock:
+            return file_identity(filepath) in self._entries
+
+    def record(self, filepath: Path, status: str) -> None:
+        name, size, mtime_ns = file_identity(filepath)
+        entry = {
+            "name": name,
+            "size": size,
+            "mtime_ns": mtime_ns,
+            "status": status,
+            "ts": datetime.now(tz=timezone.utc).isoformat(timespec="seconds"),
+        }
+        with self._lock:
+            self._entries.add((name, size, mtime_ns))
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as ledger_file:
+                ledger_file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+class FolderWatcher:
+    """
+    Polls a directory for new input files.
+    A file is ready once its (size, mtime) has not changed for `stable_seconds`,
+    which keeps half-copied uploads out of the queue.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        ledger: ProcessedLedger,
+        should_be_processed: Callable[[Path], bool],
+        stable_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.directory = Path(directory)
+        self.ledger = ledger
+        self.should_be_processed = should_be_processed
+        self.stable_seconds = stable_seconds
+        self.clock = clock
+        # path -> ((size, mtime_ns), time the file was first seen with that state)
+        self._observed: Dict[Path, Tuple[Tuple[int, int], float]] = {}
+        self._enqueued = set()
+
+    def poll(self) -> List[Path]:
+        """Return newly ready files (sorted by name); each is reported once."""
+        now = self.clock()
+        ready = []
+        present = set()
+
+        for filepath in sorted(self.directory.glob("*")):
+            if not filepath.is_file() or not self.should_be_processed(filepath):
+                continue
+            present.add(filepath)
+            try:
+                stat = filepath.stat()
+            except FileNotFoundError:
+                continue
+            state = (stat.st_size, stat.st_mtime_ns)
+
+            previous = self._observed.get(filepath)
+            if previous is None or previous[0] != state:
+                self._observed[filepath] = (state, now)
+                continue
+
+            identity = (filepath.name,) + state
+            if identity in self._enqueued or self.ledger.contains(filepath):
+                continue
+            if now - previous[1] >= self.stable_seconds:
+                self._enqueued.add(identity)
+                ready.append(filepath)
+
+        # Forget files that disappeared from the input directory.
+        for filepath in list(self._observed):
+            if filepath not in present:
+                del self._observed[filepath]
+
+        return ready